@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Batch Report Benchmark
+Measures site-report throughput for increasing worker counts
+"""
+
+import io
+import os
+import random
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aurora_batch import BatchReporter, write_reports
+
+
+def make_sites(count, seed=42):
+    """Random northern-hemisphere observer sites"""
+    rng = random.Random(seed)
+    return [(f"site-{i}", rng.uniform(40, 75), rng.uniform(-180, 180)) for i in range(count)]
+
+
+def measure(sites, workers, days):
+    """Seconds to build and serialize every report with a given worker count"""
+    reporter = BatchReporter(workers=workers)
+    start = time.perf_counter()
+    count = write_reports(reporter.run(sites, days), io.StringIO())
+    return count, time.perf_counter() - start
+
+
+def main():
+    site_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    days = 7
+    sites = make_sites(site_count)
+    cores = os.cpu_count() or 1
+
+    print(f"Batch reports: {site_count} sites x {days} days ({cores} CPUs)")
+    baseline = None
+    workers = 1
+    while workers <= cores:
+        count, elapsed = measure(sites, workers, days)
+        baseline = baseline or elapsed
+        print(f"  {workers:>2} worker(s): {elapsed:6.2f}s  "
+              f"{count / elapsed:9.0f} sites/s  speedup {baseline / elapsed:4.2f}x")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
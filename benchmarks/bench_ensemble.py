@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Ensemble Forecast Benchmark
+Times seeded ensemble simulation and summary for each available backend
+"""
+
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aurora_ensemble import ensemble_forecast
+from aurora_numpy import numpy_for
+
+
+def measure(paths, days, use_numpy, repeat=3):
+    """Best wall time of a seeded ensemble forecast"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ensemble_forecast(days, paths, seed=42, use_numpy=use_numpy)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    print(f"Ensemble forecast: {paths} paths x {days} days")
+    np = numpy_for()
+    backends = [("pure Python", False)]
+    if np is not None:
+        backends.append(("numpy", True))
+    for name, use_numpy in backends:
+        elapsed = measure(paths, days, use_numpy)
+        print(f"  {name:<12} {elapsed * 1000:8.1f} ms")
+    if np is None:
+        print("  (install numpy for the vectorized backend)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Terminal Rendering Benchmark
+Compares buffered frame output against the old per-cell print strategy
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aurora_classify import LINE_COLOR_TABLE
+from aurora_graph import AuroraGraph
+from aurora_series import as_series
+
+
+class CountingStream(io.TextIOBase):
+    """Text stream that only counts write calls and encoded bytes"""
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, text):
+        self.writes += 1
+        self.bytes += len(text.encode('utf-8'))
+        return len(text)
+
+
+def legacy_line_graph(graph, data):
+    """The pre-buffering create_line_graph: one print per grid cell"""
+    colors = graph.colors
+    print("\n" + colors['blue'] + "📈 KP INDEX TREND LINE 📈" + colors['reset'])
+    print(colors['white'] + "=" * 40 + colors['reset'])
+
+    data = as_series(data)
+    kp_values = data.kp_values()
+    height = 10
+    width = len(data)
+
+    print(f"\nKP Range: {min(kp_values):.1f} - {max(kp_values):.1f}")
+    print()
+
+    for row in range(height, 0, -1):
+        kp_level = (row / height) * 9
+        print(f"{kp_level:4.1f} |", end="")
+        for kp in kp_values:
+            scaled_kp = (kp / 9) * height
+            if abs(scaled_kp - row) < 0.8:
+                color = colors[LINE_COLOR_TABLE.label(kp)]
+                print(color + "●" + colors['reset'], end="")
+            else:
+                print(" ", end="")
+        print()
+
+    print("     " + "-" * width)
+    print("     ", end="")
+    for i in range(len(data)):
+        if i % 2 == 0:
+            print(data.date_at(i).strftime("%m/%d")[2:], end="")
+        else:
+            print("  ", end="")
+    print()
+
+
+def measure(render, repeat):
+    """Return (write calls, bytes, seconds per render) for a renderer"""
+    counter = CountingStream()
+    with contextlib.redirect_stdout(counter):
+        render(counter)
+
+    # A terminal is line buffered, so time against a line-buffered sink
+    with open(os.devnull, 'w', buffering=1, encoding='utf-8') as sink:
+        with contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                render(sink)
+            elapsed = (time.perf_counter() - start) / repeat
+
+    return counter.writes, counter.bytes, elapsed
+
+
+def main():
+    graph = AuroraGraph()
+    print(f"{'Days':>6} {'Renderer':<10} {'Writes':>8} {'Bytes':>9} {'ms/frame':>10}")
+    print("-" * 47)
+
+    for days in (14, 90, 365):
+        data = graph.generate_sample_data(days)
+        repeat = max(5, 2000 // days)
+        renderers = [
+            ("legacy", lambda out: legacy_line_graph(graph, data)),
+            # max_width=0: every point, like legacy, not a terminal-width LTTB sample
+            ("buffered", lambda out: graph.create_line_graph(data, out=out, max_width=0)),
+        ]
+        for name, render in renderers:
+            writes, size, elapsed = measure(render, repeat)
+            print(f"{days:>6} {name:<10} {writes:>8} {size:>9} {elapsed * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
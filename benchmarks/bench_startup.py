@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark
+Measures per-command import time with `python -X importtime` against a budget
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Add src directory to path
+sys.path.insert(0, SRC_DIR)
+
+from aurora_cli import COMMANDS
+
+# Import-time budget per command in milliseconds, on top of the bare
+# interpreter. Light commands run from cron and shell prompts; the heavy
+# ones (watch, server, batch, ingest) start rarely. Budgets hold with
+# numpy installed: it is imported only when a numpy code path runs.
+BUDGET_MS = {
+    "tracker": 40,
+    "info": 15,
+    "art": 15,
+    "graph": 45,
+    "alerts": 60,
+    "watch": 120,
+    "server": 120,
+    "batch": 80,
+    "ingest": 40,
+    "rollup": 40,
+    "model": 40,
+    "planner": 40,
+    "sky": 40,
+    "oval": 40,
+}
+RUNS = 7
+
+# Light commands run for real (imports made while running count too);
+# long-running ones stop after parsing --help, once their modules are loaded
+COMMAND_ARGS = {
+    "watch": ["--help"],
+    "server": ["--help"],
+    "batch": ["--help"],
+    "ingest": ["--help"],
+    "rollup": ["--help"],
+    "model": ["--help"],
+    "planner": ["--help"],
+    "sky": ["--help"],
+    "oval": ["--help"],
+}
+
+
+def import_time_us(args, env=None):
+    """Total microseconds of top-level imports reported by -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=SRC_DIR, capture_output=True, text=True, check=True, env=env,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):  # Count top-level imports only
+            total += int(cumulative)
+    return total
+
+
+def median_ms(args, env=None):
+    return statistics.median(import_time_us(args, env) for _ in range(RUNS)) / 1000
+
+
+def main():
+    # Warm the bytecode cache so compilation is not counted
+    subprocess.run([sys.executable, "-c", "import compileall; compileall.compile_dir('.', quiet=1)"],
+                   cwd=SRC_DIR, check=True)
+
+    baseline = median_ms(["-c", "pass"])
+    print(f"Interpreter baseline: {baseline:.1f} ms (median of {RUNS})")
+    print(f"{'command':<10} {'import ms':>10} {'budget':>8}")
+
+    # Keep cached forecasts out of the user's cache directory
+    cache_dir = tempfile.mkdtemp(prefix="aurora-bench-")
+    env = dict(os.environ, AURORA_CACHE_DIR=cache_dir)
+
+    failures = []
+    try:
+        for name in COMMANDS:
+            args = ["aurora_cli.py", name] + COMMAND_ARGS.get(name, [])
+            elapsed = median_ms(args, env) - baseline
+            budget = BUDGET_MS.get(name)
+            status = ""
+            if budget is not None and elapsed > budget:
+                status = "  OVER BUDGET"
+                failures.append(name)
+            print(f"{name:<10} {elapsed:10.1f} {budget if budget is not None else '-':>8}{status}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if failures:
+        print(f"Startup budget exceeded: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Entry Point Benchmark Suite
+Times every public entry point across input sizes and compares against a baseline
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aurora_art import AuroraArt
+from aurora_graph import AuroraGraph
+from aurora_numpy import numpy_for
+from aurora_tracker import AuroraTracker
+
+# 14 days up to 10 years of daily data, 8 (built-in) up to 100k sites
+DAY_SIZES = (14, 90, 365, 3650)
+SITE_SIZES = (8, 1000, 10000, 100000)
+QUICK_DAY_SIZES = (14, 365)
+QUICK_SITE_SIZES = (8, 1000)
+
+MIN_BATCH_SECONDS = 0.05
+REPEATS = 5
+DEFAULT_TOLERANCE = 0.25
+
+# Case names per group; each group's inputs are built once for all its cases
+DAY_CASES = ("generate_kp_forecast", "generate_sample_data", "create_bar_chart",
+             "create_line_graph", "create_statistics_summary")
+SITE_CASES = ("calculate_viewing_probability", "calculate_viewing_probabilities",
+              "generate_full_report")
+ART_CASES = ("create_static_aurora", "create_constellation_map", "create_aurora_phases",
+             "generate_aurora_poem")
+
+
+def make_tracker(site_count, seed=42):
+    """Tracker with the built-in sites plus random ones up to site_count"""
+    tracker = AuroraTracker(seed=seed)
+    rng = random.Random(seed)
+    extra = site_count - len(tracker.locations)
+    tracker.add_locations((f"site-{i}", rng.uniform(40, 75), rng.uniform(-180, 180))
+                          for i in range(extra))
+    return tracker
+
+
+def day_cases(days):
+    """(name, callable) pairs whose work grows with the number of days"""
+    random.seed(days)
+    tracker = AuroraTracker(seed=days)
+    graph = AuroraGraph()
+    data = graph.generate_sample_data(days)
+    sink = io.StringIO()
+
+    def render(method):
+        def run():
+            sink.seek(0)
+            sink.truncate()
+            method(data, out=sink)
+        return run
+
+    return [
+        ("generate_kp_forecast", lambda: tracker.generate_kp_forecast(days)),
+        ("generate_sample_data", lambda: graph.generate_sample_data(days)),
+        ("create_bar_chart", render(graph.create_bar_chart)),
+        ("create_line_graph", render(graph.create_line_graph)),
+        ("create_statistics_summary", render(graph.create_statistics_summary)),
+    ]
+
+
+def site_cases(sites):
+    """(name, callable) pairs whose work grows with the number of sites"""
+    tracker = make_tracker(sites)
+    names = list(tracker.locations)
+    magnetic_lats = [site["magnetic_lat"] for site in tracker.locations.values()]
+    kp_values = [1.0, 2.5, 4.0, 5.5, 7.0, 8.5, 9.0]
+    sink = io.StringIO()
+
+    def per_site():
+        for name in names:
+            tracker.calculate_viewing_probability(name, 4.0)
+
+    def full_report():
+        sink.seek(0)
+        sink.truncate()
+        tracker.generate_full_report(out=sink)
+
+    return [
+        ("calculate_viewing_probability", per_site),
+        ("calculate_viewing_probabilities", lambda: tracker.calculate_viewing_probabilities(
+            magnetic_lats, kp_values)),
+        ("generate_full_report", full_report),
+    ]
+
+
+def art_cases():
+    """Art renderers take no input size"""
+    art = AuroraArt()
+    sink = io.StringIO()
+
+    def render(method):
+        def run():
+            sink.seek(0)
+            sink.truncate()
+            method(out=sink)
+        return run
+
+    return [
+        ("create_static_aurora", render(art.create_static_aurora)),
+        ("create_constellation_map", render(art.create_constellation_map)),
+        ("create_aurora_phases", render(art.create_aurora_phases)),
+        ("generate_aurora_poem", render(art.generate_aurora_poem)),
+    ]
+
+
+def time_call(func):
+    """Median seconds per call over REPEATS batches of at least MIN_BATCH_SECONDS"""
+    func()  # Warm-up: the first call pays for lazy imports (numpy) and cold caches
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, int(MIN_BATCH_SECONDS / single) if single > 0 else 1000)
+    repeats = REPEATS if single < 1 else 3
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples), number * repeats
+
+
+def collect(quick=False, match=None):
+    """Yield (key, seconds, calls) for every case whose key contains match"""
+    groups = [(f"days={days}", DAY_CASES, lambda days=days: day_cases(days))
+              for days in (QUICK_DAY_SIZES if quick else DAY_SIZES)]
+    groups += [(f"sites={sites}", SITE_CASES, lambda sites=sites: site_cases(sites))
+               for sites in (QUICK_SITE_SIZES if quick else SITE_SIZES)]
+    groups.append(("static", ART_CASES, art_cases))
+
+    for size, names, build in groups:
+        keys = {name: f"{name}[{size}]" for name in names}
+        if match is not None and not any(match in key for key in keys.values()):
+            continue  # Don't build inputs (100k sites, 10 years) nobody asked for
+        for name, func in build():
+            if match is None or match in keys[name]:
+                seconds, calls = time_call(func)
+                yield keys[name], seconds, calls
+
+
+def environment():
+    np = numpy_for()
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "numpy": None if np is None else np.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Keys whose time grew by more than tolerance, with their ratio"""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None or previous["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append((key, ratio))
+    return regressions
+
+
+def format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:8.2f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.2f} µs"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every public entry point")
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="Compare against results saved earlier")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a case counts as a regression "
+                             "(default: %(default)s = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest input sizes")
+    parser.add_argument("-k", "--match", help="Only run cases whose name contains this text")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+
+    print(f"{'case':<48} {'time':>11} {'calls':>7} {'vs base':>8}")
+    results = {}
+    for key, seconds, calls in collect(args.quick, args.match):
+        results[key] = {"seconds": seconds, "calls": calls}
+        change = ""
+        if key in baseline and baseline[key]["seconds"] > 0:
+            change = f"{seconds / baseline[key]['seconds']:7.2f}x"
+        print(f"{key:<48} {format_time(seconds):>11} {calls:>7} {change:>8}", flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"environment": environment(), "results": results}, handle, indent=2)
+            handle.write("\n")
+        print(f"Results written to {args.output}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions over {args.tolerance:.0%}:")
+        for key, ratio in regressions:
+            print(f"  {key}: {ratio:.2f}x slower")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,10 +11,6 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from aurora_tracker import AuroraTracker
-from aurora_art import AuroraArt
-from aurora_graph import AuroraGraph
-
 def print_banner():
     """Print welcome banner"""
     colors = {
@@ -45,6 +41,8 @@ def main():
     # Section 1: Aurora Tracker
     print("🔮 SECTION 1: AURORA TRACKING & FORECASTING")
     print("=" * 50)
+    # Each section imports only what it shows, so the banner appears at once
+    from aurora_tracker import AuroraTracker
     tracker = AuroraTracker()
     tracker.generate_full_report()
     wait_for_user()
@@ -52,6 +50,7 @@ def main():
     # Section 2: ASCII Art
     print("🎨 SECTION 2: AURORA ART & VISUALIZATIONS")
     print("=" * 50)
+    from aurora_art import AuroraArt
     art = AuroraArt()
     art.create_static_aurora()
     art.create_constellation_map()
@@ -62,6 +61,7 @@ def main():
     # Section 3: Data Visualization
     print("📊 SECTION 3: DATA ANALYSIS & GRAPHS")
     print("=" * 50)
+    from aurora_graph import AuroraGraph
     graph = AuroraGraph()
     data = graph.generate_sample_data(14)
     graph.create_bar_chart(data)
@@ -3,7 +3,10 @@
 Aurora Borealis Project Setup Script
 """
 
-from setuptools import setup, find_packages
+import glob
+import os
+
+from setuptools import setup
 
 setup(
     name="aurora-borealis-toolkit",
@@ -12,7 +15,10 @@ setup(
     description="A comprehensive toolkit for aurora borealis tracking and visualization",
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    # The tools are flat modules in src/ that import each other by name
+    package_dir={"": "src"},
+    py_modules=sorted(os.path.splitext(os.path.basename(path))[0]
+                      for path in glob.glob("src/aurora_*.py")),
     python_requires=">=3.7",
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -29,10 +35,11 @@ setup(
     keywords="aurora borealis northern lights space weather astronomy",
     entry_points={
         "console_scripts": [
-            "aurora-tracker=src.aurora_tracker:main",
-            "aurora-art=src.aurora_art:main",
-            "aurora-graph=src.aurora_graph:main",
-            "aurora-info=src.aurora_info:main",
+            "aurora=aurora_cli:main",
+            "aurora-tracker=aurora_tracker:main",
+            "aurora-art=aurora_art:main",
+            "aurora-graph=aurora_graph:main",
+            "aurora-info=aurora_info:main",
         ],
     },
 )
\ No newline at end of file
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Aurora Alerts
+Fires subscriptions when forecast KP lifts a site over its probability threshold
+"""
+
+import argparse
+import bisect
+import datetime
+import json
+import math
+import sys
+
+from aurora_probability import viewing_probability, visibility_threshold
+from aurora_series import as_series, from_epoch_day
+
+# Probability bands of viewing_probability, by offset from the threshold latitude:
+# below the zone it rises 0-20% over 10 degrees, inside it starts at 50%
+BELOW_ZONE_MAX = 20
+INSIDE_ZONE_MIN = 50
+INSIDE_ZONE_MAX = 95
+
+# Fire KPs are only accurate to rounding, so candidates are taken this far
+# either side of them and confirmed against the exact formula
+FIRE_KP_SLACK = 1e-9
+
+
+def firing_kp(magnetic_lat, probability):
+    """
+    Lowest KP at which viewing_probability(magnetic_lat, kp) reaches probability.
+
+    The viewing probability never decreases as KP rises (the threshold
+    latitude 67 - kp*2.5 moves south), so each band of the formula is
+    inverted for the offset from the threshold it needs, and that offset
+    for the KP that gives it. Returns -inf when any KP will do and inf
+    when no KP can reach the probability.
+    """
+    if probability <= 0:
+        return -math.inf
+    if probability > INSIDE_ZONE_MAX:
+        return math.inf
+    if probability <= BELOW_ZONE_MAX:
+        offset = probability / 2 - 10
+    elif probability <= INSIDE_ZONE_MIN:
+        offset = 0
+    else:
+        offset = probability / 10 - 5
+    # offset = magnetic_lat - (67 - kp*2.5)
+    return (offset + 67 - magnetic_lat) / 2.5
+
+
+class AlertRule:
+    """A subscription: alert when a site's chance reaches probability within [start, end]"""
+
+    __slots__ = ("rule_id", "site", "magnetic_lat", "probability", "start", "end", "fire_kp")
+
+    def __init__(self, rule_id, site, magnetic_lat, probability, start=None, end=None):
+        self.rule_id = rule_id
+        self.site = site
+        self.magnetic_lat = magnetic_lat
+        self.probability = probability
+        self.start = start
+        self.end = end
+        self.fire_kp = firing_kp(magnetic_lat, probability)
+
+    @property
+    def key(self):
+        """Identity used to merge duplicate subscriptions"""
+        return (self.site, self.magnetic_lat, self.probability, self.start, self.end)
+
+    def covers(self, date):
+        return (self.start is None or date >= self.start) and (self.end is None or date <= self.end)
+
+    def fires(self, date, kp_index):
+        """Exact check against the probability formula"""
+        return (self.covers(date) and
+                viewing_probability(self.magnetic_lat, kp_index) >= self.probability)
+
+
+class Alert:
+    """One delivered notification"""
+
+    __slots__ = ("rule_id", "site", "date", "kp_index", "probability", "threshold")
+
+    def __init__(self, rule_id, site, date, kp_index, probability, threshold):
+        self.rule_id = rule_id
+        self.site = site
+        self.date = date
+        self.kp_index = kp_index
+        self.probability = probability
+        self.threshold = threshold
+
+    @property
+    def key(self):
+        return (self.rule_id, self.date)
+
+    def to_dict(self):
+        return {
+            "rule_id": self.rule_id,
+            "site": self.site,
+            "date": self.date.isoformat(),
+            "kp_index": self.kp_index,
+            "probability": self.probability,
+            "threshold": self.threshold,
+            "threshold_lat": visibility_threshold(self.kp_index),
+        }
+
+    def __str__(self):
+        return (f"🚨 {self.site}: {self.probability:.0f}% chance on {self.date} "
+                f"(KP {self.kp_index:.1f}, alert at {self.threshold:g}%)")
+
+
+class StdoutSink:
+    """Print alerts to a stream (stdout by default)"""
+
+    def __init__(self, out=None):
+        self.out = out
+
+    def send(self, alert):
+        print(alert, file=self.out or sys.stdout)
+
+
+class FileSink:
+    """Append alerts to a JSON-lines file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(alert.to_dict(), ensure_ascii=False) + "\n")
+
+
+class WebhookSink:
+    """
+    Webhook stand-in: collects the JSON payloads a webhook would receive.
+
+    With a url the payloads are also POSTed there (a local receiver in
+    development); delivery errors are kept in errors rather than raised,
+    so one unreachable endpoint cannot stop the other sinks.
+    """
+
+    def __init__(self, url=None, timeout=5):
+        self.url = url
+        self.timeout = timeout
+        self.outbox = []
+        self.errors = []
+
+    def send(self, alert):
+        payload = json.dumps(alert.to_dict(), ensure_ascii=False).encode("utf-8")
+        self.outbox.append(payload)
+        if self.url is None:
+            return
+        import urllib.request
+        request = urllib.request.Request(self.url, data=payload, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except OSError as error:
+            self.errors.append((alert.key, str(error)))
+
+
+SINKS = {
+    "stdout": StdoutSink,
+    "file": FileSink,
+    "webhook": WebhookSink,
+}
+
+
+class AlertEngine:
+    """
+    Match streaming KP updates against many subscriptions.
+
+    Rules are kept sorted by the KP at which they fire. For each forecast
+    date the engine remembers the highest KP it has already handled, so an
+    update only has to bisect out the rules whose fire KP lies between
+    that peak and the new KP: O(log n) plus the alerts produced and the
+    rules sitting right at the old peak, however many rules are
+    registered. Each (rule, date) alerts at most once.
+    """
+
+    def __init__(self, sinks=None, locations=None):
+        self.sinks = list(sinks) if sinks is not None else [StdoutSink()]
+        # Optional name -> site dict (AuroraTracker.locations) for site lookups
+        self.locations = locations
+        self._fire_kps = []
+        self._rules = []
+        self._by_key = {}
+        self._by_id = {}
+        self._next_id = 1
+        self._peaks = {}     # date -> highest KP already matched
+        self._delivered = set()
+
+    def __len__(self):
+        return len(self._rules)
+
+    def subscribe(self, site, probability, start=None, end=None, magnetic_lat=None):
+        """
+        Register a rule and return its id; duplicates return the existing id.
+
+        The site's magnetic latitude comes from locations unless given.
+        Forecast dates already seen are checked right away, so a new rule
+        does not wait for the next update to fire.
+        """
+        if magnetic_lat is None:
+            if self.locations is None or site not in self.locations:
+                raise KeyError(f"unknown site {site!r}")
+            magnetic_lat = self.locations[site]["magnetic_lat"]
+
+        rule = AlertRule(self._next_id, site, magnetic_lat, probability, start, end)
+        if rule.key in self._by_key:
+            return self._by_key[rule.key].rule_id
+        self._next_id += 1
+
+        position = bisect.bisect_right(self._fire_kps, rule.fire_kp)
+        self._fire_kps.insert(position, rule.fire_kp)
+        self._rules.insert(position, rule)
+        self._by_key[rule.key] = rule
+        self._by_id[rule.rule_id] = rule
+
+        alerts = []
+        for date, kp_index in self._peaks.items():
+            if rule.fire_kp - FIRE_KP_SLACK <= kp_index:
+                self._fire(rule, date, kp_index, alerts)
+        self._deliver(alerts)
+        return rule.rule_id
+
+    def unsubscribe(self, rule_id):
+        rule = self._by_id.pop(rule_id)
+        del self._by_key[rule.key]
+        position = bisect.bisect_left(self._fire_kps, rule.fire_kp)
+        while self._rules[position] is not rule:
+            position += 1
+        del self._fire_kps[position]
+        del self._rules[position]
+
+    def update(self, date, kp_index):
+        """Match one forecast value; returns the alerts delivered"""
+        alerts = []
+        self._match(date, kp_index, alerts)
+        self._deliver(alerts)
+        return alerts
+
+    def update_forecast(self, forecast):
+        """Match a whole forecast ({date: kp}, KpSeries or records); returns the alerts"""
+        if isinstance(forecast, dict):
+            items = forecast.items()
+        else:
+            series = as_series(forecast)
+            items = [(from_epoch_day(day), series.kp_at(i)) for i, day in enumerate(series.days)]
+        alerts = []
+        for date, kp_index in items:
+            self._match(date, kp_index, alerts)
+        self._deliver(alerts)
+        return alerts
+
+    def _match(self, date, kp_index, alerts):
+        peak = self._peaks.get(date)
+        if peak is not None and kp_index <= peak:
+            return  # Every rule this KP can fire has been matched already
+        # Rules whose fire KP is within the slack of the old peak may have
+        # failed the exact check there by rounding, so they are tried again
+        low = 0 if peak is None else bisect.bisect_left(self._fire_kps, peak - FIRE_KP_SLACK)
+        high = bisect.bisect_right(self._fire_kps, kp_index + FIRE_KP_SLACK)
+        for rule in self._rules[low:high]:
+            self._fire(rule, date, kp_index, alerts)
+        self._peaks[date] = kp_index
+
+    def _fire(self, rule, date, kp_index, alerts):
+        if (rule.rule_id, date) in self._delivered or not rule.fires(date, kp_index):
+            return
+        self._delivered.add((rule.rule_id, date))
+        alerts.append(Alert(rule.rule_id, rule.site, date, kp_index,
+                            viewing_probability(rule.magnetic_lat, kp_index), rule.probability))
+
+    def _deliver(self, alerts):
+        for alert in alerts:
+            for sink in self.sinks:
+                sink.send(alert)
+
+    def forget_before(self, date):
+        """Drop per-date state for dates that have passed"""
+        for seen in [seen for seen in self._peaks if seen < date]:
+            del self._peaks[seen]
+        self._delivered = {key for key in self._delivered if key[1] >= date}
+
+
+def parse_rule(text):
+    """Parse SITE=PROBABILITY[@START..END] with ISO dates"""
+    site, _, spec = text.rpartition("=")
+    if not site:
+        raise ValueError(f"expected SITE=PROBABILITY, got {text!r}")
+    probability, _, window = spec.partition("@")
+    start = end = None
+    if window:
+        first, _, last = window.partition("..")
+        start = datetime.date.fromisoformat(first) if first else None
+        end = datetime.date.fromisoformat(last) if last else None
+    return site, float(probability), start, end
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a KP forecast against alert subscriptions")
+    parser.add_argument("--rule", action="append", default=[], metavar="SITE=PCT[@START..END]",
+                        help="Alert when SITE reaches PCT%% (repeatable; default: 50%% everywhere)")
+    parser.add_argument("--log", help="Also append alerts to this JSON-lines file")
+    parser.add_argument("--webhook", help="Also POST alerts to this URL")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from aurora_tracker import AuroraTracker
+    tracker = AuroraTracker(seed=args.seed)
+
+    sinks = [StdoutSink()]
+    if args.log:
+        sinks.append(FileSink(args.log))
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+    engine = AlertEngine(sinks, tracker.locations)
+
+    try:
+        rules = [parse_rule(text) for text in args.rule] or [
+            (site, 50.0, None, None) for site in tracker.locations]
+        for site, probability, start, end in rules:
+            engine.subscribe(site, probability, start, end)
+    except (KeyError, ValueError) as error:
+        parser.error(str(error.args[0]))
+
+    alerts = engine.update_forecast(tracker.generate_kp_forecast(args.days))
+    print(f"✨ {len(alerts)} alerts from {len(engine)} rules ✨")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
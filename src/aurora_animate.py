@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Animated Aurora Renderer
+Live aurora curtain that redraws only the terminal cells that changed
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+from aurora_render import RESET
+
+HIDE_CURSOR = '\033[?25l'
+SHOW_CURSOR = '\033[?25h'
+CLEAR_SCREEN = '\033[2J'
+
+# Brightness ramp from faint to intense, ASCII only so every cell is one column
+RAMP = " .:-=+*#%@"
+
+# Palette index 0 is the terminal default color
+PALETTE = (None, '\033[95m', '\033[92m', '\033[96m', '\033[93m')
+_DEFAULT, _PURPLE, _GREEN, _CYAN, _YELLOW = range(len(PALETTE))
+
+_CODE_SHIFT = 3  # cell code = ramp/char index << 3 | palette index
+_GROUND_CHAR = '^'
+_STAR_CHAR = '.'
+
+
+def _cell(char, palette_index):
+    return (ord(char) << _CODE_SHIFT) | palette_index
+
+
+class AuroraAnimation:
+    """
+    Double-buffered aurora animation.
+
+    Each screen is a flat list of integer cell codes (character and
+    palette index packed together). Every tick the back buffer is
+    regenerated, compared row by row with the front buffer, and only the
+    runs of changed cells are sent using cursor-addressing escapes. The
+    buffers are then swapped. Frames that miss their time slot are
+    skipped and counted as dropped instead of slowing the animation down.
+    """
+
+    def __init__(self, width=None, height=None, fps=30, out=None, seed=None,
+                 clock=time.perf_counter, sleep=time.sleep):
+        self.out = sys.stdout if out is None else out
+        if width is None or height is None:
+            size = os.terminal_size((80, 24))
+            if getattr(self.out, "isatty", bool)():
+                try:
+                    size = os.get_terminal_size(self.out.fileno())
+                except (AttributeError, ValueError, OSError):
+                    pass
+            width = width or size.columns
+            height = height or size.lines - 1
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.clock = clock
+        self.sleep = sleep
+
+        rng = random.Random(seed)
+        self._phases = [rng.uniform(0, 2 * math.pi) for _ in range(4)]
+        self._sky_rows = max(1, height - 2)
+
+        # Static background: a few stars and a tree line that never change
+        self._background = [_cell(' ', _DEFAULT)] * (width * height)
+        for _ in range(width * self._sky_rows // 40):
+            index = rng.randrange(width * self._sky_rows)
+            self._background[index] = _cell(_STAR_CHAR, _YELLOW)
+        for row in range(self._sky_rows, height):
+            for col in range(width):
+                self._background[row * width + col] = _cell(_GROUND_CHAR, _GREEN)
+
+        self._front = [None] * (width * height)  # Unknown screen contents
+        self._back = list(self._background)
+        self._ramp_codes = [[_cell(char, color) for char in RAMP]
+                            for color in range(len(PALETTE))]
+
+    def render_curtain(self, t):
+        """Draw the aurora curtain for time t (seconds) into the back buffer"""
+        width, sky_rows = self.width, self._sky_rows
+        back = self._back
+        back[:] = self._background
+        p0, p1, p2, p3 = self._phases
+        ramp_top = len(RAMP) - 1
+
+        for col in range(width):
+            x = col / width * 2 * math.pi
+            # Lower edge of the curtain folds slowly, its height breathes
+            bottom = sky_rows * (0.55 + 0.15 * math.sin(2 * x + 0.7 * t + p0)
+                                 + 0.07 * math.sin(5 * x - 1.3 * t + p1))
+            length = sky_rows * (0.35 + 0.12 * math.sin(3 * x + 0.5 * t + p2))
+            brightness = 0.55 + 0.45 * math.sin(7 * x - 2.1 * t + p3)
+            top = bottom - length
+            if length <= 0 or brightness <= 0:
+                continue
+
+            first_row = max(0, int(top))
+            last_row = min(sky_rows - 1, int(bottom))
+            for row in range(first_row, last_row + 1):
+                # Brightest along the lower edge, fading upward
+                frac = (row - top) / length
+                level = int(frac * frac * brightness * ramp_top)
+                if level <= 0:
+                    continue
+                if frac < 0.35:
+                    color = _PURPLE
+                elif frac < 0.92:
+                    color = _GREEN
+                else:
+                    color = _CYAN
+                back[row * width + col] = self._ramp_codes[color][level]
+
+    def diff(self):
+        """Escape sequence turning the front buffer into the back buffer"""
+        width = self.width
+        front, back = self._front, self._back
+        parts = []
+        color = None
+        cursor = -1
+
+        for row in range(self.height):
+            start = row * width
+            stop = start + width
+            if front[start:stop] == back[start:stop]:
+                continue
+            for index in range(start, stop):
+                code = back[index]
+                if code == front[index]:
+                    continue
+                if index != cursor:
+                    parts.append(f"\033[{row + 1};{index - start + 1}H")
+                cell_color = PALETTE[code & 7]
+                if cell_color != color:
+                    parts.append(RESET if cell_color is None else cell_color)
+                    color = cell_color
+                parts.append(chr(code >> _CODE_SHIFT))
+                cursor = index + 1
+                if cursor == stop:
+                    cursor = -1  # The terminal may wrap; re-address next row
+
+        if color is not None:
+            parts.append(RESET)
+        return "".join(parts)
+
+    def swap(self):
+        """Make the back buffer the visible screen"""
+        self._front, self._back = self._back, self._front
+
+    def run(self, duration=None, max_frames=None):
+        """
+        Animate until duration seconds or max_frames frames have passed
+        (or Ctrl+C). Returns a dict with frames shown, frames dropped,
+        achieved FPS and the fraction of wall time spent rendering.
+        """
+        frame_time = 1.0 / self.fps
+        shown = dropped = 0
+        busy = 0.0
+        next_frame = 0
+        start = self.clock()
+        self.out.write(HIDE_CURSOR + CLEAR_SCREEN)
+
+        try:
+            while True:
+                now = self.clock()
+                elapsed = now - start
+                if duration is not None and elapsed >= duration:
+                    break
+                if max_frames is not None and shown >= max_frames:
+                    break
+
+                # Skip frames whose slot has already passed
+                slot = int(elapsed / frame_time)
+                if slot > next_frame:
+                    dropped += slot - next_frame
+                    next_frame = slot
+
+                self.render_curtain(next_frame * frame_time)
+                self.out.write(self.diff())
+                self.out.flush()
+                self.swap()
+                shown += 1
+                next_frame += 1
+
+                finished = self.clock()
+                busy += finished - now
+                delay = start + next_frame * frame_time - finished
+                if delay > 0:
+                    self.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.out.write(f"{RESET}\033[{self.height + 1};1H{SHOW_CURSOR}")
+            self.out.flush()
+
+        elapsed = max(self.clock() - start, 1e-9)
+        return {
+            "frames": shown,
+            "dropped": dropped,
+            "fps": shown / elapsed,
+            "busy_ratio": busy / elapsed,
+        }
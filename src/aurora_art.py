@@ -5,9 +5,13 @@ Creates beautiful text-based aurora displays
 """
 
 import random
+import sys
 import time
 import os
 
+from aurora_animate import AuroraAnimation
+from aurora_report import ArtLine, ArtReport, TextSerializer
+
 class AuroraArt:
     def __init__(self):
         self.colors = {
@@ -20,12 +24,18 @@ class AuroraArt:
             'reset': '\033[0m'
         }
         
-    def create_static_aurora(self):
+    def _show(self, report, out):
+        """Print an art report in one write and hand it back"""
+        TextSerializer(self.colors).dump(report, out)
+        return report
+        
+    def create_static_aurora(self, out=None):
         """Create a static ASCII aurora display"""
-        print(self.colors['cyan'] + "✨" * 50 + self.colors['reset'])
-        print(self.colors['blue'] + "    NORTHERN LIGHTS ASCII ART GENERATOR    " + self.colors['reset'])
-        print(self.colors['cyan'] + "✨" * 50 + self.colors['reset'])
-        print()
+        lines = []
+        lines.append(ArtLine("✨" * 50, 'cyan'))
+        lines.append(ArtLine("    NORTHERN LIGHTS ASCII ART GENERATOR    ", 'blue'))
+        lines.append(ArtLine("✨" * 50, 'cyan'))
+        lines.append(ArtLine(""))
         
         # Create layered aurora effect
         aurora_lines = [
@@ -46,11 +56,11 @@ class AuroraArt:
         colors = ['green', 'cyan', 'blue', 'purple']
         for i, line in enumerate(aurora_lines):
             color = colors[i % len(colors)]
-            print(self.colors[color] + line + self.colors['reset'])
+            lines.append(ArtLine(line, color))
             
-        print()
-        print(self.colors['yellow'] + "    ⭐  DANCING ACROSS THE NORTHERN SKY  ⭐    " + self.colors['reset'])
-        print()
+        lines.append(ArtLine(""))
+        lines.append(ArtLine("    ⭐  DANCING ACROSS THE NORTHERN SKY  ⭐    ", 'yellow'))
+        lines.append(ArtLine(""))
         
         # Create ground silhouette
         ground_lines = [
@@ -62,15 +72,18 @@ class AuroraArt:
         ]
         
         for line in ground_lines:
-            print(self.colors['green'] + line + self.colors['reset'])
+            lines.append(ArtLine(line, 'green'))
             
-        print()
-        print(self.colors['cyan'] + "Generated with love for aurora enthusiasts! 🌌" + self.colors['reset'])
+        lines.append(ArtLine(""))
+        lines.append(ArtLine("Generated with love for aurora enthusiasts! 🌌", 'cyan'))
+        return self._show(ArtReport("static_aurora", lines), out)
         
-    def create_constellation_map(self):
+    def create_constellation_map(self, out=None):
         """Create a simple constellation map"""
-        print("\n" + self.colors['yellow'] + "✨ NORTHERN SKY STAR MAP ✨" + self.colors['reset'])
-        print(self.colors['cyan'] + "=" * 40 + self.colors['reset'])
+        lines = []
+        lines.append(ArtLine(""))
+        lines.append(ArtLine("✨ NORTHERN SKY STAR MAP ✨", 'yellow'))
+        lines.append(ArtLine("=" * 40, 'cyan'))
         
         sky_map = [
             "                    ⭐ Polaris               ",
@@ -94,12 +107,14 @@ class AuroraArt:
         ]
         
         for line in sky_map:
-            print(self.colors['yellow'] + line + self.colors['reset'])
+            lines.append(ArtLine(line, 'yellow'))
             
-        print("\n" + self.colors['green'] + "🧭 Best viewing direction: NORTH" + self.colors['reset'])
-        print(self.colors['blue'] + "🌡️  Optimal temperature: Cold, clear nights" + self.colors['reset'])
+        lines.append(ArtLine(""))
+        lines.append(ArtLine("🧭 Best viewing direction: NORTH", 'green'))
+        lines.append(ArtLine("🌡️  Optimal temperature: Cold, clear nights", 'blue'))
+        return self._show(ArtReport("constellation_map", lines), out)
         
-    def create_aurora_phases(self):
+    def create_aurora_phases(self, out=None):
         """Show different phases of aurora activity"""
         phases = [
             ("Quiet Phase", "       ~~~   ~~~       ", 'cyan'),
@@ -108,14 +123,23 @@ class AuroraArt:
             ("Recovery Phase", "    ~~~~~~~*~~~~~~~    ", 'purple'),
         ]
         
-        print("\n" + self.colors['blue'] + "🌌 AURORA ACTIVITY PHASES 🌌" + self.colors['reset'])
-        print(self.colors['cyan'] + "=" * 35 + self.colors['reset'])
+        lines = []
+        lines.append(ArtLine(""))
+        lines.append(ArtLine("🌌 AURORA ACTIVITY PHASES 🌌", 'blue'))
+        lines.append(ArtLine("=" * 35, 'cyan'))
         
         for phase_name, pattern, color in phases:
-            print(f"\n{self.colors['yellow']}{phase_name}:{self.colors['reset']}")
-            print(self.colors[color] + pattern + self.colors['reset'])
+            lines.append(ArtLine(""))
+            lines.append(ArtLine(f"{phase_name}:", 'yellow'))
+            lines.append(ArtLine(pattern, color))
+        return self._show(ArtReport("aurora_phases", lines), out)
             
-    def generate_aurora_poem(self):
+    def animate_aurora(self, duration=None, fps=30, width=None, height=None):
+        """Play a live aurora curtain; returns frame and dropped-frame counts"""
+        animation = AuroraAnimation(width=width, height=height, fps=fps)
+        return animation.run(duration=duration)
+            
+    def generate_aurora_poem(self, out=None):
         """Generate a short aurora poem"""
         poem_lines = [
             "🌌 Dancing lights across the sky,",
@@ -129,18 +153,52 @@ class AuroraArt:
             "   Magic dancing through the night. ✨"
         ]
         
-        print("\n" + self.colors['purple'] + "📜 AURORA POEM 📜" + self.colors['reset'])
-        print(self.colors['cyan'] + "=" * 25 + self.colors['reset'])
+        lines = []
+        lines.append(ArtLine(""))
+        lines.append(ArtLine("📜 AURORA POEM 📜", 'purple'))
+        lines.append(ArtLine("=" * 25, 'cyan'))
         
         for line in poem_lines:
             if line.strip():
-                print(self.colors['green'] + line + self.colors['reset'])
+                lines.append(ArtLine(line, 'green'))
             else:
-                print()
+                lines.append(ArtLine(""))
+        return self._show(ArtReport("aurora_poem", lines), out)
+
+USAGE = "usage: aurora_art.py [--animate [--fps N] [--duration SECONDS]]"
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    options = {"--fps": 30.0, "--duration": None}
+    animate = False
+    while args:
+        arg = args.pop(0)
+        name, _, value = arg.partition("=")
+        if arg == "--animate":
+            animate = True
+        elif name in options:
+            if not value and args:
+                value = args.pop(0)
+            try:
+                options[name] = float(value)
+            except ValueError:
+                options[name] = 0
+            if options[name] <= 0:
+                print(f"{name} needs a positive number\n{USAGE}", file=sys.stderr)
+                return 2
+        else:
+            print(USAGE, file=sys.stderr)
+            return 2
+    if not animate and (options["--duration"] is not None or options["--fps"] != 30.0):
+        print(f"--fps and --duration only apply to --animate\n{USAGE}", file=sys.stderr)
+        return 2
 
-def main():
     aurora = AuroraArt()
-    
+    if animate:
+        result = aurora.animate_aurora(duration=options["--duration"], fps=options["--fps"])
+        print(f"{result['frames']} frames, {result['dropped']} dropped ({result['fps']:.1f} fps)")
+        return 0
+
     # Create a comprehensive aurora art display
     aurora.create_static_aurora()
     aurora.create_constellation_map()
@@ -149,6 +207,7 @@ def main():
     
     print("\n" + aurora.colors['yellow'] + "🎨 ASCII Aurora Art Complete! 🎨" + aurora.colors['reset'])
     print(aurora.colors['cyan'] + "Share this with fellow aurora enthusiasts!" + aurora.colors['reset'])
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Batch Site Reports
+Scores thousands of observer sites against one forecast across worker processes
+"""
+
+import argparse
+import csv
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from aurora_geomag import magnetic_latitudes
+from aurora_probability import viewing_probability_matrix
+from aurora_report import SiteReport, get_serializer
+
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_SITES = 256
+
+# Forecast installed in each worker process by _init_worker
+_FORECAST = None
+
+
+def _init_worker(payload):
+    """Unpickle the shared forecast once per worker process"""
+    global _FORECAST
+    _FORECAST = pickle.loads(payload)
+
+
+def _report_chunk(chunk):
+    """Build SiteReports for one (sites, sky factors) chunk"""
+    sites, factors = chunk
+    return build_reports(sites, *_FORECAST, factors)
+
+
+def build_reports(sites, dates, kp_values, factors=None):
+    """
+    SiteReports for (name, lat, lon, magnetic_lat or None) sites.
+
+    factors are per-site sky multipliers (see AuroraTracker.sky_factors);
+    None leaves the probabilities unscaled.
+    """
+    names, lats, lons, mlats = zip(*sites) if sites else ((), (), (), ())
+    if factors is None:
+        factors = [1.0] * len(names)
+    if any(mlat is None for mlat in mlats):
+        derived = magnetic_latitudes(lats, lons)
+        mlats = [float(d) if m is None else m for m, d in zip(mlats, derived)]
+
+    matrix = viewing_probability_matrix(mlats, kp_values)
+    return [
+        SiteReport.build(name, lat, lon, mlat, dates, kp_values,
+                         tuple(round(float(p) * factor, 1) for p in row))
+        for name, lat, lon, mlat, row, factor in zip(names, lats, lons, mlats, matrix, factors)
+    ]
+
+
+class BatchReporter:
+    """
+    Per-site forecast reports for large site catalogs.
+
+    The forecast is computed once in the parent process, pickled once and
+    handed to every worker through the pool initializer, so tasks carry
+    only their slice of the site list (and its sky factors when the
+    tracker has cloud or light layers). Sites are split into a few chunks
+    per worker to balance load while keeping per-task overhead small, and
+    results come back in input order. workers=1 runs in-process.
+    """
+
+    def __init__(self, tracker=None, workers=None, chunk_size=None):
+        if tracker is None:
+            from aurora_tracker import AuroraTracker
+            tracker = AuroraTracker()
+        self.tracker = tracker
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def forecast(self, days):
+        """(dates, kp_values) tuples for the shared forecast"""
+        series = self.tracker.generate_kp_forecast(days)
+        return (tuple(series.date_at(i) for i in range(len(series))),
+                tuple(series.kp_at(i) for i in range(len(series))))
+
+    def sky_factors(self, sites):
+        """Cloud and light-pollution multiplier per site from the tracker's sky layers, or None"""
+        conditions = self.tracker.conditions
+        if conditions is None or not sites:
+            return None
+        return conditions.factors([site[1] for site in sites], [site[2] for site in sites])
+
+    def _chunks(self, sites):
+        size = self.chunk_size
+        if size is None:
+            size = max(MIN_CHUNK_SITES, -(-len(sites) // (self.workers * CHUNKS_PER_WORKER)))
+        return [sites[start:start + size] for start in range(0, len(sites), size)]
+
+    def run(self, sites, days=7):
+        """Yield a SiteReport for every (name, lat, lon[, magnetic_lat]) site, in order"""
+        sites = [_normalize_site(site) for site in sites]
+        dates, kp_values = self.forecast(days)
+        # Rasters stay in this process; workers get the sampled factors with their chunk
+        factors = self.sky_factors(sites)
+        chunks = self._chunks(sites)
+        if factors is None:
+            chunks = [(chunk, None) for chunk in chunks]
+        else:
+            chunks = list(zip(chunks, self._chunks(factors)))
+
+        if self.workers == 1 or len(sites) <= MIN_CHUNK_SITES:
+            for chunk, chunk_factors in chunks:
+                yield from build_reports(chunk, dates, kp_values, chunk_factors)
+            return
+
+        payload = pickle.dumps((dates, kp_values), protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                 initargs=(payload,)) as pool:
+            for reports in pool.map(_report_chunk, chunks):
+                yield from reports
+
+    def catalog_sites(self):
+        """The tracker's own site catalog as batch input"""
+        return [(name, site["lat"], site["lon"], site["magnetic_lat"])
+                for name, site in self.tracker.locations.items()]
+
+
+def _normalize_site(site):
+    if len(site) == 3:
+        name, lat, lon = site
+        return name, float(lat), float(lon), None
+    name, lat, lon, magnetic_lat = site
+    return name, float(lat), float(lon), None if magnetic_lat is None else float(magnetic_lat)
+
+
+def load_sites(path):
+    """Read (name, lat, lon[, magnetic_lat]) sites from a CSV file with a header row"""
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            magnetic_lat = row.get("magnetic_lat") or None
+            yield row["name"], float(row["lat"]), float(row["lon"]), magnetic_lat
+
+
+def write_reports(reports, out=None, format="jsonl"):
+    """Write reports in bulk with a serializer from aurora_report; returns the count"""
+    return get_serializer(format).dump_many(reports, out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write per-site aurora forecast reports")
+    parser.add_argument("sites", nargs="?", help="CSV with name,lat,lon[,magnetic_lat] columns "
+                                                 "(default: the built-in locations)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "binary", "text"), default="jsonl")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    reporter = BatchReporter(workers=args.workers)
+    sites = list(load_sites(args.sites)) if args.sites else reporter.catalog_sites()
+    reports = reporter.run(sites, args.days)
+
+    if args.output:
+        if args.format == "binary":
+            out = open(args.output, "wb")
+        else:
+            out = open(args.output, "w", encoding="utf-8")
+        with out:
+            count = write_reports(reports, out, args.format)
+        print(f"📝 Wrote {count} site reports to {args.output}", file=sys.stderr)
+    else:
+        write_reports(reports, format=args.format)
+
+
+if __name__ == "__main__":
+    main()
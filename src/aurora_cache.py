@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Forecast Cache
+In-memory LRU tier backed by an on-disk sqlite tier with per-entry TTL
+"""
+
+import datetime
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# KP is issued in 3-hour windows, so forecasts are reused within one window
+DEFAULT_BUCKET_SECONDS = 3 * 3600
+DEFAULT_TTL = DEFAULT_BUCKET_SECONDS
+
+CACHE_DIR_ENV = "AURORA_CACHE_DIR"
+CACHE_FILE = "forecast_cache.sqlite3"
+
+# Bump when cached value formats change so stale pickles are ignored
+CACHE_VERSION = 3
+
+_MISSING = object()
+
+
+def make_key(name, args=(), kwargs=None, bucket=None):
+    """Stable cache key for a function name, its parameters and a time bucket"""
+    kwargs = kwargs or {}
+    raw = repr((CACHE_VERSION, name, args, sorted(kwargs.items()), bucket))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def time_bucket(bucket_seconds, now=None):
+    """Index of the time window that now falls into"""
+    if now is None:
+        now = time.time()
+    return int(now // bucket_seconds)
+
+
+def default_cache_path():
+    """Cache file under $AURORA_CACHE_DIR or ~/.cache/aurora-toolkit"""
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        directory = os.path.join(os.path.expanduser("~"), ".cache", "aurora-toolkit")
+    return os.path.join(directory, CACHE_FILE)
+
+
+class ForecastCache:
+    """
+    Two-tier cache for computed forecasts and reports.
+
+    Lookups hit an in-process OrderedDict LRU first and fall back to a
+    sqlite file shared by every process using the same path, so separate
+    CLI runs reuse each other's results. Every entry carries its own
+    expiry time; expired entries are treated as misses and purged from
+    disk periodically. With path=None only the memory tier is used.
+    Values are pickled on disk and returned as-is from memory, so callers
+    should treat cached results as read-only.
+    """
+
+    def __init__(self, path=None, max_entries=256, clock=time.time, purge_every=64):
+        self.path = path
+        self.max_entries = max_entries
+        self.clock = clock
+        self.purge_every = purge_every
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = None
+
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, expires REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def default(cls, **kwargs):
+        """Cache stored at default_cache_path()"""
+        return cls(default_cache_path(), **kwargs)
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Cache in $AURORA_CACHE_DIR if it is set, else None (command-line runs stay uncached)"""
+        if not os.environ.get(CACHE_DIR_ENV):
+            return None
+        return cls.default(**kwargs)
+
+    def get(self, key, default=None):
+        """Cached value for key, or default if missing or expired"""
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires, value FROM entries WHERE key = ? AND expires > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    expires, blob = row
+                    value = pickle.loads(blob)
+                    self._remember(key, expires, value)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        """Store value under key for ttl seconds in both tiers"""
+        expires = self.clock() + ttl
+        with self._lock:
+            self._remember(key, expires, value)
+            if self._db is None:
+                return
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, expires, value) VALUES (?, ?, ?)",
+                (key, expires, blob),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._db.execute("DELETE FROM entries WHERE expires <= ?", (self.clock(),))
+            self._db.commit()
+
+    def get_or_compute(self, key, compute, ttl=DEFAULT_TTL):
+        """Return the cached value for key, computing and storing it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key, expires, value):
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+def cached(ttl=DEFAULT_TTL, bucket_seconds=DEFAULT_BUCKET_SECONDS):
+    """
+    Cache a method's result in self.cache, keyed by the method name, its
+    arguments, the object's optional cache_token (state the result depends
+    on), the current time bucket and the local date. Methods on objects
+    whose cache attribute is None run uncached.
+
+    Objects drawing from a seeded random.Random expose it as cache_rng:
+    its state becomes part of the key and the state after the call is
+    stored with the result and restored on a hit, so seeded output is the
+    same whether or not the cache was warm.
+    """
+    def decorator(method):
+        name = method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+            now = cache.clock()
+            bucket = (time_bucket(bucket_seconds, now), datetime.date.fromtimestamp(now).toordinal())
+            token = getattr(self, "cache_token", None)
+            rng = getattr(self, "cache_rng", None)
+            if rng is None:
+                key = make_key(name, (token,) + args, kwargs, bucket)
+                return cache.get_or_compute(key, lambda: method(self, *args, **kwargs), ttl)
+
+            def compute():
+                return method(self, *args, **kwargs), rng.getstate()
+
+            key = make_key(name, (token, rng.getstate()) + args, kwargs, bucket)
+            value, state = cache.get_or_compute(key, compute, ttl)
+            rng.setstate(state)
+            return value
+
+        return wrapper
+    return decorator
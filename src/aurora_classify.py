@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+KP Classification Tables
+Shared threshold tables for activity levels, visibility zones and chart colors
+"""
+
+import bisect
+from array import array
+
+from aurora_numpy import numpy_for
+
+
+class ThresholdTable:
+    """
+    Sorted class boundaries with one label per class.
+
+    A value belongs to class i where i is the number of bounds it has
+    passed. By default a value equal to a bound moves up a class
+    (`kp < bound` ladders); with inclusive=True it stays in the lower
+    class (`kp <= bound` ladders).
+    """
+
+    __slots__ = ("bounds", "labels", "inclusive", "_search")
+
+    def __init__(self, bounds, labels, inclusive=False):
+        if len(labels) != len(bounds) + 1:
+            raise ValueError("A table needs exactly one more label than bounds")
+        if list(bounds) != sorted(bounds):
+            raise ValueError("Table bounds must be sorted")
+        self.bounds = tuple(bounds)
+        self.labels = tuple(labels)
+        self.inclusive = inclusive
+        self._search = bisect.bisect_left if inclusive else bisect.bisect_right
+
+    def code(self, value):
+        """Class index for one value"""
+        return self._search(self.bounds, value)
+
+    def label(self, value):
+        """Class label for one value"""
+        return self.labels[self._search(self.bounds, value)]
+
+    def codes(self, values):
+        """Class indexes for many values (uint8 ndarray or array('B'))"""
+        np = numpy_for()
+        if np is not None:
+            side = "left" if self.inclusive else "right"
+            return np.searchsorted(self.bounds, np.asarray(values), side=side).astype(np.uint8)
+        search, bounds = self._search, self.bounds
+        return array("B", [search(bounds, value) for value in values])
+
+    def labels_for(self, values):
+        """Class labels for many values"""
+        labels = self.labels
+        return [labels[code] for code in self.codes(values)]
+
+
+ACTIVITY_LEVELS = (
+    "Quiet",
+    "Unsettled",
+    "Active",
+    "Minor Storm",
+    "Moderate Storm",
+    "Strong Storm",
+    "Severe Storm",
+    "Extreme Storm",
+)
+
+VISIBILITY_ZONES = (
+    "Arctic Circle only",
+    "Northern Canada, Alaska",
+    "Northern border states",
+    "Northern US, southern Canada",
+    "Most of northern US",
+    "Central US states",
+    "Southern US possible",
+    "Visible to southern latitudes",
+)
+
+ACTIVITY_BOUNDS = (2, 3, 4, 5, 6, 7, 8)
+
+# Activity level and visibility zone share bounds, so one code indexes both
+ACTIVITY_TABLE = ThresholdTable(ACTIVITY_BOUNDS, ACTIVITY_LEVELS)
+VISIBILITY_TABLE = ThresholdTable(ACTIVITY_BOUNDS, VISIBILITY_ZONES)
+
+# Coarser wording used by the quick info report (integer KP, inclusive bounds)
+REPORT_VISIBILITY_TABLE = ThresholdTable((2, 4, 6), (
+    "Low - Visible only in polar regions",
+    "Moderate - Visible in northern Canada and Alaska",
+    "High - Visible in northern US states",
+    "Very High - Visible in southern Canada and northern US",
+), inclusive=True)
+
+# Terminal color names used by the graph renderers
+BAR_COLOR_TABLE = ThresholdTable((2, 4, 6), ("green", "yellow", "red", "purple"))
+LINE_COLOR_TABLE = ThresholdTable((3, 5), ("green", "yellow", "red"))
+
+# Aurora color rules: (color, minimum KP, chance of appearing at or above it).
+# Order matters: it is the order colors are listed and random draws are made.
+COLOR_RULES = (
+    ("Green", 1, 1.0),   # Almost always present
+    ("Red", 4, 1.0),     # Higher activity
+    ("Pink", 3, 0.6),    # Moderate activity
+    ("Blue", 3, 0.4),
+    ("Purple", 6, 0.3),  # Rare, strong storms
+)
+
+
+# Photography tips: (minimum KP, tips added from that KP on). Minimums must
+# be ACTIVITY_BOUNDS so every activity code gets one fixed set of tips.
+PHOTOGRAPHY_TIP_RULES = (
+    (0, (
+        "🌍 Find a location away from city lights",
+        "🕐 Best viewing: 10 PM - 2 AM local time",
+        "🌙 New moon periods offer darkest skies",
+        "📱 Use aurora prediction apps for real-time updates",
+    )),
+    (3, (
+        "📸 Camera settings: ISO 800-1600, f/2.8, 15-20 sec exposure",
+        "🎯 Focus on infinity or distant lights",
+        "🔋 Bring extra batteries - cold drains them fast!",
+    )),
+    (5, (
+        "🎨 Expect dynamic, dancing aurora!",
+        "📹 Consider time-lapse photography",
+        "👥 Aurora may be visible to naked eye",
+    )),
+)
+
+
+class KpBucket:
+    """
+    Everything that depends on a KP value only through its activity code.
+
+    One immutable instance per code is built at import time, so report
+    code can share the level, zone and tips instead of rebuilding them.
+    """
+
+    __slots__ = ("code", "level", "zone", "tips")
+
+    def __init__(self, code, level, zone, tips):
+        self.code = code
+        self.level = level
+        self.zone = zone
+        self.tips = tips
+
+    def __repr__(self):
+        return f"KpBucket({self.code}, {self.level!r})"
+
+
+def _build_buckets():
+    buckets = []
+    shared_tips = {}  # Buckets with the same tips share one tuple
+    for code in range(len(ACTIVITY_BOUNDS) + 1):
+        lowest_kp = ACTIVITY_BOUNDS[code - 1] if code else 0
+        tips = tuple(tip for min_kp, rule_tips in PHOTOGRAPHY_TIP_RULES
+                     if lowest_kp >= min_kp for tip in rule_tips)
+        tips = shared_tips.setdefault(tips, tips)
+        buckets.append(KpBucket(code, ACTIVITY_LEVELS[code], VISIBILITY_ZONES[code], tips))
+    return tuple(buckets)
+
+
+if any(min_kp and min_kp not in ACTIVITY_BOUNDS for min_kp, _ in PHOTOGRAPHY_TIP_RULES):
+    raise ValueError("Photography tip minimums must be activity bounds")
+
+KP_BUCKETS = _build_buckets()
+
+
+def kp_bucket(kp):
+    """Shared KpBucket for a KP value"""
+    return KP_BUCKETS[bisect.bisect_right(ACTIVITY_BOUNDS, kp)]
+
+
+def activity_code(kp):
+    """Index into ACTIVITY_LEVELS / VISIBILITY_ZONES for a KP value"""
+    return bisect.bisect_right(ACTIVITY_BOUNDS, kp)
+
+
+def activity_level(kp):
+    """Activity level name for a KP value"""
+    return ACTIVITY_LEVELS[bisect.bisect_right(ACTIVITY_BOUNDS, kp)]
+
+
+def visibility_zone(kp):
+    """Visibility zone description for a KP value"""
+    return VISIBILITY_ZONES[bisect.bisect_right(ACTIVITY_BOUNDS, kp)]
+
+
+def activity_codes(values):
+    """Activity codes for many KP values in one vectorized pass"""
+    return ACTIVITY_TABLE.codes(values)
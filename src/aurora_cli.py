@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Aurora Toolkit Command Dispatcher
+Single entry point that imports only the subcommand being run
+"""
+
+import importlib
+import os
+import sys
+
+import aurora_numpy
+
+# name: (module, function, description, uses numpy)
+COMMANDS = {
+    "tracker": ("aurora_tracker", "main", "Comprehensive aurora report (--json, --seed N)", False),
+    "info": ("aurora_info", "main", "Quick aurora facts and viewing tips", False),
+    "art": ("aurora_art", "main", "ASCII aurora art", False),
+    "graph": ("aurora_graph", "main", "KP charts and statistics", False),
+    "alerts": ("aurora_alerts", "main", "Check a KP forecast against alert rules", False),
+    "watch": ("aurora_watch", "main", "Live table refreshed from KP feeds", False),
+    "server": ("aurora_server", "main", "Web dashboard and JSON API server", True),
+    "batch": ("aurora_batch", "main", "Per-site reports for a site catalog", True),
+    "ingest": ("aurora_ingest", "main", "Convert historical KP files into an archive", True),
+    "model": ("aurora_model", "main", "Fit the solar-cycle KP model to an archive", False),
+    "rollup": ("aurora_rollup", "main", "Summarize a KP archive by day, month or year", False),
+    "sky": ("aurora_raster", "main", "Viewing chances under cloud and light-pollution rasters", True),
+    "oval": ("aurora_oval", "main", "Auroral oval heat map and PNG/PPM images", True),
+    "planner": ("aurora_planner", "main", "Rank observing windows by KP, darkness and moon", True),
+}
+
+# Set to 1 to let light commands use numpy anyway
+NUMPY_ENV = "AURORA_NUMPY"
+
+
+def usage():
+    lines = ["usage: aurora <command> [options]", "", "commands:"]
+    for name, (_, _, description, _) in COMMANDS.items():
+        lines.append(f"  {name:<9} {description}")
+    lines.append("")
+    lines.append("Run 'aurora <command> --help' for command options.")
+    return "\n".join(lines)
+
+
+def load(name):
+    """
+    Import one command's module and return its entry point.
+
+    Commands that work on a handful of values never benefit from numpy,
+    whose import costs more than the rest of their startup combined, so
+    for them use_numpy=None picks the (identical) pure-Python code paths
+    and numpy is never imported. Set AURORA_NUMPY=1 to keep numpy.
+    Other commands import numpy only once they reach a numpy code path.
+    """
+    module_name, function, _, uses_numpy = COMMANDS[name]
+    if not uses_numpy and os.environ.get(NUMPY_ENV) != "1":
+        aurora_numpy.set_default(False)
+    return getattr(importlib.import_module(module_name), function)
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    if not args or args[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    name, rest = args[0], args[1:]
+    if name not in COMMANDS:
+        print(f"aurora: unknown command {name!r}", file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 2
+
+    entry_point = load(name)
+    # Subcommands read their own options from sys.argv
+    sys.argv = [f"aurora {name}"] + rest
+    result = entry_point()
+    return result if isinstance(result, int) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Series Downsampling
+Shrinks long KP series to a screen's worth of points in linear time
+"""
+
+from aurora_series import as_series
+
+METHODS = ("lttb", "minmax", "max")
+
+
+def max_buckets(values, n_buckets):
+    """Index of the largest value in each of n_buckets equal buckets"""
+    n = len(values)
+    if n <= n_buckets:
+        return list(range(n))
+
+    indices = []
+    for bucket in range(n_buckets):
+        start = bucket * n // n_buckets
+        stop = (bucket + 1) * n // n_buckets
+        best = start
+        for index in range(start + 1, stop):
+            if values[index] > values[best]:
+                best = index
+        indices.append(best)
+    return indices
+
+
+def minmax_buckets(values, n_points):
+    """
+    Indexes of the minimum and maximum of each bucket, in time order.
+
+    Uses n_points // 2 buckets so the result has at most n_points
+    entries. Both extremes survive, so storm peaks and quiet troughs are
+    never averaged away.
+    """
+    n = len(values)
+    n_buckets = max(1, n_points // 2)
+    if n <= n_points:
+        return list(range(n))
+
+    indices = []
+    for bucket in range(n_buckets):
+        start = bucket * n // n_buckets
+        stop = (bucket + 1) * n // n_buckets
+        low = high = start
+        for index in range(start + 1, stop):
+            value = values[index]
+            if value < values[low]:
+                low = index
+            elif value > values[high]:
+                high = index
+        if low == high:
+            indices.append(low)
+        else:
+            indices.extend(sorted((low, high)))
+    return indices
+
+
+def lttb(values, n_points):
+    """
+    Largest-Triangle-Three-Buckets selection of n_points indexes.
+
+    The first and last points are always kept. Every other bucket keeps
+    the point forming the largest triangle with the previously selected
+    point and the average of the next bucket, which preserves the visual
+    shape (including sharp peaks) of the series.
+    """
+    n = len(values)
+    if n_points >= n:
+        return list(range(n))
+    if n_points < 3:
+        return [0, n - 1][:max(n_points, 0)]
+
+    every = (n - 2) / (n_points - 2)
+    indices = [0]
+    selected = 0
+
+    for bucket in range(n_points - 2):
+        # Average point of the following bucket
+        avg_start = int((bucket + 1) * every) + 1
+        avg_stop = min(int((bucket + 2) * every) + 1, n)
+        avg_x = (avg_start + avg_stop - 1) / 2
+        avg_y = sum(values[avg_start:avg_stop]) / (avg_stop - avg_start)
+
+        # Point in this bucket with the largest triangle area
+        range_start = int(bucket * every) + 1
+        range_stop = int((bucket + 1) * every) + 1
+        sel_x, sel_y = selected, values[selected]
+        best, best_area = range_start, -1.0
+        for index in range(range_start, range_stop):
+            area = abs((sel_x - avg_x) * (values[index] - sel_y) -
+                       (sel_x - index) * (avg_y - sel_y))
+            if area > best_area:
+                best, best_area = index, area
+
+        indices.append(best)
+        selected = best
+
+    indices.append(n - 1)
+    return indices
+
+
+def downsample_indices(values, n_points, method="lttb"):
+    """Pick at most n_points indexes from values with the given method"""
+    if method == "lttb":
+        return lttb(values, n_points)
+    if method == "minmax":
+        return minmax_buckets(values, n_points)
+    if method == "max":
+        return max_buckets(values, n_points)
+    raise ValueError(f"Unknown downsampling method {method!r}, expected one of {METHODS}")
+
+
+def downsample_series(data, n_points, method="lttb"):
+    """Return a KpSeries with at most n_points rows picked from data"""
+    data = as_series(data)
+    if len(data) <= n_points:
+        return data
+    return data.take(downsample_indices(data.kp, n_points, method))
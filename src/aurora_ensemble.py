@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Ensemble KP Forecasts
+Simulates thousands of seeded KP random walks at once and summarizes them
+"""
+
+import bisect
+import datetime
+import math
+import random
+
+from aurora_classify import COLOR_RULES
+from aurora_numpy import loaded_numpy, numpy_for
+from aurora_report import EnsembleDay, EnsembleReport
+from aurora_stats import DEFAULT_THRESHOLDS
+
+# Random walk shared with AuroraTracker.generate_kp_forecast: a uniform
+# starting KP, then one uniform step per day, clipped to the 0-9 scale
+START_KP = (1, 4)
+DAILY_STEP = (-1.5, 2.0)
+KP_MIN, KP_MAX = 0, 9
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def simulate_paths(paths, days, seed=None, use_numpy=None):
+    """
+    Simulate KP random walks, one row per day and one column per path.
+
+    Every path advances one day at a time, so each step is a single array
+    operation over all paths. Results are reproducible for a given seed;
+    the numpy and pure-Python generators produce different streams, so a
+    seed reproduces results for the same backend only. Returns a float64
+    ndarray with numpy, otherwise a list of per-day lists.
+    """
+    np = numpy_for(use_numpy)
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        kp = rng.uniform(*START_KP, size=paths)
+        steps = rng.uniform(*DAILY_STEP, size=(days, paths))
+        result = np.empty((days, paths))
+        for day in range(days):
+            kp = np.clip(kp + steps[day], KP_MIN, KP_MAX)
+            result[day] = kp
+        return result
+
+    # random() with the uniform() scaling inlined: same values, fewer calls
+    draw = random.Random(seed).random
+    start, start_span = START_KP[0], START_KP[1] - START_KP[0]
+    low, span = DAILY_STEP[0], DAILY_STEP[1] - DAILY_STEP[0]
+    kp = [start + start_span * draw() for _ in range(paths)]
+    result = []
+    for _ in range(days):
+        kp = [min(KP_MAX, max(KP_MIN, value + (low + span * draw()))) for value in kp]
+        result.append(kp)
+    return result
+
+
+def _quantiles(ordered, levels):
+    """Linear-interpolation quantiles (numpy's default method) of a sorted list"""
+    last = len(ordered) - 1
+    result = []
+    for level in levels:
+        position = level * last
+        below = math.floor(position)
+        above = min(below + 1, last)
+        fraction = position - below
+        result.append(ordered[below] + (ordered[above] - ordered[below]) * fraction)
+    return result
+
+
+def summarize_paths(paths, quantiles=DEFAULT_QUANTILES, thresholds=DEFAULT_THRESHOLDS):
+    """
+    Per-day (mean, quantiles, exceedance, colors) tuples for simulated paths.
+
+    Exceedance is the fraction of paths with KP at or above each
+    threshold. Colors are the expected chance of each COLOR_RULES color
+    appearing: the fraction of paths above the color's minimum KP times
+    its chance, the exact expectation of predict_colors over the ensemble.
+    """
+    np = loaded_numpy()
+    if np is not None and isinstance(paths, np.ndarray):
+        means = paths.mean(axis=1)
+        levels = np.quantile(paths, quantiles, axis=1).T
+        exceedance = np.stack([(paths >= t).mean(axis=1) for t in thresholds], axis=1)
+        color_floors = sorted({rule[1] for rule in COLOR_RULES})
+        floors = {t: (paths >= t).mean(axis=1) for t in color_floors}
+        colors = np.stack([floors[min_kp] * chance for _, min_kp, chance in COLOR_RULES], axis=1)
+        return [(float(means[d]), levels[d].tolist(), exceedance[d].tolist(), colors[d].tolist())
+                for d in range(len(paths))]
+
+    # One sort per day answers every quantile and (by bisection) every threshold
+    summary = []
+    for values in paths:
+        ordered = sorted(values)
+        count = len(ordered)
+
+        def at_least(threshold):
+            return (count - bisect.bisect_left(ordered, threshold)) / count
+
+        summary.append((
+            math.fsum(ordered) / count,
+            _quantiles(ordered, quantiles),
+            [at_least(t) for t in thresholds],
+            [at_least(min_kp) * chance for _, min_kp, chance in COLOR_RULES],
+        ))
+    return summary
+
+
+def ensemble_forecast(days=7, paths=10000, seed=None, quantiles=DEFAULT_QUANTILES,
+                      thresholds=DEFAULT_THRESHOLDS, start_date=None, use_numpy=None):
+    """Simulate an ensemble and summarize it as an EnsembleReport"""
+    if paths < 1 or days < 1:
+        raise ValueError("paths and days must be positive")
+    start_date = datetime.date.today() if start_date is None else start_date
+    simulated = simulate_paths(paths, days, seed, use_numpy)
+
+    ensemble_days = []
+    for day, (mean, levels, exceedance, colors) in enumerate(
+            summarize_paths(simulated, quantiles, thresholds)):
+        date = start_date + datetime.timedelta(days=day)
+        ensemble_days.append(EnsembleDay(date, mean, levels, exceedance, colors))
+
+    expected_colors = [
+        sum(day.colors[index] for day in ensemble_days) / days
+        for index in range(len(COLOR_RULES))
+    ]
+    return EnsembleReport(
+        paths=paths,
+        seed=seed,
+        quantile_levels=list(quantiles),
+        thresholds=list(thresholds),
+        color_names=[rule[0] for rule in COLOR_RULES],
+        days=ensemble_days,
+        expected_colors=expected_colors,
+    )
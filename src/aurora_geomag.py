@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Geomagnetic Coordinates & Site Index
+Converts observer locations to magnetic latitude and indexes them for fast lookup
+"""
+
+import bisect
+import math
+
+from aurora_numpy import numpy_for
+from aurora_probability import visibility_threshold
+
+# Geomagnetic north pole of the centered dipole (IGRF-13, epoch 2020)
+DIPOLE_POLE_LAT = 80.65
+DIPOLE_POLE_LON = -72.68
+
+EARTH_RADIUS_KM = 6371.0
+
+_SIN_POLE = math.sin(math.radians(DIPOLE_POLE_LAT))
+_COS_POLE = math.cos(math.radians(DIPOLE_POLE_LAT))
+
+
+def magnetic_latitude(lat, lon):
+    """Convert a geographic lat/lon (degrees) to dipole magnetic latitude"""
+    lat_r = math.radians(lat)
+    dlon_r = math.radians(lon - DIPOLE_POLE_LON)
+    sin_mlat = (math.sin(lat_r) * _SIN_POLE +
+                math.cos(lat_r) * _COS_POLE * math.cos(dlon_r))
+    return math.degrees(math.asin(max(-1.0, min(1.0, sin_mlat))))
+
+
+def magnetic_latitudes(lats, lons, use_numpy=None):
+    """Vectorized magnetic_latitude for sequences of coordinates"""
+    np = numpy_for(use_numpy)
+    if np is None:
+        return [magnetic_latitude(lat, lon) for lat, lon in zip(lats, lons)]
+
+    lat_r = np.radians(np.asarray(lats, dtype=np.float64))
+    dlon_r = np.radians(np.asarray(lons, dtype=np.float64) - DIPOLE_POLE_LON)
+    sin_mlat = (np.sin(lat_r) * _SIN_POLE +
+                np.cos(lat_r) * _COS_POLE * np.cos(dlon_r))
+    return np.degrees(np.arcsin(np.clip(sin_mlat, -1.0, 1.0)))
+
+
+def great_circle_km(lat1, lon1, lat2, lon2):
+    """Haversine distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = math.radians(lon2 - lon1)
+    a = (math.sin(dphi / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SiteIndex:
+    """
+    Index of observer sites by magnetic latitude and geographic grid cell.
+
+    Magnetic latitudes are kept sorted so that "every site inside the
+    visibility zone for KP=X" is a bisect plus a slice. A coarse lat/lon
+    grid answers "sites near this point" without touching far-away cells.
+    """
+
+    def __init__(self, cell_degrees=1.0):
+        self.cell_degrees = cell_degrees
+        self.sites = {}
+        self._mlat_keys = []
+        self._mlat_names = []
+        self._grid = {}
+        self.version = 0  # Bumped on every change, for cache invalidation
+
+    def __len__(self):
+        return len(self.sites)
+
+    def __contains__(self, name):
+        return name in self.sites
+
+    def _cell(self, lat, lon):
+        return (int(math.floor(lat / self.cell_degrees)),
+                int(math.floor(lon / self.cell_degrees)))
+
+    def add(self, name, lat, lon, magnetic_lat=None):
+        """Add or replace a single site"""
+        if name in self.sites:
+            self.remove(name)
+        if magnetic_lat is None:
+            magnetic_lat = magnetic_latitude(lat, lon)
+
+        self.sites[name] = {"lat": lat, "lon": lon, "magnetic_lat": magnetic_lat}
+        position = bisect.bisect_right(self._mlat_keys, magnetic_lat)
+        self._mlat_keys.insert(position, magnetic_lat)
+        self._mlat_names.insert(position, name)
+        self._grid.setdefault(self._cell(lat, lon), []).append(name)
+        self.version += 1
+        return magnetic_lat
+
+    def extend(self, sites):
+        """
+        Bulk-add (name, lat, lon) tuples, converting coordinates in one pass.
+
+        Like add(), an existing name is replaced; when a name repeats
+        within the batch the last entry wins.
+        """
+        batch = {}
+        for site in sites:
+            batch.pop(site[0], None)  # Keep the position of the last entry
+            batch[site[0]] = site
+        if not batch:
+            return
+
+        replaced = {name for name in batch if name in self.sites}
+        if replaced:
+            for name in replaced:
+                site = self.sites.pop(name)
+                self._grid[self._cell(site["lat"], site["lon"])].remove(name)
+            kept = [(key, name) for key, name in zip(self._mlat_keys, self._mlat_names)
+                    if name not in replaced]
+            self._mlat_keys = [pair[0] for pair in kept]
+            self._mlat_names = [pair[1] for pair in kept]
+
+        names = list(batch)
+        lats = [batch[name][1] for name in names]
+        lons = [batch[name][2] for name in names]
+        mlats = magnetic_latitudes(lats, lons)
+
+        for name, lat, lon, mlat in zip(names, lats, lons, mlats):
+            mlat = float(mlat)
+            self.sites[name] = {"lat": lat, "lon": lon, "magnetic_lat": mlat}
+            self._grid.setdefault(self._cell(lat, lon), []).append(name)
+
+        # One sort instead of an insort per site
+        pairs = sorted(zip(self._mlat_keys + [float(m) for m in mlats],
+                           self._mlat_names + names))
+        self._mlat_keys = [pair[0] for pair in pairs]
+        self._mlat_names = [pair[1] for pair in pairs]
+        self.version += 1
+
+    def remove(self, name):
+        """Remove a site from every index"""
+        site = self.sites.pop(name)
+        low = bisect.bisect_left(self._mlat_keys, site["magnetic_lat"])
+        high = bisect.bisect_right(self._mlat_keys, site["magnetic_lat"])
+        position = self._mlat_names.index(name, low, high)
+        del self._mlat_keys[position]
+        del self._mlat_names[position]
+        self._grid[self._cell(site["lat"], site["lon"])].remove(name)
+        self.version += 1
+
+    def magnetic_lat(self, name):
+        """Magnetic latitude of an indexed site"""
+        return self.sites[name]["magnetic_lat"]
+
+    def sites_above(self, magnetic_lat):
+        """Names of all sites at or poleward of a magnetic latitude"""
+        start = bisect.bisect_left(self._mlat_keys, magnetic_lat)
+        return self._mlat_names[start:]
+
+    def sites_between(self, low, high):
+        """Names of all sites with low <= magnetic latitude < high"""
+        start = bisect.bisect_left(self._mlat_keys, low)
+        stop = bisect.bisect_left(self._mlat_keys, high)
+        return self._mlat_names[start:stop]
+
+    def visible_sites(self, kp_index):
+        """Names of all sites inside the visibility zone for a KP value"""
+        return self.sites_above(visibility_threshold(kp_index))
+
+    def sites_near(self, lat, lon, radius_km):
+        """Names of sites within radius_km of a point, nearest first"""
+        lat_degrees = radius_km / 111.0
+        cos_lat = max(0.01, math.cos(math.radians(min(89.0, abs(lat) + lat_degrees))))
+        columns = int(round(360 / self.cell_degrees))
+        lat_span = int(lat_degrees / self.cell_degrees) + 1
+        lon_span = min(columns // 2, int(lat_degrees / cos_lat / self.cell_degrees) + 1)
+        center_row, center_col = self._cell(lat, lon)
+
+        # Wrap around the antimeridian
+        cols = {(center_col + offset + columns // 2) % columns - columns // 2
+                for offset in range(-lon_span, lon_span + 1)}
+
+        matches = []
+        for row in range(center_row - lat_span, center_row + lat_span + 1):
+            for col in cols:
+                for name in self._grid.get((row, col), ()):
+                    site = self.sites[name]
+                    distance = great_circle_km(lat, lon, site["lat"], site["lon"])
+                    if distance <= radius_km:
+                        matches.append((distance, name))
+
+        return [name for distance, name in sorted(matches)]
@@ -6,9 +6,23 @@ Creates text-based visualizations of aurora data
 
 import random
 import datetime
+import shutil
+import sys
+
+from aurora_cache import ForecastCache, cached
+from aurora_classify import (ACTIVITY_LEVELS, BAR_COLOR_TABLE, LINE_COLOR_TABLE,
+                             activity_code, activity_level)
+from aurora_downsample import downsample_series
+from aurora_profile import pop_profile_flag, run_profiled, stage, timed
+from aurora_report import (BarChartReport, BarRow, LineGraphReport, LinePoint,
+                           StatisticsReport, TextSerializer)
+from aurora_series import KpSeries, as_series, from_epoch_day
+from aurora_stats import KpStatistics
 
 class AuroraGraph:
-    def __init__(self):
+    def __init__(self, cache=None):
+        # Optional ForecastCache; sample data is regenerated when None
+        self.cache = cache
         self.colors = {
             'green': '\033[92m',
             'red': '\033[91m',
@@ -20,9 +34,11 @@ class AuroraGraph:
             'reset': '\033[0m'
         }
         
+    @cached()
+    @timed("graph.sample_data")
     def generate_sample_data(self, days=14):
         """Generate sample aurora activity data"""
-        data = []
+        data = KpSeries()
         base_activity = 3.0
         
         for i in range(days):
@@ -35,160 +51,128 @@ class AuroraGraph:
                 base_activity = min(9.0, base_activity + random.uniform(2.0, 4.0))
             
             date = datetime.date.today() - datetime.timedelta(days=days-1-i)
-            data.append({
-                'date': date,
-                'kp_index': round(base_activity, 1),
-                'activity_level': self.get_activity_level(base_activity)
-            })
+            data.append(date, round(base_activity, 1), activity_code(base_activity))
             
         return data
     
     def get_activity_level(self, kp):
         """Convert KP index to activity level"""
-        if kp < 2:
-            return "Quiet"
-        elif kp < 3:
-            return "Unsettled"
-        elif kp < 4:
-            return "Active"
-        elif kp < 5:
-            return "Minor Storm"
-        elif kp < 6:
-            return "Moderate Storm"
-        elif kp < 7:
-            return "Strong Storm"
-        elif kp < 8:
-            return "Severe Storm"
-        else:
-            return "Extreme Storm"
+        return activity_level(kp)
     
-    def create_bar_chart(self, data):
-        """Create a horizontal bar chart of aurora activity"""
-        print(self.colors['cyan'] + "📊 AURORA ACTIVITY - PAST 14 DAYS 📊" + self.colors['reset'])
-        print(self.colors['white'] + "=" * 50 + self.colors['reset'])
-        print()
-        
-        # Header
-        print(f"{'Date':<12} {'KP':<4} {'Activity':<15} {'Graph':<20}")
-        print("-" * 55)
-        
-        for day in data:
-            date_str = day['date'].strftime("%m-%d")
-            kp_val = day['kp_index']
-            activity = day['activity_level']
-            
-            # Create visual bar
-            bar_length = int(kp_val * 2)  # Scale for visibility
-            if kp_val < 2:
-                bar_color = self.colors['green']
-                bar_char = '█'
-            elif kp_val < 4:
-                bar_color = self.colors['yellow']
-                bar_char = '█'
-            elif kp_val < 6:
-                bar_color = self.colors['red']
-                bar_char = '█'
-            else:
-                bar_color = self.colors['purple']
-                bar_char = '█'
-                
-            bar = bar_color + bar_char * bar_length + self.colors['reset']
-            
-            print(f"{date_str:<12} {kp_val:<4} {activity:<15} {bar} {kp_val}")
-        
-        print()
-        print(self.colors['green'] + "🟢 Quiet/Unsettled  " + self.colors['reset'] + 
-              self.colors['yellow'] + "🟡 Active  " + self.colors['reset'] + 
-              self.colors['red'] + "🔴 Storm  " + self.colors['reset'] + 
-              self.colors['purple'] + "🟣 Severe+" + self.colors['reset'])
+    def create_bar_chart(self, data, out=None, max_rows=60):
+        """Create a horizontal bar chart of aurora activity
+        
+        Series longer than max_rows are reduced to the peak day of each
+        of max_rows equal buckets so storms stay visible. Returns the
+        BarChartReport that was printed.
+        """
+        with stage("graph.bar_chart"):
+            report = self.bar_chart_report(data, max_rows)
+        with stage("graph.output"):
+            TextSerializer(self.colors).dump(report, out)
+        return report
     
-    def create_line_graph(self, data):
-        """Create a simple ASCII line graph"""
-        print("\n" + self.colors['blue'] + "📈 KP INDEX TREND LINE 📈" + self.colors['reset'])
-        print(self.colors['white'] + "=" * 40 + self.colors['reset'])
-        
-        # Scale values for display
-        max_kp = max(day['kp_index'] for day in data)
-        min_kp = min(day['kp_index'] for day in data)
-        
-        # Create grid
-        height = 10
-        width = len(data)
-        
-        print(f"\nKP Range: {min_kp:.1f} - {max_kp:.1f}")
-        print()
-        
-        # Y-axis labels and graph
-        for row in range(height, 0, -1):
-            kp_level = (row / height) * 9  # Scale to 0-9
-            print(f"{kp_level:4.1f} |", end="")
-            
-            for i, day in enumerate(data):
-                scaled_kp = (day['kp_index'] / 9) * height
-                if abs(scaled_kp - row) < 0.8:
-                    if day['kp_index'] < 3:
-                        print(self.colors['green'] + "●" + self.colors['reset'], end="")
-                    elif day['kp_index'] < 5:
-                        print(self.colors['yellow'] + "●" + self.colors['reset'], end="")
-                    else:
-                        print(self.colors['red'] + "●" + self.colors['reset'], end="")
-                else:
-                    print(" ", end="")
-            print()
-        
-        # X-axis
-        print("     " + "-" * width)
-        print("     ", end="")
-        for i, day in enumerate(data):
-            if i % 2 == 0:  # Show every other date
-                print(day['date'].strftime("%m/%d")[2:], end="")
-            else:
-                print("  ", end="")
-        print()
+    def bar_chart_report(self, data, max_rows=60):
+        """Compute the rows of the bar chart without printing"""
+        data = as_series(data)
+        total_days = len(data)
+        first_date = last_date = None
+        if total_days:
+            first_date = from_epoch_day(min(data.days))
+            last_date = from_epoch_day(max(data.days))
+        if max_rows and total_days > max_rows:
+            data = downsample_series(data, max_rows, method="max")
+        
+        rows = [
+            BarRow(from_epoch_day(data.days[i]), data.kp_at(i),
+                   ACTIVITY_LEVELS[data.levels[i]], BAR_COLOR_TABLE.label(data.kp_at(i)))
+            for i in range(len(data))
+        ]
+        return BarChartReport(total_days, rows, first_date, last_date)
     
-    def create_statistics_summary(self, data):
-        """Create a summary of aurora statistics"""
-        print("\n" + self.colors['purple'] + "📊 AURORA STATISTICS SUMMARY 📊" + self.colors['reset'])
-        print(self.colors['white'] + "=" * 35 + self.colors['reset'])
-        
-        kp_values = [day['kp_index'] for day in data]
-        
-        avg_kp = sum(kp_values) / len(kp_values)
-        max_kp = max(kp_values)
-        min_kp = min(kp_values)
-        
-        # Count activity levels
-        activity_counts = {}
-        for day in data:
-            level = day['activity_level']
-            activity_counts[level] = activity_counts.get(level, 0) + 1
-        
-        storm_days = sum(1 for kp in kp_values if kp >= 5)
-        active_days = sum(1 for kp in kp_values if kp >= 3)
-        
-        print(f"\n📊 KP Index Statistics:")
-        print(f"   Average KP: {avg_kp:.1f}")
-        print(f"   Maximum KP: {max_kp:.1f}")
-        print(f"   Minimum KP: {min_kp:.1f}")
-        
-        print(f"\n⚡ Activity Summary:")
-        print(f"   Storm Days (KP≥5): {storm_days}/14 days ({storm_days/14*100:.0f}%)")
-        print(f"   Active Days (KP≥3): {active_days}/14 days ({active_days/14*100:.0f}%)")
-        
-        print(f"\n🎯 Best Viewing Chances:")
-        excellent_days = sum(1 for kp in kp_values if kp >= 4)
-        good_days = sum(1 for kp in kp_values if kp >= 3)
-        
-        print(f"   Excellent (KP≥4): {excellent_days} days")
-        print(f"   Good (KP≥3): {good_days} days")
-        
-        if max_kp >= 6:
-            print(f"\n🌟 Highlights:")
-            print(f"   Peak activity reached {max_kp:.1f} - {self.get_activity_level(max_kp)}!")
-            print(f"   Aurora likely visible as far south as central US!")
+    def create_line_graph(self, data, out=None, max_width=None):
+        """Create a simple ASCII line graph
+        
+        Series wider than max_width columns (default: terminal width) are
+        reduced with Largest-Triangle-Three-Buckets before plotting.
+        Returns the LineGraphReport that was printed.
+        """
+        with stage("graph.line_graph"):
+            report = self.line_graph_report(data, max_width)
+        with stage("graph.output"):
+            TextSerializer(self.colors).dump(report, out)
+        return report
+    
+    def line_graph_report(self, data, max_width=None):
+        """Compute the KP range and plotted points without printing"""
+        data = as_series(data)
+        
+        # Scale values for display (range taken before downsampling)
+        max_kp = data.kp_at(max(range(len(data)), key=data.kp.__getitem__))
+        min_kp = data.kp_at(min(range(len(data)), key=data.kp.__getitem__))
+        
+        if max_width is None:
+            max_width = shutil.get_terminal_size().columns - 6
+        if max_width > 0 and len(data) > max_width:
+            data = downsample_series(data, max_width, method="lttb")
+        kp_values = data.kp_values()
+        
+        # Color each point once instead of once per grid row
+        points = [
+            LinePoint(from_epoch_day(day), kp, color)
+            for day, kp, color in zip(data.days, kp_values, LINE_COLOR_TABLE.labels_for(kp_values))
+        ]
+        return LineGraphReport(min_kp, max_kp, points)
+    
+    def create_statistics_summary(self, data, out=None):
+        """Create a summary of aurora statistics
+        
+        data may be a KpSeries, a list of KP dicts or a KpStatistics
+        accumulator that has already been fed (and possibly merged).
+        Returns the StatisticsReport that was printed.
+        """
+        with stage("graph.statistics"):
+            report = self.statistics_report(data)
+        with stage("graph.output"):
+            TextSerializer(self.colors).dump(report, out)
+        return report
+    
+    def statistics_report(self, data):
+        """Compute the statistics summary without printing"""
+        if isinstance(data, KpStatistics):
+            stats = data
+        else:
+            stats = KpStatistics.from_series(data)
+        
+        return StatisticsReport(
+            count=stats.count,
+            mean=stats.mean,
+            min=stats.min,
+            max=stats.max,
+            storm_days=stats.count_at_least(5),
+            active_days=stats.count_at_least(3),
+            excellent_days=stats.count_at_least(4),
+            good_days=stats.count_at_least(3),
+            storm_fraction=stats.fraction_at_least(5),
+            active_fraction=stats.fraction_at_least(3),
+            peak_level=None if stats.max is None else self.get_activity_level(stats.max),
+        )
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    profile = pop_profile_flag(args)
+    if args:
+        print("usage: aurora_graph.py [--profile[=PREFIX]]", file=sys.stderr)
+        return 2
+    if profile:
+        # Profiles measure the computation, never a cache hit
+        run_profiled(show_graphs, profile)
+    else:
+        show_graphs(ForecastCache.from_env())
+    return 0
 
-def main():
-    aurora_graph = AuroraGraph()
+def show_graphs(cache=None):
+    aurora_graph = AuroraGraph(cache=cache)
     
     # Generate sample data
     data = aurora_graph.generate_sample_data(14)
@@ -202,4 +186,4 @@ def main():
     print(f"{aurora_graph.colors['green']}Perfect for planning your next aurora hunting adventure! 🌌{aurora_graph.colors['reset']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -7,6 +7,9 @@ A fun script to generate facts about the Northern Lights
 import random
 import datetime
 
+from aurora_classify import REPORT_VISIBILITY_TABLE
+from aurora_report import InfoReport, TextSerializer
+
 # Fun facts about Aurora Borealis
 aurora_facts = [
     "The aurora borealis is caused by charged particles from the sun colliding with Earth's magnetic field.",
@@ -21,46 +24,35 @@ aurora_facts = [
     "The aurora australis is the Southern Hemisphere equivalent of the aurora borealis."
 ]
 
-def generate_aurora_report():
-    """Generate a random aurora report with current information"""
-    print("🌌 AURORA BOREALIS INFORMATION REPORT 🌌")
-    print("=" * 50)
-    print(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
+viewing_tips = [
+    "Look north, away from city lights",
+    "Best viewing time: 10 PM - 2 AM",
+    "Clear, dark skies are essential",
+    "Be patient - activity can change quickly",
+    "Camera settings: ISO 800-3200, wide angle lens"
+]
+
+def aurora_report():
+    """Build a random aurora report without printing it"""
+    generated = datetime.datetime.now().replace(microsecond=0)
     
     # Generate random KP index (0-9 scale)
     kp_index = random.randint(0, 9)
-    
-    print(f"Current KP Index: {kp_index}/9")
-    
-    if kp_index <= 2:
-        visibility = "Low - Visible only in polar regions"
-    elif kp_index <= 4:
-        visibility = "Moderate - Visible in northern Canada and Alaska"
-    elif kp_index <= 6:
-        visibility = "High - Visible in northern US states"
-    else:
-        visibility = "Very High - Visible in southern Canada and northern US"
-    
-    print(f"Visibility: {visibility}")
-    print()
+    visibility = REPORT_VISIBILITY_TABLE.label(kp_index)
     
     # Random fact
     fact = random.choice(aurora_facts)
-    print("🔍 Random Aurora Fact:")
-    print(f"   {fact}")
-    print()
-    
-    # Generate viewing tips
-    print("👀 Viewing Tips:")
-    print("   • Look north, away from city lights")
-    print("   • Best viewing time: 10 PM - 2 AM")
-    print("   • Clear, dark skies are essential")
-    print("   • Be patient - activity can change quickly")
-    print("   • Camera settings: ISO 800-3200, wide angle lens")
-    print()
     
-    print("✨ Happy aurora hunting! ✨")
+    return InfoReport(generated, kp_index, visibility, fact, list(viewing_tips))
+
+def generate_aurora_report(out=None):
+    """Generate a random aurora report with current information"""
+    report = aurora_report()
+    TextSerializer().dump(report, out)
+    return report
+
+def main():
+    generate_aurora_report()
 
 if __name__ == "__main__":
-    generate_aurora_report()
\ No newline at end of file
+    main()
\ No newline at end of file
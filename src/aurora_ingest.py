@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Historical KP Archive Ingestion
+Streams GFZ/NOAA-style text and CSV KP records into a compact memory-mapped archive
+"""
+
+import argparse
+import bisect
+import csv
+import datetime
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from aurora_classify import activity_codes
+from aurora_numpy import numpy_for
+from aurora_series import EPOCH, KpSeries
+
+# File layout: 16-byte header, then an int32 column of hours since
+# 1970-01-01 00:00 UTC (start of each 3-hour interval), then a float32
+# column of KP values. Both columns are little-endian and sorted by time.
+MAGIC = b"AURKP\x00\x01\x00"
+HEADER = struct.Struct("<8sII")  # magic, record count, reserved
+
+CHUNK_RECORDS = 65536
+
+_EPOCH_ORDINAL = EPOCH.toordinal()
+_TIME_COLUMNS = ("datetime", "timestamp", "time", "date")
+_KP_COLUMNS = ("kp", "kp_index")
+
+
+def epoch_hours(moment):
+    """Hours since 1970-01-01 00:00 for a date or naive UTC datetime"""
+    hours = (moment.toordinal() - _EPOCH_ORDINAL) * 24
+    if isinstance(moment, datetime.datetime):
+        hours += moment.hour
+    return hours
+
+
+def parse_fixed_width(lines):
+    """
+    Parse GFZ "Kp_ap_since_1932" style text.
+
+    Each data line starts with "YYYY MM DD hh.h hh._m days days_m Kp ...";
+    comment lines start with '#'. Missing values (-1) are skipped.
+    Yields (epoch_hour, kp) tuples.
+    """
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split()
+        if len(fields) < 8:
+            continue
+        kp = float(fields[7])
+        if kp < 0:
+            continue
+        day = datetime.date(int(fields[0]), int(fields[1]), int(fields[2]))
+        yield epoch_hours(day) + int(float(fields[3])), kp
+
+
+def parse_csv(lines):
+    """
+    Parse CSV with a header naming a time column (datetime/timestamp/time/
+    date, ISO formatted), an optional "hour" column and a kp column.
+    Times with a UTC offset are converted to UTC; naive ones are taken
+    as UTC. Yields (epoch_hour, kp) tuples.
+    """
+    reader = csv.reader(line for line in lines if line.strip() and not line.startswith("#"))
+    header = [name.strip().lower() for name in next(reader)]
+    time_col = next((header.index(name) for name in _TIME_COLUMNS if name in header), None)
+    kp_col = next((header.index(name) for name in _KP_COLUMNS if name in header), None)
+    if time_col is None or kp_col is None:
+        raise ValueError(f"CSV header needs a time and a kp column, got {header}")
+    hour_col = header.index("hour") if "hour" in header else None
+
+    for row in reader:
+        value = row[kp_col].strip()
+        if not value:
+            continue
+        kp = float(value)
+        if kp < 0:
+            continue
+        stamp = row[time_col].strip()
+        if stamp.endswith("Z"):
+            stamp = stamp[:-1] + "+00:00"
+        moment = datetime.datetime.fromisoformat(stamp)
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        hours = epoch_hours(moment)
+        if hour_col is not None:
+            hours += int(float(row[hour_col]))
+        yield hours, kp
+
+
+def parse_file(path):
+    """Stream (epoch_hour, kp) records from a text or CSV archive file"""
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        if path.lower().endswith(".csv"):
+            yield from parse_csv(handle)
+        else:
+            yield from parse_fixed_width(handle)
+
+
+def write_archive(records, path, chunk_records=CHUNK_RECORDS):
+    """
+    Stream time-sorted (epoch_hour, kp) records into a binary archive.
+
+    Records are buffered in typed-array chunks; the time column goes
+    straight to the output file and the KP column to a spool file that is
+    appended once the input is exhausted, so memory use stays at one chunk
+    regardless of archive size. The archive is built in a temporary file
+    next to path and renamed over it only once complete, so a bad record
+    leaves any existing archive untouched. Returns the number of records
+    written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    last_hour = None
+    hours, values = array("i"), array("f")
+    big_endian = sys.byteorder != "little"
+
+    def flush():
+        if big_endian:
+            hours.byteswap()
+            values.byteswap()
+        hours.tofile(out)
+        values.tofile(spool)
+        del hours[:], values[:]
+
+    try:
+        with open(tmp_path, "xb") as out, tempfile.TemporaryFile(dir=directory) as spool:
+            out.write(HEADER.pack(MAGIC, 0, 0))
+            for hour, kp in records:
+                if last_hour is not None and hour <= last_hour:
+                    raise ValueError(f"Records must be sorted by time (hour {hour} after {last_hour})")
+                last_hour = hour
+                hours.append(hour)
+                values.append(kp)
+                count += 1
+                if len(hours) >= chunk_records:
+                    flush()
+            flush()
+
+            spool.seek(0)
+            shutil.copyfileobj(spool, out)
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, count, 0))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+def ingest(paths, archive_path, append=False):
+    """
+    Merge several source files (each sorted, in time order) into one archive.
+
+    With append=True the readings already in archive_path are kept and
+    only newer source records are added. The rollup levels saved beside
+    the archive (aurora_rollup) are updated with the added readings
+    rather than rebuilt. Returns the number of records in the archive.
+    """
+    from aurora_rollup import KpRollup, rollup_path
+
+    existing = None
+    if append and os.path.exists(archive_path):
+        existing = KpArchive(archive_path)
+    try:
+        rollup = KpRollup() if existing is None else KpRollup.open_archive(existing)
+        kept = 0 if existing is None else len(existing)
+
+        def records():
+            last_hour = None
+            if kept:
+                yield from zip(existing.hours, existing.kp)
+                last_hour = existing.hours[-1]
+            for path in paths:
+                for hour, kp in parse_file(path):
+                    # Overlapping downloads repeat intervals; keep the first copy
+                    if last_hour is None or hour > last_hour:
+                        last_hour = hour
+                        yield hour, kp
+
+        count = write_archive(records(), archive_path)
+    finally:
+        if existing is not None:
+            existing.close()
+
+    # Fold in only the new readings, as stored (float32)
+    with KpArchive(archive_path) as archive:
+        rollup.attach(archive, kept)
+        rollup.save(rollup_path(archive_path), archive)
+    return count
+
+
+class KpArchive:
+    """
+    Read-only view of a binary KP archive through mmap.
+
+    hours and kp are memoryviews cast straight onto the mapped file, so
+    opening an archive reads nothing up front and slicing by date range
+    (a bisect on the time column) copies nothing. Use as a context
+    manager, or call close(), to release the mapping; slices returned by
+    slice() must be released or dropped first.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, _ = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a KP archive")
+
+        self._view = memoryview(self._mmap)
+        start = HEADER.size
+        middle = start + 4 * count
+        if sys.byteorder == "little":
+            self.hours = self._view[start:middle].cast("i")
+            self.kp = self._view[middle:middle + 4 * count].cast("f")
+        else:  # Big-endian hosts pay for one byte-swapped copy
+            self.hours = array("i", self._view[start:middle].tobytes())
+            self.kp = array("f", self._view[middle:middle + 4 * count].tobytes())
+            self.hours.byteswap()
+            self.kp.byteswap()
+
+    def __len__(self):
+        return len(self.kp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the views, the mapping and the file"""
+        for name in ("hours", "kp", "_view"):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def index_range(self, start=None, end=None):
+        """Index bounds of records with start <= time < end (dates or datetimes)"""
+        low = 0 if start is None else bisect.bisect_left(self.hours, epoch_hours(start))
+        high = len(self) if end is None else bisect.bisect_left(self.hours, epoch_hours(end))
+        return low, max(low, high)
+
+    def slice(self, start=None, end=None):
+        """Zero-copy (hours, kp) memoryview slices for a time range"""
+        low, high = self.index_range(start, end)
+        return self.hours[low:high], self.kp[low:high]
+
+    def first_time(self):
+        return self._to_datetime(self.hours[0])
+
+    def last_time(self):
+        return self._to_datetime(self.hours[-1])
+
+    def _to_datetime(self, hour):
+        day, hour = divmod(hour, 24)
+        return datetime.datetime.combine(
+            datetime.date.fromordinal(day + _EPOCH_ORDINAL), datetime.time(hour))
+
+    def to_series(self, start=None, end=None, use_numpy=None):
+        """Daily-maximum KpSeries for a time range, ready for the graph tools"""
+        hours, values = self.slice(start, end)
+        series = KpSeries()
+        if not len(values):
+            return series
+
+        np = numpy_for(use_numpy)
+        if np is not None:
+            days = np.frombuffer(hours, dtype=np.int32) // 24
+            kp = np.frombuffer(values, dtype=np.float32)
+            starts = np.flatnonzero(np.diff(days, prepend=days[0] - 1))
+            series.days = array("i", days[starts].tolist())
+            series.kp = array("f", np.maximum.reduceat(kp, starts).tolist())
+        else:
+            current_day, peak = None, 0.0
+            for hour, kp in zip(hours, values):
+                day = hour // 24
+                if day != current_day:
+                    if current_day is not None:
+                        series.days.append(current_day)
+                        series.kp.append(peak)
+                    current_day, peak = day, kp
+                elif kp > peak:
+                    peak = kp
+            series.days.append(current_day)
+            series.kp.append(peak)
+
+        series.levels = array("B", activity_codes(series.kp))
+        return series
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert historical KP files into a binary archive")
+    parser.add_argument("sources", nargs="+", help="GFZ-style text or CSV files, oldest first")
+    parser.add_argument("-o", "--output", required=True, help="Archive file to write")
+    parser.add_argument("--append", action="store_true",
+                        help="Keep the archive's readings and add only newer records")
+    args = parser.parse_args(argv)
+
+    count = ingest(args.sources, args.output, append=args.append)
+    print(f"📦 Wrote {count} KP records to {args.output}")
+    if count:
+        with KpArchive(args.output) as archive:
+            print(f"   Coverage: {archive.first_time():%Y-%m-%d %H:%M} to {archive.last_time():%Y-%m-%d %H:%M}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Online KP Forecast Model
+27-day recurrence, autoregression and an 11-year solar cycle, updated one day at a time
+"""
+
+import argparse
+import collections
+import math
+import sys
+
+from aurora_ensemble import KP_MAX, KP_MIN
+from aurora_series import KpSeries, as_series, from_epoch_day, to_epoch_day
+
+# Solar rotation seen from Earth (recurring coronal-hole streams) and the
+# mean sunspot cycle, in days
+RECURRENCE_DAYS = 27
+SOLAR_CYCLE_DAYS = 4018
+
+FEATURES = ("intercept", "lag1", "lag2", "lag27", "cycle_sin", "cycle_cos")
+MAX_HORIZON = 60
+
+# Tiny ridge term so the normal equations stay solvable on short histories
+RIDGE = 1e-6
+
+
+def _solve(matrix, vector):
+    """Solve a small dense linear system by Gaussian elimination with partial pivoting"""
+    size = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(size)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        pivot_row = rows[column]
+        for row in range(column + 1, size):
+            factor = rows[row][column] / pivot_row[column]
+            if factor:
+                target = rows[row]
+                for index in range(column, size + 1):
+                    target[index] -= factor * pivot_row[index]
+    solution = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        total = rows[row][size] - sum(rows[row][index] * solution[index]
+                                      for index in range(row + 1, size))
+        solution[row] = total / rows[row][row]
+    return solution
+
+
+class KpModel:
+    """
+    Daily KP model fitted online by recursive least squares on running sums.
+
+    kp(t) = c + a1*kp(t-1) + a2*kp(t-2) + r*kp(t-27)
+            + s*sin(2*pi*t/cycle) + k*cos(2*pi*t/cycle)
+
+    update() folds one daily observation into the normal equations
+    (X'X and X'y, 6x6 and 6 numbers) in constant time; forgetting < 1
+    exponentially down-weights old days so the fit tracks the cycle. The
+    coefficients and a forecast out to max_horizon days are solved and
+    rolled out once per new observation, then every horizon is a slice
+    of that cached path. Missing days are filled with the last value.
+    """
+
+    def __init__(self, forgetting=1.0, max_horizon=MAX_HORIZON):
+        self.forgetting = forgetting
+        self.max_horizon = max_horizon
+        size = len(FEATURES)
+        self.xtx = [[0.0] * size for _ in range(size)]
+        self.xty = [0.0] * size
+        self.history = collections.deque(maxlen=RECURRENCE_DAYS)
+        self.last_day = None
+        self.observations = 0
+        self.fitted = 0       # Observations that entered the regression
+        self.weight = 0.0     # Their total weight after forgetting
+        self.yty = 0.0
+        self.mean = 0.0
+        self._coefficients = None
+        self._path = None
+
+    @classmethod
+    def from_history(cls, data, **kwargs):
+        """Model fitted to a daily KpSeries, list of KP dicts, archive or rollup"""
+        model = cls(**kwargs)
+        model.update_series(as_series(data))
+        return model
+
+    @property
+    def version(self):
+        """Changes whenever an observation is added (part of tracker cache keys)"""
+        return (self.observations, self.last_day)
+
+    def features(self, day, history):
+        """Regression inputs for day given the 27 preceding daily values (oldest first)"""
+        angle = 2 * math.pi * day / SOLAR_CYCLE_DAYS
+        return (1.0, history[-1], history[-2], history[-RECURRENCE_DAYS],
+                math.sin(angle), math.cos(angle))
+
+    def update(self, date, kp):
+        """Add the KP value observed on a date (or epoch day); constant time"""
+        day = date if isinstance(date, int) else to_epoch_day(date)
+        kp = float(kp)
+        if self.last_day is not None:
+            if day <= self.last_day:
+                raise ValueError("Observations must be added in date order, one per day")
+            # Carry the last value over missing days so lags stay aligned
+            for _ in range(min(day - self.last_day - 1, RECURRENCE_DAYS)):
+                self.history.append(self.history[-1])
+
+        if len(self.history) == RECURRENCE_DAYS:
+            x = self.features(day, self.history)
+            decay = self.forgetting
+            xtx, xty = self.xtx, self.xty
+            for i, xi in enumerate(x):
+                row = xtx[i]
+                for j, xj in enumerate(x):
+                    row[j] = decay * row[j] + xi * xj
+                xty[i] = decay * xty[i] + xi * kp
+            self.yty = decay * self.yty + kp * kp
+            self.weight = decay * self.weight + 1.0
+            self.fitted += 1
+
+        self.history.append(kp)
+        self.observations += 1
+        self.mean += (kp - self.mean) / self.observations
+        self.last_day = day
+        self._coefficients = None
+        self._path = None
+
+    def update_series(self, series):
+        """Add every day of a KpSeries"""
+        for index in range(len(series)):
+            self.update(series.days[index], series.kp[index])
+
+    @property
+    def coefficients(self):
+        """Fitted coefficients by feature name (None until enough data)"""
+        if self._coefficients is None and self.fitted >= 2 * len(FEATURES):
+            size = len(FEATURES)
+            scale = max(self.xtx[i][i] for i in range(size)) or 1.0
+            regularized = [[value + (RIDGE * scale if i == j else 0.0)
+                            for j, value in enumerate(row)] for i, row in enumerate(self.xtx)]
+            solution = _solve(regularized, self.xty)
+            if solution is not None:
+                self._coefficients = dict(zip(FEATURES, solution))
+        return self._coefficients
+
+    @property
+    def rmse(self):
+        """Root mean squared in-sample residual, from the running sums"""
+        coefficients = self.coefficients
+        if coefficients is None:
+            return None
+        beta = list(coefficients.values())
+        fitted = sum(b * sum(row[j] * beta[j] for j in range(len(beta)))
+                     for b, row in zip(beta, self.xtx))
+        explained = sum(b * value for b, value in zip(beta, self.xty))
+        # y'y - 2b'X'y + b'X'Xb
+        return math.sqrt(max(0.0, self.yty - 2 * explained + fitted) / self.weight)
+
+    def _predict(self, x):
+        coefficients = self.coefficients
+        if coefficients is None:
+            return self.mean
+        return sum(weight * value for weight, value in zip(coefficients.values(), x))
+
+    def _rollout(self):
+        """Forecast path for days 1..max_horizon after the last observation"""
+        if self._path is None:
+            history = list(self.history)
+            path = []
+            for step in range(1, self.max_horizon + 1):
+                if len(history) < RECURRENCE_DAYS:
+                    value = self.mean  # Not enough history for the lags yet
+                else:
+                    value = self._predict(self.features(self.last_day + step, history))
+                value = min(KP_MAX, max(KP_MIN, value))
+                path.append(value)
+                history.append(value)
+                if len(history) > RECURRENCE_DAYS:
+                    del history[0]
+            self._path = path
+        return self._path
+
+    def forecast(self, days=7, start=None):
+        """
+        KpSeries forecast for days consecutive days from start.
+
+        start defaults to the day after the last observation and may be
+        any later date within max_horizon; every horizon is read from the
+        same cached path.
+        """
+        if self.last_day is None:
+            raise ValueError("The model has no observations yet")
+        first = self.last_day + 1 if start is None else (
+            start if isinstance(start, int) else to_epoch_day(start))
+        offset = first - self.last_day - 1
+        if offset < 0 or offset + days > self.max_horizon:
+            raise ValueError(f"Forecasts cover the {self.max_horizon} days after the last observation")
+
+        path = self._rollout()
+        series = KpSeries(date_format="%Y-%m-%d")
+        for step in range(days):
+            series.append(first + step, round(path[offset + step], 1))
+        return series
+
+    def describe(self):
+        """Fitted coefficients, error and coverage as a plain dict"""
+        return {
+            "observations": self.observations,
+            "last_date": None if self.last_day is None else from_epoch_day(self.last_day).isoformat(),
+            "coefficients": self.coefficients,
+            "rmse": self.rmse,
+            "mean": self.mean,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the KP model to an archive and forecast")
+    parser.add_argument("archive", help="Archive written by aurora_ingest.py")
+    parser.add_argument("--days", type=int, default=7, help="Days to forecast (default: %(default)s)")
+    parser.add_argument("--forgetting", type=float, default=1.0,
+                        help="Per-day weight decay for old observations, e.g. 0.999")
+    args = parser.parse_args(argv)
+
+    from aurora_ingest import KpArchive
+    with KpArchive(args.archive) as archive:
+        model = KpModel.from_history(archive.to_series(), forgetting=args.forgetting,
+                                     max_horizon=max(MAX_HORIZON, args.days))
+
+    summary = model.describe()
+    print(f"🔭 Fitted {summary['observations']} days up to {summary['last_date']}")
+    if summary["coefficients"]:
+        print("   " + ", ".join(f"{name} {value:+.3f}" for name, value in summary["coefficients"].items()))
+        print(f"   In-sample RMSE {summary['rmse']:.2f} KP")
+    for record in model.forecast(args.days):
+        print(f"   {record['date']}: KP {record['kp_index']} - {record['activity_level']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Optional numpy Support
+Imports numpy on first use and decides which code path use_numpy=None picks
+"""
+
+import sys
+
+# use_numpy=None means "numpy if installed" unless this is switched off
+_default = True
+_numpy = None
+_missing = False
+
+
+def set_default(enabled):
+    """Choose the path use_numpy=None takes: numpy when installed (True) or pure Python (False)"""
+    global _default
+    _default = bool(enabled)
+
+
+def default():
+    return _default
+
+
+def numpy_for(use_numpy=None):
+    """
+    numpy module for a computation, or None for the pure-Python path.
+
+    use_numpy=None follows set_default() and whether numpy is installed;
+    True requires numpy; False never imports it. numpy is imported here
+    on first use rather than when modules load, so commands that never
+    take the numpy path do not pay for the import.
+    """
+    global _numpy, _missing
+    if use_numpy is None:
+        use_numpy = _default
+        required = False
+    else:
+        required = use_numpy
+    if not use_numpy:
+        return None
+    if _numpy is None and not _missing:
+        try:
+            import numpy
+        except ImportError:  # numpy is optional, see requirements.txt
+            _missing = True
+        else:
+            _numpy = numpy
+    if _numpy is None and required:
+        raise RuntimeError("numpy is required for use_numpy=True")
+    return _numpy
+
+
+def loaded_numpy():
+    """numpy if some code already imported it, else None (for isinstance checks on inputs)"""
+    return sys.modules.get("numpy")
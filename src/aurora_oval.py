@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Auroral Oval Model
+Oval intensity on a global grid per KP, as a terminal heat map or PNG/PPM image
+"""
+
+import argparse
+import math
+import struct
+import sys
+import zlib
+from array import array
+
+from aurora_animate import RAMP
+from aurora_geomag import DIPOLE_POLE_LAT, DIPOLE_POLE_LON
+from aurora_numpy import numpy_for
+from aurora_probability import visibility_threshold
+from aurora_render import Frame
+
+RESOLUTION = 0.5  # Grid cell size in degrees
+
+# Grids are cached per KP third (0, 0+, 1-, 1o, ... 9o: the official KP steps)
+KP_STEPS_PER_UNIT = 3
+KP_MAX = 9
+
+# The oval is a band of magnetic latitude centred this far poleward of the
+# visibility threshold (67 - kp*2.5), widening and brightening with KP
+CENTER_OFFSET = 5.0
+BASE_WIDTH = 2.0
+WIDTH_PER_KP = 0.35
+MIN_PEAK = 0.25
+
+# Cell levels run 0..MAX_LEVEL; the last palette entry draws the graticule
+MAX_LEVEL = 254
+GRATICULE_LEVEL = 255
+GRATICULE_DEGREES = 30
+
+# Image palette from night sky through green oxygen light to red/pink
+PALETTE_STOPS = ((0.0, (4, 8, 24)), (0.25, (10, 70, 50)), (0.6, (40, 230, 100)),
+                 (0.85, (210, 240, 120)), (1.0, (255, 90, 140)))
+GRATICULE_COLOR = (70, 70, 90)
+
+# Terminal colors by level fraction (None: default color)
+HEAT_COLORS = ((0.15, None), (0.4, '\033[32m'), (0.7, '\033[92m'), (0.9, '\033[93m'),
+               (1.01, '\033[91m'))
+SITE_COLOR = '\033[96m'
+SITE_CHAR = 'o'
+
+
+def oval_center(kp_index):
+    """Magnetic latitude of the oval's brightest line"""
+    return visibility_threshold(kp_index) + CENTER_OFFSET
+
+
+def oval_width(kp_index):
+    """Gaussian half-width of the oval in degrees of magnetic latitude"""
+    return BASE_WIDTH + WIDTH_PER_KP * kp_index
+
+
+def oval_peak(kp_index):
+    """Relative brightness (0-1) along the oval's centre"""
+    return MIN_PEAK + (1 - MIN_PEAK) * min(KP_MAX, max(0.0, kp_index)) / KP_MAX
+
+
+def oval_intensity(magnetic_lat, kp_index):
+    """Relative oval intensity (0-1) at a magnetic latitude, either hemisphere"""
+    offset = (abs(magnetic_lat) - oval_center(kp_index)) / oval_width(kp_index)
+    return oval_peak(kp_index) * math.exp(-0.5 * offset * offset)
+
+
+def kp_step(kp_index):
+    """Cache bucket of a KP value: the nearest KP third"""
+    return int(round(min(KP_MAX, max(0.0, kp_index)) * KP_STEPS_PER_UNIT))
+
+
+def palette():
+    """256 RGB entries: MAX_LEVEL + 1 intensity shades, then the graticule color"""
+    colors = []
+    for level in range(MAX_LEVEL + 1):
+        fraction = level / MAX_LEVEL
+        for (low, low_rgb), (high, high_rgb) in zip(PALETTE_STOPS, PALETTE_STOPS[1:]):
+            if fraction <= high:
+                mix = (fraction - low) / (high - low)
+                colors.append(tuple(round(a + (b - a) * mix) for a, b in zip(low_rgb, high_rgb)))
+                break
+    colors.append(GRATICULE_COLOR)
+    return colors
+
+
+class OvalGrid:
+    """
+    Oval intensity for one KP step on the global grid.
+
+    levels holds one byte per cell (0..MAX_LEVEL), row-major from the
+    northernmost row and the -180 degree meridian.
+    """
+
+    __slots__ = ("kp", "rows", "cols", "resolution", "levels")
+
+    def __init__(self, kp, rows, cols, resolution, levels):
+        self.kp = kp
+        self.rows = rows
+        self.cols = cols
+        self.resolution = resolution
+        self.levels = levels
+
+    def cell(self, lat, lon):
+        row = min(self.rows - 1, max(0, int((90 - lat) / self.resolution)))
+        col = int(((lon + 180) % 360) / self.resolution) % self.cols
+        return row, col
+
+    def intensity(self, lat, lon):
+        """Relative intensity (0-1) of the cell containing a point"""
+        row, col = self.cell(lat, lon)
+        return self.levels[row * self.cols + col] / MAX_LEVEL
+
+
+class OvalModel:
+    """
+    Oval grids per KP step, computed with array operations and cached.
+
+    The magnetic latitude of every cell is computed once per model (the
+    dipole formula separates into per-row and per-column terms). With
+    numpy each KP step is one vectorized Gaussian over that grid; without
+    it, |magnetic latitude| is stored per cell in resolution-sized steps
+    and each KP step is a lookup table over those steps: one byte per cell
+    applied with bytes.translate, or two bytes per cell when resolutions
+    finer than 90/255 degrees need more than 256 steps.
+    """
+
+    def __init__(self, resolution=RESOLUTION, use_numpy=None):
+        self.resolution = resolution
+        self.use_numpy = numpy_for(use_numpy) is not None
+        self.rows = int(round(180 / resolution))
+        self.cols = int(round(360 / resolution))
+        self._magnetic = None
+        self._grids = {}
+        self._projections = {}
+
+    def _magnetic_grid(self):
+        """|magnetic latitude| per cell: floats with numpy, else resolution steps (bytes or array('H'))"""
+        if self._magnetic is None:
+            half = self.resolution / 2
+            lats = [90 - half - self.resolution * row for row in range(self.rows)]
+            lons = [-180 + half + self.resolution * col for col in range(self.cols)]
+            sin_pole = math.sin(math.radians(DIPOLE_POLE_LAT))
+            cos_pole = math.cos(math.radians(DIPOLE_POLE_LAT))
+            np = numpy_for(self.use_numpy)
+            if np is not None:
+                lat_r = np.radians(np.array(lats))[:, np.newaxis]
+                dlon = np.cos(np.radians(np.array(lons) - DIPOLE_POLE_LON))[np.newaxis, :]
+                sin_mlat = np.sin(lat_r) * sin_pole + np.cos(lat_r) * cos_pole * dlon
+                self._magnetic = np.abs(np.degrees(np.arcsin(np.clip(sin_mlat, -1.0, 1.0)))).ravel()
+            else:
+                dlons = [math.cos(math.radians(lon - DIPOLE_POLE_LON)) * cos_pole for lon in lons]
+                steps = bytearray() if self._codes() <= 256 else array("H")
+                asin, scale = math.asin, 1 / math.radians(self.resolution)
+                for lat in lats:
+                    lat_r = math.radians(lat)
+                    a, b = math.sin(lat_r) * sin_pole, math.cos(lat_r)
+                    steps.extend(int(abs(asin(max(-1.0, min(1.0, a + b * d)))) * scale + 0.5)
+                                 for d in dlons)
+                self._magnetic = bytes(steps) if isinstance(steps, bytearray) else steps
+        return self._magnetic
+
+    def _codes(self):
+        """Number of resolution steps from 0 to 90 degrees of magnetic latitude"""
+        return int(90 / self.resolution + 0.5) + 1
+
+    def grid(self, kp_index):
+        """OvalGrid for the KP step nearest kp_index"""
+        step = kp_step(kp_index)
+        grid = self._grids.get(step)
+        if grid is None:
+            kp = step / KP_STEPS_PER_UNIT
+            magnetic = self._magnetic_grid()
+            np = numpy_for(self.use_numpy)
+            if np is not None:
+                offset = (magnetic - oval_center(kp)) / oval_width(kp)
+                intensity = oval_peak(kp) * np.exp(-0.5 * offset * offset)
+                levels = np.rint(intensity * MAX_LEVEL).astype(np.uint8).tobytes()
+            else:
+                table = bytes(min(MAX_LEVEL, round(oval_intensity(code * self.resolution, kp) * MAX_LEVEL))
+                              for code in range(max(256, self._codes())))
+                if isinstance(magnetic, bytes):
+                    levels = magnetic.translate(table)
+                else:
+                    levels = bytes(map(table.__getitem__, magnetic))
+            grid = self._grids[step] = OvalGrid(kp, self.rows, self.cols, self.resolution, levels)
+        return grid
+
+    def grids(self, kp_values):
+        """One grid per forecast step; repeated KP steps share a grid"""
+        return [self.grid(kp) for kp in kp_values]
+
+    def _projection(self, width, height, lat_min, south):
+        """Grid cell index (or None) for each character of a polar view, cached per shape"""
+        key = (width, height, lat_min, south)
+        cells = self._projections.get(key)
+        if cells is None:
+            cells = []
+            span = 90 - lat_min
+            for row in range(height):
+                dy = (row - (height - 1) / 2) / (height / 2)
+                for col in range(width):
+                    dx = (col - (width - 1) / 2) / (width / 2)
+                    rho = math.hypot(dx, dy)
+                    if rho > 1:
+                        cells.append(None)
+                        continue
+                    lat = 90 - rho * span
+                    lon = math.degrees(math.atan2(dx, -dy if south else dy))
+                    if south:
+                        lat = -lat
+                    row_index = min(self.rows - 1, int((90 - lat) / self.resolution))
+                    col_index = int(((lon + 180) % 360) / self.resolution) % self.cols
+                    cells.append(row_index * self.cols + col_index)
+            self._projections[key] = cells
+        return cells
+
+    def heatmap(self, kp_index, width=61, lat_min=35.0, south=False, sites=None, title=None):
+        """
+        Polar heat map of the oval as terminal text.
+
+        The view looks down on the pole with 0 degrees longitude at the
+        bottom (at the top for the southern view) and reaches out to
+        lat_min. sites is an optional name -> {"lat", "lon"} mapping drawn
+        as markers.
+        """
+        grid = self.grid(kp_index)
+        height = max(3, width // 2)
+        cells = self._projection(width, height, lat_min, south)
+        levels = grid.levels
+        chars = [" " if index is None else RAMP[levels[index] * (len(RAMP) - 1) // MAX_LEVEL]
+                 for index in cells]
+        colors = [None if index is None else
+                  next(color for limit, color in HEAT_COLORS if levels[index] / MAX_LEVEL < limit)
+                  for index in cells]
+
+        for site in (sites or {}).values():
+            lat = -site["lat"] if south else site["lat"]
+            if lat < lat_min:
+                continue
+            rho = (90 - lat) / (90 - lat_min)
+            angle = math.radians(site["lon"])
+            col = round((width - 1) / 2 + rho * math.sin(angle) * width / 2)
+            row = round((height - 1) / 2 + (-1 if south else 1) * rho * math.cos(angle) * height / 2)
+            if 0 <= row < height and 0 <= col < width:
+                chars[row * width + col] = SITE_CHAR
+                colors[row * width + col] = SITE_COLOR
+
+        frame = Frame()
+        hemisphere = "S" if south else "N"
+        frame.line(title or f"🌐 AURORAL OVAL - KP {grid.kp:.1f}", '\033[96m')
+        for row in range(height):
+            for col in range(width):
+                frame.write(chars[row * width + col], colors[row * width + col])
+            frame.newline()
+        frame.line(f"Brightest at {oval_center(grid.kp):.1f}° magnetic, visible on the horizon "
+                   f"from {visibility_threshold(grid.kp):.1f}° · view to {lat_min:g}°{hemisphere}"
+                   + (f" · {SITE_CHAR} = site" if sites else ""))
+        return frame.getvalue()
+
+    def _image_levels(self, grid, graticule=True):
+        levels = bytearray(grid.levels)
+        if graticule:
+            every = int(round(GRATICULE_DEGREES / self.resolution))
+            for row in range(every, self.rows, every):
+                start = row * self.cols
+                levels[start:start + self.cols] = bytes([GRATICULE_LEVEL]) * self.cols
+            for col in range(0, self.cols, every):
+                levels[col::self.cols] = bytes([GRATICULE_LEVEL]) * self.rows
+        return levels
+
+    def write_png(self, grid, path, graticule=True):
+        """Write a grid as an 8-bit indexed-color PNG (equirectangular)"""
+        levels = self._image_levels(grid, graticule)
+        raw = bytearray()
+        for row in range(self.rows):
+            raw.append(0)  # Filter type: none
+            raw += levels[row * self.cols:(row + 1) * self.cols]
+
+        def chunk(kind, data):
+            return (struct.pack(">I", len(data)) + kind + data
+                    + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+        with open(path, "wb") as handle:
+            handle.write(b"\x89PNG\r\n\x1a\n")
+            handle.write(chunk(b"IHDR", struct.pack(">IIBBBBB", self.cols, self.rows, 8, 3, 0, 0, 0)))
+            handle.write(chunk(b"PLTE", bytes(channel for color in palette() for channel in color)))
+            handle.write(chunk(b"IDAT", zlib.compress(bytes(raw), 6)))
+            handle.write(chunk(b"IEND", b""))
+
+    def write_ppm(self, grid, path, graticule=True):
+        """Write a grid as a binary PPM (P6), expanding levels through the palette"""
+        levels = bytes(self._image_levels(grid, graticule))
+        colors = palette()
+        pixels = bytearray(3 * len(levels))
+        for channel in range(3):
+            pixels[channel::3] = levels.translate(bytes(color[channel] for color in colors))
+        with open(path, "wb") as handle:
+            handle.write(f"P6\n{self.cols} {self.rows}\n255\n".encode("ascii"))
+            handle.write(pixels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Auroral oval heat map for a KP value or the forecast")
+    parser.add_argument("--kp", type=float, help="Draw the oval for this KP instead of the forecast")
+    parser.add_argument("--days", type=int, default=1, help="Forecast days to draw (default: %(default)s)")
+    parser.add_argument("--width", type=int, default=61, help="Heat map width in characters")
+    parser.add_argument("--lat-min", type=float, default=35.0, help="Outer edge of the polar view")
+    parser.add_argument("--south", action="store_true", help="Look at the southern oval")
+    parser.add_argument("--png", metavar="PREFIX", help="Also write PREFIX-<step>.png images")
+    parser.add_argument("--ppm", metavar="PREFIX", help="Also write PREFIX-<step>.ppm images")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from aurora_tracker import AuroraTracker
+    tracker = AuroraTracker(seed=args.seed)
+    if args.kp is not None:
+        steps = [(f"kp{args.kp:g}", args.kp)]
+    else:
+        forecast = tracker.generate_kp_forecast(args.days)
+        steps = [(record["date"], record["kp_index"]) for record in forecast]
+
+    model = OvalModel()
+    for label, kp_index in steps:
+        grid = model.grid(kp_index)
+        print(model.heatmap(kp_index, args.width, args.lat_min, args.south,
+                            sites=tracker.locations if not args.south else None,
+                            title=f"🌐 AURORAL OVAL - {label} - KP {kp_index:.1f}"))
+        if args.png:
+            model.write_png(grid, f"{args.png}-{label}.png")
+        if args.ppm:
+            model.write_ppm(grid, f"{args.ppm}-{label}.ppm")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
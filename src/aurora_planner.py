@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Aurora Observing-Window Planner
+Ranks hourly viewing windows by forecast KP, darkness and moonlight for every site
+"""
+
+import argparse
+import datetime
+import heapq
+import math
+import sys
+import types
+
+from aurora_numpy import numpy_for
+from aurora_probability import viewing_probability_matrix
+from aurora_profile import count, stage
+from aurora_series import as_series, from_epoch_day, to_epoch_day
+
+DEG = math.pi / 180
+
+# J2000.0 (2000-01-01 12:00 UT) in days since 1970-01-01
+J2000 = to_epoch_day(datetime.date(2000, 1, 1)) + 0.5
+
+# Sun altitudes (degrees): dark enough for faint aurora at astronomical
+# twilight, hopeless before civil twilight ends
+ASTRONOMICAL_TWILIGHT = -18.0
+CIVIL_TWILIGHT = -6.0
+
+# A full moon at the zenith takes this share off an hour's score
+MOON_WEIGHT = 0.6
+
+# Hours score when darkness x moonlight reaches this
+MIN_FACTOR = 0.3
+
+# Sites share ephemeris tables per latitude band and per longitude band
+# (one hour of local time) for each night
+LAT_BAND = 1.0
+LON_BAND = 15.0
+
+# A night runs from local noon to local noon, one slot per hour
+NIGHT_START_HOUR = 12
+NIGHT_HOURS = 24
+
+# Scalar stand-in for numpy's ufuncs so one ephemeris serves both paths
+_MATH = types.SimpleNamespace(sin=math.sin, cos=math.cos, arcsin=math.asin, arctan2=math.atan2)
+
+
+def ephemeris(d, ops=_MATH):
+    """
+    Low-precision sun and moon positions for d days since J2000.0 (UT).
+
+    Returns (sun_ra, sun_dec, moon_ra, moon_dec, gmst, moon_fraction):
+    angles in radians, the moon's illuminated fraction from 0 to 1. The
+    sun is good to about 0.01 degrees, the moon (main periodic terms, no
+    parallax) to about a degree, which is plenty to tell whether it is
+    up. d may be a float or, with ops=np, an array.
+    """
+    # Sun: mean longitude and anomaly plus the equation of centre
+    g = (357.529 + 0.98560028 * d) * DEG
+    sun_lon = (280.459 + 0.98564736 * d) * DEG + (1.915 * ops.sin(g) + 0.020 * ops.sin(2 * g)) * DEG
+    obliquity = (23.439 - 0.00000036 * d) * DEG
+
+    # Moon: mean longitude, anomaly, elongation and argument of latitude
+    moon_mean = (218.316 + 13.176396 * d) * DEG
+    anomaly = (134.963 + 13.064993 * d) * DEG
+    elongation = (297.850 + 12.190749 * d) * DEG
+    node = (93.272 + 13.229350 * d) * DEG
+    moon_lon = moon_mean + (6.289 * ops.sin(anomaly)
+                            + 1.274 * ops.sin(2 * elongation - anomaly)
+                            + 0.658 * ops.sin(2 * elongation)
+                            + 0.214 * ops.sin(2 * anomaly)
+                            - 0.186 * ops.sin(g)) * DEG
+    moon_lat = 5.128 * DEG * ops.sin(node)
+
+    sin_obl, cos_obl = ops.sin(obliquity), ops.cos(obliquity)
+    sin_sun = ops.sin(sun_lon)
+    sun_ra = ops.arctan2(cos_obl * sin_sun, ops.cos(sun_lon))
+    sun_dec = ops.arcsin(sin_obl * sin_sun)
+
+    sin_moon, cos_beta, sin_beta = ops.sin(moon_lon), ops.cos(moon_lat), ops.sin(moon_lat)
+    moon_ra = ops.arctan2(sin_moon * cos_beta * cos_obl - sin_beta * sin_obl, ops.cos(moon_lon) * cos_beta)
+    moon_dec = ops.arcsin(sin_beta * cos_obl + cos_beta * sin_obl * sin_moon)
+
+    gmst = (280.46061837 + 360.98564736629 * d) * DEG
+    fraction = (1 - cos_beta * ops.cos(moon_lon - sun_lon)) / 2
+    return sun_ra, sun_dec, moon_ra, moon_dec, gmst, fraction
+
+
+def horizon_terms(lon, ra, dec, gmst, ops=_MATH):
+    """
+    (sin dec, cos dec * cos hour angle) of a body seen from longitude lon.
+
+    sin(altitude) = sin(lat) * first + cos(lat) * second, so these two
+    terms serve every latitude at that longitude and time.
+    """
+    hour_angle = gmst + lon * DEG - ra
+    return ops.sin(dec), ops.cos(dec) * ops.cos(hour_angle)
+
+
+def darkness(sun_alt):
+    """0 before civil twilight ends, rising to 1 at astronomical twilight"""
+    return min(1.0, max(0.0, (CIVIL_TWILIGHT - sun_alt) / (CIVIL_TWILIGHT - ASTRONOMICAL_TWILIGHT)))
+
+
+def moonlight(moon_alt, fraction):
+    """Share of the sky's darkness left by the moon (1 when it is down or new)"""
+    return 1 - MOON_WEIGHT * fraction * max(0.0, math.sin(moon_alt * DEG))
+
+
+def best_run(factors, min_factor=MIN_FACTOR):
+    """(first slot, hours, mean factor) of the run of usable hours with the largest total"""
+    best = None
+    best_total = 0.0
+    start = total = 0
+    for slot, factor in enumerate(factors):
+        if factor < min_factor:
+            total = 0
+            continue
+        if not total:
+            start = slot
+        total += factor
+        if total > best_total:
+            best_total = total
+            best = (start, slot - start + 1)
+    if best is None:
+        return None
+    return best[0], best[1], best_total / best[1]
+
+
+class NightTable:
+    """Hourly sun/moon altitudes and viewing factors shared by every site in one band"""
+
+    __slots__ = ("sun", "moon", "fraction", "factors", "window")
+
+    def __init__(self, sun, moon, fraction, factors):
+        self.sun = sun
+        self.moon = moon
+        self.fraction = fraction
+        self.factors = factors
+        self.window = best_run(factors)
+
+
+class ViewingWindow:
+    """A run of usable hours at one site on one night"""
+
+    __slots__ = ("site", "date", "start", "start_utc", "hours", "kp_index", "probability",
+                 "factor", "moon_fraction", "score")
+
+    def __init__(self, site, date, start, start_utc, hours, kp_index, probability,
+                 factor, moon_fraction):
+        self.site = site
+        self.date = date
+        self.start = start
+        self.start_utc = start_utc
+        self.hours = hours
+        self.kp_index = kp_index
+        self.probability = probability
+        self.factor = factor
+        self.moon_fraction = moon_fraction
+        self.score = probability * factor
+
+    @property
+    def end(self):
+        return self.start + datetime.timedelta(hours=self.hours)
+
+    def to_dict(self):
+        return {
+            "site": self.site,
+            "date": self.date.isoformat(),
+            "start": self.start.isoformat(timespec="minutes"),
+            "end": self.end.isoformat(timespec="minutes"),
+            "start_utc": self.start_utc.isoformat(timespec="minutes"),
+            "hours": self.hours,
+            "kp_index": self.kp_index,
+            "probability": self.probability,
+            "factor": round(self.factor, 3),
+            "moon_fraction": round(self.moon_fraction, 2),
+            "score": round(self.score, 1),
+        }
+
+    def __str__(self):
+        return (f"🌌 {self.site}: {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M} "
+                f"({self.hours}h, KP {self.kp_index:.1f}, {self.probability:.0f}% x "
+                f"{self.factor:.2f} sky, moon {self.moon_fraction:.0%}) score {self.score:.1f}")
+
+
+class ObservingPlanner:
+    """
+    Rank hourly viewing windows for many sites over many nights.
+
+    Hours are local mean solar time, so a night (local noon to noon) at
+    a given latitude looks the same at every longitude except for the
+    moon, which moves half a degree an hour. Sites are therefore binned
+    into 1-degree latitude bands and 15-degree (one hour) longitude
+    bands: sun and moon positions are computed once per (longitude band,
+    night, hour) and altitudes once per (latitude band, longitude band,
+    night), vectorized across every table a plan needs. Each site then
+    costs one probability lookup and one multiplication per night.
+    Tables stay cached on the planner between plans.
+    """
+
+    def __init__(self, tracker, lat_band=LAT_BAND, lon_band=LON_BAND, use_numpy=None):
+        self.tracker = tracker
+        self.lat_band = lat_band
+        self.lon_band = lon_band
+        self.use_numpy = numpy_for(use_numpy) is not None
+        self._positions = {}  # (lon band, epoch day) -> hourly ephemeris
+        self._nights = {}     # (lat band, lon band, epoch day) -> NightTable
+
+    def band(self, lat, lon):
+        return round(lat / self.lat_band), round(lon / self.lon_band)
+
+    def _slot_times(self, lon_band, day):
+        """Days since J2000.0 (UT) of each hourly slot of a night in a longitude band"""
+        offset = lon_band * self.lon_band / 15
+        base = day - J2000
+        return [base + (NIGHT_START_HOUR + slot - offset) / 24 for slot in range(NIGHT_HOURS)]
+
+    def nights(self, keys):
+        """NightTables for (lat band, lon band, epoch day) keys, computing missing ones"""
+        missing = [key for key in set(keys) if key not in self._nights]
+        if missing:
+            pairs = {(lon, day) for _, lon, day in missing}
+            with stage("planner.ephemeris"):
+                self._compute_positions([pair for pair in pairs if pair not in self._positions])
+            with stage("planner.nights"):
+                if self.use_numpy:
+                    self._compute_nights_numpy(missing)
+                else:
+                    self._compute_nights_python(missing)
+            count("planner.nights", len(missing))
+        return {key: self._nights[key] for key in keys}
+
+    def _compute_positions(self, pairs):
+        """Per-slot horizon terms of the sun and moon, and the moon's phase"""
+        if not pairs:
+            return
+        np = numpy_for(self.use_numpy)
+        if np is not None:
+            times = np.array([self._slot_times(lon, day) for lon, day in pairs])
+            lons = np.array([lon * self.lon_band for lon, _ in pairs])[:, np.newaxis]
+            sun_ra, sun_dec, moon_ra, moon_dec, gmst, fraction = ephemeris(times, np)
+            table = np.stack(horizon_terms(lons, sun_ra, sun_dec, gmst, np)
+                             + horizon_terms(lons, moon_ra, moon_dec, gmst, np)
+                             + (fraction,), axis=1)  # pair x quantity x slot
+            for pair, terms in zip(pairs, table):
+                self._positions[pair] = terms
+        else:
+            for lon_band, day in pairs:
+                lon = lon_band * self.lon_band
+                rows = []
+                for d in self._slot_times(lon_band, day):
+                    sun_ra, sun_dec, moon_ra, moon_dec, gmst, fraction = ephemeris(d)
+                    rows.append(horizon_terms(lon, sun_ra, sun_dec, gmst)
+                                + horizon_terms(lon, moon_ra, moon_dec, gmst) + (fraction,))
+                self._positions[(lon_band, day)] = list(zip(*rows))
+
+    def _compute_nights_numpy(self, keys):
+        np = numpy_for(True)
+        terms = np.stack([self._positions[(lon, day)] for _, lon, day in keys])
+        sun_sin, sun_cos, moon_sin, moon_cos, fraction = (terms[:, i] for i in range(5))
+        lats = np.array([lat * self.lat_band for lat, _, _ in keys])[:, np.newaxis] * DEG
+        sin_lat, cos_lat = np.sin(lats), np.cos(lats)
+
+        sun = np.arcsin(np.clip(sin_lat * sun_sin + cos_lat * sun_cos, -1.0, 1.0)) / DEG
+        moon = np.arcsin(np.clip(sin_lat * moon_sin + cos_lat * moon_cos, -1.0, 1.0)) / DEG
+        # Illumination at local midnight stands for the whole night
+        fractions = fraction[:, NIGHT_HOURS // 2]
+        dark = np.clip((CIVIL_TWILIGHT - sun) / (CIVIL_TWILIGHT - ASTRONOMICAL_TWILIGHT), 0.0, 1.0)
+        moonlit = 1 - MOON_WEIGHT * fractions[:, np.newaxis] * np.maximum(0.0, np.sin(moon * DEG))
+        factors = (dark * moonlit).tolist()
+
+        for index, key in enumerate(keys):
+            self._nights[key] = NightTable(sun[index], moon[index], float(fractions[index]),
+                                           factors[index])
+
+    def _compute_nights_python(self, keys):
+        asin = math.asin
+        for key in keys:
+            lat_band, lon_band, day = key
+            sun_sin, sun_cos, moon_sin, moon_cos, fraction = self._positions[(lon_band, day)]
+            lat = lat_band * self.lat_band * DEG
+            sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+            sun = [asin(max(-1.0, min(1.0, sin_lat * s + cos_lat * c))) / DEG
+                   for s, c in zip(sun_sin, sun_cos)]
+            moon = [asin(max(-1.0, min(1.0, sin_lat * s + cos_lat * c))) / DEG
+                    for s, c in zip(moon_sin, moon_cos)]
+            # Illumination at local midnight stands for the whole night
+            midnight = fraction[NIGHT_HOURS // 2]
+            factors = [darkness(s) * moonlight(m, midnight) for s, m in zip(sun, moon)]
+            self._nights[key] = NightTable(sun, moon, midnight, factors)
+
+    def _night_start(self, day):
+        return datetime.datetime.combine(from_epoch_day(day), datetime.time(NIGHT_START_HOUR))
+
+    def plan(self, days=30, sites=None, top=20, min_probability=1.0, forecast=None):
+        """
+        Best window per site and night, highest score (probability x sky factor) first.
+
+        sites defaults to every tracker location and forecast to the
+        tracker's KP forecast for days nights from today. Returns the top
+        windows, or all of them when top is None.
+        """
+        locations = self.tracker.locations
+        names = list(locations) if sites is None else list(sites)
+        series = as_series(forecast if forecast is not None else self.tracker.generate_kp_forecast(days))
+        dates = list(series.days)
+        kp_values = [series.kp_at(index) for index in range(len(series))]
+
+        with stage("planner.probability"):
+            probabilities = viewing_probability_matrix(
+                [locations[name]["magnetic_lat"] for name in names], kp_values,
+                use_numpy=self.use_numpy)
+            if self.use_numpy:
+                probabilities = probabilities.tolist()
+            if getattr(self.tracker, "conditions", None) is not None:
+                probabilities = [[probability * factor for probability in row] for row, factor
+                                 in zip(probabilities, self.tracker.sky_factors(names))]
+
+        bands = [self.band(locations[name]["lat"], locations[name]["lon"]) for name in names]
+        nights = self.nights([(lat, lon, day) for lat, lon in set(bands) for day in dates])
+
+        with stage("planner.rank"):
+            starts = [self._night_start(day) for day in dates]
+            # Sites in one band share their nights: (index, mean factor, table) per usable night
+            usable = {}
+            for band in set(bands):
+                usable[band] = [(index, night.window[2], night) for index, night in
+                                enumerate(nights[band + (day,)] for day in dates)
+                                if night.window is not None]
+            candidates = []
+            for name, band, row in zip(names, bands, probabilities):
+                for index, factor, night in usable[band]:
+                    probability = row[index]
+                    if probability >= min_probability:
+                        candidates.append((probability * factor, name, index, probability, night))
+
+            ranked = (heapq.nlargest(top, candidates, key=lambda item: item[0]) if top is not None
+                      else sorted(candidates, key=lambda item: -item[0]))
+            windows = []
+            for _, name, index, probability, night in ranked:
+                slot, hours, factor = night.window
+                start = starts[index] + datetime.timedelta(hours=slot)
+                start_utc = start - datetime.timedelta(hours=locations[name]["lon"] / 15)
+                windows.append(ViewingWindow(name, from_epoch_day(dates[index]), start, start_utc,
+                                             hours, kp_values[index], probability, factor,
+                                             night.fraction))
+        count("planner.site_nights", len(names) * len(dates))
+        return windows
+
+    def hourly(self, site, date):
+        """(local time, sun altitude, moon altitude, sky factor) for each hour of one night"""
+        location = self.tracker.locations[site]
+        day = date if isinstance(date, int) else to_epoch_day(date)
+        lat, lon = self.band(location["lat"], location["lon"])
+        night = self.nights([(lat, lon, day)])[(lat, lon, day)]
+        start = self._night_start(day)
+        return [(start + datetime.timedelta(hours=slot), float(night.sun[slot]),
+                 float(night.moon[slot]), night.factors[slot]) for slot in range(NIGHT_HOURS)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank observing windows by KP, darkness and moonlight")
+    parser.add_argument("--days", type=int, default=30, help="Nights to plan (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=20, help="Windows to list (default: %(default)s)")
+    parser.add_argument("--sites", type=int, default=0,
+                        help="Add this many random sites between 40 and 75 degrees north")
+    parser.add_argument("--site", help="Also print the hour-by-hour sky for this site's best night")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from aurora_tracker import AuroraTracker
+    tracker = AuroraTracker(seed=args.seed)
+    if args.sites:
+        import random
+        rng = random.Random(args.seed)
+        tracker.add_locations((f"site-{i}", rng.uniform(40, 75), rng.uniform(-180, 180))
+                              for i in range(args.sites))
+    if args.site and args.site not in tracker.locations:
+        parser.error(f"unknown site {args.site!r}")
+
+    planner = ObservingPlanner(tracker)
+    # One forecast for both rankings, so --site agrees with the list above
+    forecast = tracker.generate_kp_forecast(args.days)
+    windows = planner.plan(args.days, top=args.top, forecast=forecast)
+    print(f"🔭 Best of {len(tracker.locations)} sites over {args.days} nights (local solar time)")
+    for window in windows:
+        print(f"   {window}")
+
+    if args.site:
+        best = planner.plan(args.days, sites=[args.site], top=1, forecast=forecast)
+        if not best:
+            print(f"\n   No usable dark hours at {args.site}")
+            return 0
+        print(f"\n🌙 {args.site}, night of {best[0].date}")
+        for when, sun, moon, factor in planner.hourly(args.site, best[0].date):
+            print(f"   {when:%H:%M}  sun {sun:6.1f}°  moon {moon:6.1f}°  sky {factor:4.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
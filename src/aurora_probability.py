@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Aurora Viewing Probability Engine
+Scores many observer sites against many KP values in one pass
+"""
+
+from aurora_numpy import numpy_for
+
+
+def visibility_threshold(kp_index):
+    """Lowest magnetic latitude inside the visibility zone for a KP value"""
+    return 67 - (kp_index * 2.5)  # Approximation
+
+
+def viewing_probability(magnetic_lat, kp_index):
+    """Calculate probability of seeing aurora at one magnetic latitude"""
+    # Simplified formula based on magnetic latitude and KP index
+    threshold_lat = visibility_threshold(kp_index)
+
+    if magnetic_lat >= threshold_lat:
+        probability = min(95, (magnetic_lat - threshold_lat + 5) * 10)
+    else:
+        probability = max(0, (magnetic_lat - threshold_lat + 10) * 2)
+
+    return max(0, min(100, probability))
+
+
+def viewing_probability_matrix(magnetic_lats, kp_values, use_numpy=None):
+    """
+    Score every site against every KP value.
+
+    Returns a matrix with one row per magnetic latitude and one column per
+    KP value. Each cell equals viewing_probability(lat, kp). With numpy the
+    result is a float64 ndarray, otherwise a list of lists.
+    """
+    np = numpy_for(use_numpy)
+    if np is not None:
+        return _probability_matrix_numpy(np, magnetic_lats, kp_values)
+    return _probability_matrix_python(magnetic_lats, kp_values)
+
+
+def _probability_matrix_numpy(np, magnetic_lats, kp_values):
+    lats = np.asarray(magnetic_lats, dtype=np.float64)[:, np.newaxis]
+    thresholds = visibility_threshold(np.asarray(kp_values, dtype=np.float64))
+    offset = lats - thresholds
+
+    # Same operation order as viewing_probability so results match exactly
+    above = np.minimum(95.0, (offset + 5) * 10)
+    below = np.maximum(0.0, (offset + 10) * 2)
+    probability = np.where(lats >= thresholds, above, below)
+
+    return np.clip(probability, 0.0, 100.0)
+
+
+def _probability_matrix_python(magnetic_lats, kp_values):
+    thresholds = [visibility_threshold(kp) for kp in kp_values]
+    matrix = []
+
+    for magnetic_lat in magnetic_lats:
+        row = []
+        for threshold_lat in thresholds:
+            if magnetic_lat >= threshold_lat:
+                probability = min(95, (magnetic_lat - threshold_lat + 5) * 10)
+            else:
+                probability = max(0, (magnetic_lat - threshold_lat + 10) * 2)
+            row.append(max(0, min(100, probability)))
+        matrix.append(row)
+
+    return matrix
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Aurora Profiling & Metrics
+Stage timers and counters for the hot paths, plus an opt-in profiling run
+"""
+
+import functools
+import sys
+import threading
+import time
+
+DEFAULT_PROFILE_PREFIX = "aurora-profile"
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+
+
+class StageTimer:
+    """Running count, total, min and max of one stage's durations (seconds)"""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "min_ms": self.min * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+        }
+
+
+class _Stage:
+    """Context manager returned by MetricsRegistry.stage"""
+
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoStage:
+    """Shared do-nothing stage used while a registry is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class MetricsRegistry:
+    """
+    In-process stage timers and counters.
+
+    A stage costs two perf_counter() calls and a locked dict update, so
+    instrumentation stays on in normal runs; the registry can still be
+    disabled, which turns stage() into a shared no-op. snapshot() is what
+    the dashboard server and watch mode expose.
+    """
+
+    def __init__(self, enabled=True, clock=time.time):
+        self.enabled = enabled
+        self.clock = clock
+        self.started = clock()
+        self.timers = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Time a with-block under name"""
+        if not self.enabled:
+            return _NO_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = StageTimer()
+            timer.add(seconds)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timed(self, name):
+        """Decorator timing every call of a function as a stage"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.started = self.clock()
+
+    def snapshot(self):
+        """JSON-ready copy of every timer and counter"""
+        with self._lock:
+            return {
+                "uptime_s": self.clock() - self.started,
+                "stages": {name: timer.to_dict() for name, timer in sorted(self.timers.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def format_stages(self):
+        """Stage breakdown as text lines, slowest total first"""
+        with self._lock:
+            timers = sorted(self.timers.items(), key=lambda item: -item[1].total)
+            counters = sorted(self.counters.items())
+        lines = [f"{'stage':<28} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+        for name, timer in timers:
+            stats = timer.to_dict()
+            lines.append(f"{name:<28} {timer.count:>7} {stats['total_ms']:>10.2f} "
+                         f"{stats['mean_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+        for name, value in counters:
+            lines.append(f"{name:<28} {value:>7}")
+        return lines
+
+
+# Process-wide registry used by the instrumented modules
+METRICS = MetricsRegistry()
+
+
+def stage(name):
+    return METRICS.stage(name)
+
+
+def count(name, amount=1):
+    METRICS.count(name, amount)
+
+
+def timed(name):
+    return METRICS.timed(name)
+
+
+def pop_profile_flag(args):
+    """
+    Remove --profile or --profile=PREFIX from an argument list.
+
+    Returns the output prefix, or None when profiling was not requested.
+    """
+    for position, arg in enumerate(args):
+        if arg == "--profile":
+            del args[position]
+            return DEFAULT_PROFILE_PREFIX
+        if arg.startswith("--profile="):
+            del args[position]
+            return arg.split("=", 1)[1] or DEFAULT_PROFILE_PREFIX
+    return None
+
+
+def run_profiled(func, prefix=DEFAULT_PROFILE_PREFIX):
+    """
+    Run func under cProfile and tracemalloc and write what they found.
+
+    Writes PREFIX.prof (a pstats dump for snakeviz, pstats or
+    gprof2dot) and PREFIX.txt with the stage breakdown, the hottest
+    functions and the largest allocation sites, then prints the stage
+    breakdown to stderr. Returns func's result.
+    """
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    METRICS.reset()
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        result = profiler.runcall(func)
+        allocations = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    profiler.dump_stats(f"{prefix}.prof")
+    hot = io.StringIO()
+    pstats.Stats(profiler, stream=hot).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+    stages = METRICS.format_stages()
+    lines = ["Stage breakdown", "==============="] + stages
+    lines += ["", "Memory", "======",
+              f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB",
+              "", "Largest allocation sites", "========================"]
+    allocations = allocations.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    lines += [str(stat) for stat in allocations.statistics("lineno")[:TOP_ALLOCATIONS]]
+    lines += ["", "Hottest functions", "================", hot.getvalue()]
+    with open(f"{prefix}.txt", "w", encoding="utf-8") as handle:
+        handle.write("\n".join(lines))
+
+    print("\n".join(stages), file=sys.stderr)
+    print(f"Profile written to {prefix}.prof and {prefix}.txt (peak {peak / 1024:.0f} KiB traced)",
+          file=sys.stderr)
+    return result
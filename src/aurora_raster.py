@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Aurora Sky-Condition Rasters
+Tiled, memory-mapped cloud-cover and light-pollution grids sampled per site
+"""
+
+import argparse
+import ast
+import collections
+import itertools
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from aurora_numpy import loaded_numpy, numpy_for
+
+# Raw layout: 64-byte header, then little-endian cells, band by band, each
+# band row-major from the northernmost row and westernmost column
+MAGIC = b"AURGRID1"
+HEADER = struct.Struct("<8s1s3xIII4d8x")  # magic, typecode, bands, rows, cols, west, south, east, north
+
+NPY_MAGIC = b"\x93NUMPY"
+
+# array typecode -> NPY dtype descr (little-endian)
+TYPECODES = {"B": "|u1", "H": "<u2", "f": "<f4", "d": "<f8"}
+_DESCRS = {descr: code for code, descr in TYPECODES.items()}
+_DESCRS.update({"<u1": "B", ">u1": "B", "|u2": "H"})
+
+GLOBAL_BOUNDS = (-180.0, -90.0, 180.0, 90.0)  # west, south, east, north
+
+TILE_SIZE = 256
+MAX_TILES = 128
+
+# Tiles that fewer points than this fall into during one call are read
+# cell by cell from the mapping instead of being copied (unless cached)
+MIN_TILE_POINTS = 128
+
+# Cloud cover is stored in percent; light pollution as a Bortle class (1-9),
+# where a class 9 inner-city sky keeps 1 - LIGHT_WEIGHT of the chance
+CLOUD_SCALE = 100.0
+LIGHT_WEIGHT = 0.8
+
+
+def _npy_header(buffer):
+    """(typecode, shape, byte order, data offset) of an NPY file"""
+    major = buffer[6]
+    if major == 1:
+        (length,), start = struct.unpack_from("<H", buffer, 8), 10
+    else:
+        (length,), start = struct.unpack_from("<I", buffer, 8), 12
+    header = ast.literal_eval(bytes(buffer[start:start + length]).decode("latin1"))
+    if header["fortran_order"]:
+        raise ValueError("Fortran-ordered NPY rasters are not supported")
+    descr = header["descr"]
+    typecode = _DESCRS.get(descr) or _DESCRS.get("<" + descr[1:])
+    if typecode is None:
+        raise ValueError(f"unsupported NPY dtype {descr!r}")
+    order = "big" if descr.startswith(">") and typecode != "B" else "little"
+    return typecode, tuple(header["shape"]), order, start + length
+
+
+class Raster:
+    """
+    Read-only grid memory-mapped from an NPY or raw AURGRID file.
+
+    Opening maps the file without reading cells. Samples are served from
+    square tiles copied out of the mapping on first use and kept in a
+    small LRU, so scoring sites pages in only the tiles that cover them,
+    however large the grid. Lookups are sorted by tile first, so each
+    tile is copied at most once per sample_many() call; sparse points
+    (fewer than min_tile_points in a tile) are read straight from the
+    mapping, which touches one page each. NPY files carry
+    no georeference and are taken to cover bounds (global by default).
+    3-D grids are (band, row, column); band picks one, e.g. a forecast
+    hour. Tiles are ndarrays on the numpy path (use_numpy) and flat
+    arrays otherwise.
+    """
+
+    def __init__(self, path, bounds=None, band=0, nodata=None, tile_size=TILE_SIZE,
+                 max_tiles=MAX_TILES, min_tile_points=MIN_TILE_POINTS, use_numpy=None):
+        self.use_numpy = numpy_for(use_numpy) is not None
+        self.path = path
+        self.band = band
+        self.nodata = nodata
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.min_tile_points = min_tile_points
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header(bounds)
+        except (ValueError, SyntaxError, struct.error, KeyError) as error:
+            self.close()
+            raise ValueError(f"{path} is not a raster: {error}") from None
+
+        self._view = memoryview(self._mmap)
+        self.itemsize = array(self.typecode).itemsize
+        self._base = self._offset + band * self.rows * self.cols * self.itemsize
+        self.west, self.south, self.east, self.north = self.bounds
+        self.cell_width = (self.east - self.west) / self.cols
+        self.cell_height = (self.north - self.south) / self.rows
+        self.tile_cols = -(-self.cols // tile_size)
+        self._cell = struct.Struct(("<" if self.byteorder == "little" else ">") + self.typecode)
+        self._grid = None
+        self._tiles = collections.OrderedDict()
+        self.tiles_loaded = 0
+        self.cells_read = 0
+
+    def _read_header(self, bounds):
+        if self._mmap[:6] == NPY_MAGIC:
+            self.typecode, shape, self.byteorder, self._offset = _npy_header(self._mmap)
+            if len(shape) not in (2, 3):
+                raise ValueError(f"expected a 2-D or 3-D grid, got shape {shape}")
+            self.bands, self.rows, self.cols = (1,) * (3 - len(shape)) + shape
+            self.bounds = tuple(bounds or GLOBAL_BOUNDS)
+        else:
+            magic, typecode, bands, rows, cols, *stored = HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError("unknown file format")
+            self.typecode = typecode.decode("ascii")
+            self.bands, self.rows, self.cols = bands, rows, cols
+            self.byteorder = "little"
+            self._offset = HEADER.size
+            self.bounds = tuple(bounds or stored)
+        if not 0 <= self.band < self.bands:
+            raise ValueError(f"band {self.band} out of range (grid has {self.bands})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Drop cached tiles and release the mapping and the file"""
+        self.__dict__.get("_tiles", {}).clear()
+        self._grid = None
+        view = self.__dict__.pop("_view", None)
+        if view is not None:
+            view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    @property
+    def shape(self):
+        return self.rows, self.cols
+
+    @property
+    def version(self):
+        """Identity of the grid (part of tracker cache keys), which changes when the file is rewritten"""
+        return (self.path, self._stamp, self.band, self.bounds)
+
+    def cell(self, lat, lon):
+        """(row, column) of the cell containing a point, or None outside the grid"""
+        row = math.floor((self.north - lat) / self.cell_height)
+        col = math.floor((lon - self.west) / self.cell_width)
+        # The south and east edges belong to the last row and column
+        if lat == self.south:
+            row = self.rows - 1
+        if lon == self.east:
+            col = self.cols - 1
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def tile(self, tile_row, tile_col):
+        """Cells of one tile (row-major), copied from the mapping on first use"""
+        key = (tile_row, tile_col)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        size, itemsize = self.tile_size, self.itemsize
+        first_row, first_col = tile_row * size, tile_col * size
+        height = min(size, self.rows - first_row)
+        width = min(size, self.cols - first_col)
+        data = bytearray()
+        start = self._base + (first_row * self.cols + first_col) * itemsize
+        stride = self.cols * itemsize
+        for row in range(height):
+            offset = start + row * stride
+            data += self._view[offset:offset + width * itemsize]
+
+        np = numpy_for(self.use_numpy)
+        if np is not None:
+            tile = np.frombuffer(bytes(data), dtype=self._dtype()).reshape(height, width)
+        else:
+            tile = array(self.typecode, bytes(data))
+            if self.byteorder != sys.byteorder:
+                tile.byteswap()
+        self._tiles[key] = tile
+        self.tiles_loaded += 1
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _dtype(self):
+        np = numpy_for(True)
+        return np.dtype(self.typecode).newbyteorder("<" if self.byteorder == "little" else ">")
+
+    def _band_view(self):
+        """Zero-copy array over the whole band; indexing it pages in only what it touches"""
+        if self._grid is None:
+            np = numpy_for(True)
+            self._grid = np.frombuffer(self._mmap, dtype=self._dtype(), count=self.rows * self.cols,
+                                       offset=self._base).reshape(self.rows, self.cols)
+        return self._grid
+
+    def sample(self, lat, lon):
+        """Cell value at a point, or None outside the grid or on nodata"""
+        value = self.sample_many([lat], [lon])[0]
+        return None if math.isnan(value) else value
+
+    def sample_many(self, lats, lons):
+        """Cell values for many points as floats, NaN outside the grid or on nodata"""
+        if self.use_numpy:
+            return self._sample_numpy(lats, lons).tolist()
+        return self._sample_python(lats, lons)
+
+    def _sample_numpy(self, lats, lons):
+        np = numpy_for(True)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        rows = np.floor((self.north - lats) / self.cell_height).astype(np.int64)
+        cols = np.floor((lons - self.west) / self.cell_width).astype(np.int64)
+        rows[lats == self.south] = self.rows - 1
+        cols[lons == self.east] = self.cols - 1
+        values = np.full(len(lats), np.nan)
+        inside = np.flatnonzero((rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols))
+        if not len(inside):
+            return values
+
+        size = self.tile_size
+        keys = (rows[inside] // size) * self.tile_cols + cols[inside] // size
+        order = np.argsort(keys, kind="stable")
+        inside, keys = inside[order], keys[order]
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        for first, last in zip(starts, np.append(starts[1:], len(keys))):
+            points = inside[first:last]
+            tile_row, tile_col = divmod(int(keys[first]), self.tile_cols)
+            if (tile_row, tile_col) in self._tiles or len(points) >= self.min_tile_points:
+                tile = self.tile(tile_row, tile_col)
+                values[points] = tile[rows[points] - tile_row * size, cols[points] - tile_col * size]
+            else:
+                values[points] = self._band_view()[rows[points], cols[points]]
+                self.cells_read += len(points)
+        if self.nodata is not None:
+            values[values == self.nodata] = np.nan
+        return values
+
+    def _sample_python(self, lats, lons):
+        size = self.tile_size
+        values = [math.nan] * len(lats)
+        located = []
+        for index, (lat, lon) in enumerate(zip(lats, lons)):
+            cell = self.cell(lat, lon)
+            if cell is not None:
+                row, col = cell
+                located.append(((row // size, col // size), row, col, index))
+        located.sort(key=lambda item: item[0])
+
+        nodata = self.nodata
+        for key, group in itertools.groupby(located, key=lambda item: item[0]):
+            group = list(group)
+            if key in self._tiles or len(group) >= self.min_tile_points:
+                tile = self.tile(*key)
+                width = min(size, self.cols - key[1] * size)
+                first_row, first_col = key[0] * size, key[1] * size
+                for _, row, col, index in group:
+                    value = tile[(row - first_row) * width + col - first_col]
+                    if value != nodata:
+                        values[index] = float(value)
+            else:
+                unpack, base, stride = self._cell.unpack_from, self._base, self.cols * self.itemsize
+                for _, row, col, index in group:
+                    value = unpack(self._mmap, base + row * stride + col * self.itemsize)[0]
+                    if value != nodata:
+                        values[index] = float(value)
+                self.cells_read += len(group)
+        return values
+
+
+def write_raster(path, rows, bounds=GLOBAL_BOUNDS, typecode="f", bands=1):
+    """
+    Write grid rows (north first, each a sequence of cells) as a raw raster.
+
+    With bands > 1 the rows of band 0 come first, then band 1 and so on.
+    Returns the (rows, columns) of one band.
+    """
+    if typecode not in TYPECODES:
+        raise ValueError(f"typecode must be one of {', '.join(TYPECODES)}")
+    count = cols = 0
+    np = loaded_numpy()
+    with open(path, "wb") as handle:
+        handle.write(bytes(HEADER.size))
+        for row in rows:
+            if np is not None and isinstance(row, np.ndarray):
+                cells = row.astype(TYPECODES[typecode]).tobytes()
+            else:
+                values = array(typecode, row)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                cells = values.tobytes()
+            if count == 0:
+                cols = len(cells) // array(typecode).itemsize
+            handle.write(cells)
+            count += 1
+        if count % bands:
+            raise ValueError(f"{count} rows do not split into {bands} bands")
+        handle.seek(0)
+        handle.write(HEADER.pack(MAGIC, typecode.encode("ascii"), bands, count // bands, cols, *bounds))
+    return count // bands, cols
+
+
+class SkyConditions:
+    """
+    Cloud-cover and light-pollution layers folded into viewing chances.
+
+    factors() samples both rasters for many sites and returns the share of
+    the geomagnetic viewing probability left after clouds (percent cover)
+    and artificial skyglow (Bortle class). Sites outside a layer, or on
+    its nodata value, are not adjusted for it.
+    """
+
+    def __init__(self, cloud=None, light=None, cloud_scale=CLOUD_SCALE, light_weight=LIGHT_WEIGHT,
+                 use_numpy=None):
+        self.cloud = Raster(cloud, use_numpy=use_numpy) if isinstance(cloud, str) else cloud
+        self.light = Raster(light, use_numpy=use_numpy) if isinstance(light, str) else light
+        self.cloud_scale = cloud_scale
+        self.light_weight = light_weight
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for layer in (self.cloud, self.light):
+            if layer is not None:
+                layer.close()
+
+    @property
+    def version(self):
+        return tuple(None if layer is None else layer.version for layer in (self.cloud, self.light))
+
+    def samples(self, lats, lons):
+        """(cloud cover, Bortle class) lists for the sites; NaN where a layer is missing"""
+        missing = [math.nan] * len(lats)
+        cloud = missing if self.cloud is None else self.cloud.sample_many(lats, lons)
+        light = missing if self.light is None else self.light.sample_many(lats, lons)
+        return cloud, light
+
+    def factors(self, lats, lons):
+        """Viewing-probability multiplier (0-1) for each site"""
+        factors = []
+        for cover, bortle in zip(*self.samples(lats, lons)):
+            factor = 1.0
+            if cover == cover:  # Not NaN
+                factor *= 1 - min(1.0, max(0.0, cover / self.cloud_scale))
+            if bortle == bortle:
+                factor *= 1 - self.light_weight * min(1.0, max(0.0, (bortle - 1) / 8))
+            factors.append(factor)
+        return factors
+
+    def factor(self, lat, lon):
+        return self.factors([lat], [lon])[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Viewing chances adjusted for clouds and light pollution")
+    parser.add_argument("--cloud", help="Cloud-cover raster in percent (.npy or AURGRID)")
+    parser.add_argument("--light", help="Light-pollution raster as Bortle classes (.npy or AURGRID)")
+    parser.add_argument("--band", type=int, default=0, help="Cloud-cover band, e.g. forecast hour")
+    parser.add_argument("--kp", type=float, default=5.0, help="KP index to score (default: %(default)s)")
+    parser.add_argument("--sites", type=int, default=0,
+                        help="Add this many random sites between 40 and 75 degrees north")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if not (args.cloud or args.light):
+        parser.error("give at least one of --cloud and --light")
+
+    from aurora_tracker import AuroraTracker
+    try:
+        conditions = SkyConditions(Raster(args.cloud, band=args.band) if args.cloud else None,
+                                   args.light)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    with conditions:
+        tracker = AuroraTracker(seed=args.seed, conditions=conditions)
+        if args.sites:
+            import random
+            rng = random.Random(args.seed)
+            tracker.add_locations((f"site-{i}", rng.uniform(40, 75), rng.uniform(-180, 180))
+                                  for i in range(args.sites))
+        names = list(tracker.locations)
+        lats = [tracker.locations[name]["lat"] for name in names]
+        lons = [tracker.locations[name]["lon"] for name in names]
+        cloud, light = conditions.samples(lats, lons)
+        factors = tracker.sky_factors(names)
+
+        print(f"🌥️  Viewing chances at KP {args.kp:g} under local skies")
+        shown = sorted(range(len(names)), key=lambda i: -tracker.calculate_viewing_probability(
+            names[i], args.kp))[:20]
+        for i in shown:
+            cover = "  -" if math.isnan(cloud[i]) else f"{cloud[i]:3.0f}"
+            bortle = "-" if math.isnan(light[i]) else f"{light[i]:.0f}"
+            print(f"   {names[i]:<28} clouds {cover}%  Bortle {bortle}  sky x{factors[i]:.2f}  "
+                  f"{tracker.calculate_viewing_probability(names[i], args.kp):5.1f}%")
+        layers = [layer for layer in (conditions.cloud, conditions.light) if layer is not None]
+        print(f"   {sum(layer.tiles_loaded for layer in layers)} tiles paged in for {len(names)} sites")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
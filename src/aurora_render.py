@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Buffered Terminal Renderer
+Builds a whole screen in memory and writes it to the terminal in one go
+"""
+
+import sys
+
+RESET = '\033[0m'
+
+
+class Frame:
+    """
+    In-memory screen buffer with color-run merging.
+
+    write() takes plain text plus an optional ANSI color escape. A color
+    escape is only emitted when the color actually changes, so a run of
+    same-colored cells costs one escape instead of one per character.
+    Whitespace never switches color because spaces look the same in any
+    foreground color. Colors are reset before every newline so a frame
+    never bleeds into whatever is printed after it.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._color = None
+
+    def write(self, text, color=None):
+        """Append text drawn in the given color escape (None for default)"""
+        if not text:
+            return
+        if color != self._color and not (color is None and text.isspace()):
+            if self._color is not None:
+                self._parts.append(RESET)
+            if color is not None:
+                self._parts.append(color)
+            self._color = color
+        self._parts.append(text)
+
+    def newline(self):
+        """End the current line"""
+        if self._color is not None:
+            self._parts.append(RESET)
+            self._color = None
+        self._parts.append("\n")
+
+    def line(self, text="", color=None):
+        """Append a full line of text"""
+        self.write(text, color)
+        self.newline()
+
+    def getvalue(self):
+        """The rendered frame as one string"""
+        if self._color is not None:
+            self._parts.append(RESET)
+            self._color = None
+        return "".join(self._parts)
+
+    def flush(self, out=None):
+        """Write the frame to a stream with a single write call"""
+        out = sys.stdout if out is None else out
+        out.write(self.getvalue())
+        out.flush()
+        self._parts = []
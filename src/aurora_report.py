@@ -0,0 +1,743 @@
+#!/usr/bin/env python3
+"""
+Aurora Report Models & Serializers
+Structured results of every report entry point, with JSON-lines, binary and text output
+"""
+
+import datetime
+import functools
+import math
+import struct
+import sys
+
+from aurora_probability import visibility_threshold
+from aurora_render import Frame
+
+COLORS = {
+    'green': '\033[92m',
+    'red': '\033[91m',
+    'blue': '\033[94m',
+    'yellow': '\033[93m',
+    'cyan': '\033[96m',
+    'purple': '\033[95m',
+    'white': '\033[97m',
+    'reset': '\033[0m'
+}
+
+WRITE_BATCH = 4096
+
+
+def _plain(value):
+    """Convert models, dates and sequences into JSON-compatible values"""
+    if isinstance(value, Report):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+class Report:
+    """
+    Base class for report models.
+
+    Subclasses list their fields in __slots__ and may be built with
+    positional or keyword arguments in that order. to_dict() gives plain
+    JSON-compatible data tagged with the model's kind; from_dict()
+    reverses it, rebuilding nested rows (_nested), dates (_dates,
+    _datetimes) from their ISO strings and tuples (_tuples) from lists.
+    """
+
+    __slots__ = ()
+    kind = None
+    _nested = {}
+    _dates = ()
+    _datetimes = ()
+    _tuples = ()
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.__slots__)} fields")
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name in self.__slots__[len(args):]:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"Unknown {type(self).__name__} fields: {', '.join(sorted(kwargs))}")
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def replace(self, **changes):
+        """Copy of the model with some fields changed"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return type(self)(**fields)
+
+    def to_dict(self):
+        data = {} if self.kind is None else {"kind": self.kind}
+        for name in self.__slots__:
+            data[name] = _plain(getattr(self, name))
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        fields = {}
+        for name in cls.__slots__:
+            value = data.get(name)
+            if value is not None:
+                if name in cls._nested:
+                    value = [cls._nested[name].from_dict(item) for item in value]
+                elif name in cls._dates:
+                    value = datetime.date.fromisoformat(value)
+                elif name in cls._datetimes:
+                    value = datetime.datetime.fromisoformat(value)
+                elif name in cls._tuples:
+                    value = tuple(value)
+            fields[name] = value
+        return cls(**fields)
+
+
+class ForecastDay(Report):
+    __slots__ = ("date", "kp_index", "activity_level")
+    _dates = ("date",)
+
+
+class LocationProbability(Report):
+    __slots__ = ("location", "probability")
+
+
+class ColorInfo(Report):
+    __slots__ = ("name", "altitude", "cause")
+
+
+class FullReport(Report):
+    """AuroraTracker.full_report(): conditions, forecast, probabilities, colors and tips"""
+
+    __slots__ = ("generated", "kp_index", "activity_level", "visibility_zone",
+                 "forecast", "probabilities", "colors", "tips", "fact")
+    kind = "full_report"
+    _nested = {"forecast": ForecastDay, "probabilities": LocationProbability, "colors": ColorInfo}
+    _datetimes = ("generated",)
+    _tuples = ("tips",)  # Shared per-KP-bucket tuple (aurora_classify.KP_BUCKETS)
+
+
+class InfoReport(Report):
+    """aurora_info.generate_aurora_report(): one KP reading with a fact and tips"""
+
+    __slots__ = ("generated", "kp_index", "visibility", "fact", "tips")
+    kind = "info"
+    _datetimes = ("generated",)
+
+
+class BarRow(Report):
+    __slots__ = ("date", "kp_index", "activity_level", "color")
+    _dates = ("date",)
+
+
+class BarChartReport(Report):
+    """AuroraGraph.create_bar_chart(): one row per shown day (peak of each bucket)
+
+    total_days counts the readings charted; first_date and last_date are
+    the dates they span, which label the chart.
+    """
+
+    __slots__ = ("total_days", "rows", "first_date", "last_date")
+    kind = "bar_chart"
+    _nested = {"rows": BarRow}
+    _dates = ("first_date", "last_date")
+
+    def span_days(self):
+        """Calendar days from first_date to last_date inclusive"""
+        if self.first_date is None or self.last_date is None:
+            return self.total_days
+        return (self.last_date - self.first_date).days + 1
+
+    def title(self, today=None):
+        """Chart heading: "PAST n DAYS" when the series ends today, else the date range"""
+        span = self.span_days()
+        days = "DAY" if span == 1 else "DAYS"
+        if self.last_date is None:
+            return f"{self.total_days} READINGS"
+        if self.last_date == (today or datetime.date.today()):
+            return f"PAST {span} {days}"
+        if span == 1:
+            return f"{self.last_date.isoformat()}"
+        return f"{self.first_date.isoformat()} TO {self.last_date.isoformat()} ({span} {days})"
+
+
+class LinePoint(Report):
+    __slots__ = ("date", "kp_index", "color")
+    _dates = ("date",)
+
+
+class LineGraphReport(Report):
+    """AuroraGraph.create_line_graph(): KP range and the plotted points"""
+
+    __slots__ = ("min_kp", "max_kp", "points")
+    kind = "line_graph"
+    _nested = {"points": LinePoint}
+
+
+class StatisticsReport(Report):
+    """AuroraGraph.create_statistics_summary(): summary numbers"""
+
+    __slots__ = ("count", "mean", "min", "max", "storm_days", "active_days",
+                 "excellent_days", "good_days", "storm_fraction", "active_fraction",
+                 "peak_level")
+    kind = "statistics"
+
+
+class EnsembleDay(Report):
+    __slots__ = ("date", "mean", "quantiles", "exceedance", "colors")
+    _dates = ("date",)
+
+
+class EnsembleReport(Report):
+    """
+    aurora_ensemble.ensemble_forecast(): per-day quantiles, P(KP >= t)
+    for each threshold and the chance of each aurora color appearing.
+    Each day's lists line up with quantile_levels, thresholds and
+    color_names respectively.
+    """
+
+    __slots__ = ("paths", "seed", "quantile_levels", "thresholds", "color_names",
+                 "days", "expected_colors")
+    kind = "ensemble"
+    _nested = {"days": EnsembleDay}
+
+
+class ArtLine(Report):
+    __slots__ = ("text", "color")
+
+
+class ArtReport(Report):
+    """AuroraArt displays: named lines of text with their color names"""
+
+    __slots__ = ("title", "lines")
+    kind = "art"
+    _nested = {"lines": ArtLine}
+
+
+class SiteReport(Report):
+    """Forecast outcome for one observer site (aurora_batch)"""
+
+    __slots__ = ("name", "lat", "lon", "magnetic_lat", "dates", "kp_values",
+                 "probabilities", "best_date", "best_probability", "visible_days")
+    kind = "site"
+
+    @classmethod
+    def build(cls, name, lat, lon, magnetic_lat, dates, kp_values, probabilities):
+        """Report with best day and visible-day count derived from the forecast"""
+        best = max(range(len(probabilities)), key=probabilities.__getitem__, default=None)
+        return cls(
+            name, lat, lon, magnetic_lat, dates, kp_values, probabilities,
+            None if best is None else dates[best],
+            0.0 if best is None else probabilities[best],
+            sum(1 for kp in kp_values if magnetic_lat >= visibility_threshold(kp)),
+        )
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "lat": self.lat,
+            "lon": self.lon,
+            "magnetic_lat": self.magnetic_lat,
+            "best_date": self.best_date,
+            "best_probability": self.best_probability,
+            "visible_days": self.visible_days,
+            "forecast": [
+                {"date": date, "kp_index": kp, "probability": probability}
+                for date, kp, probability in zip(self.dates, self.kp_values, self.probabilities)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        forecast = data.get("forecast", ())
+        return cls(
+            data["name"], data["lat"], data["lon"], data["magnetic_lat"],
+            tuple(day["date"] for day in forecast),
+            tuple(day["kp_index"] for day in forecast),
+            tuple(day["probability"] for day in forecast),
+            data.get("best_date"), data.get("best_probability"), data.get("visible_days"),
+        )
+
+
+REPORT_TYPES = {cls.kind: cls for cls in (FullReport, InfoReport, BarChartReport,
+                                          LineGraphReport, StatisticsReport, EnsembleReport,
+                                          ArtReport, SiteReport)}
+
+
+def report_from_dict(data):
+    """Rebuild a report model from to_dict() output"""
+    kind = data.get("kind")
+    if kind not in REPORT_TYPES:
+        raise ValueError(f"Unknown report kind {kind!r}")
+    return REPORT_TYPES[kind].from_dict(data)
+
+
+class Serializer:
+    """
+    Common interface of the report serializers.
+
+    dumps() encodes one report, dump() writes one report, dump_many()
+    writes a stream of reports in batches of write calls and loads()
+    yields the reports back out of a dumps()/dump_many() payload.
+    """
+
+    binary = False
+
+    def dumps(self, report):
+        raise NotImplementedError
+
+    def loads(self, data):
+        raise NotImplementedError(f"{type(self).__name__} output cannot be read back")
+
+    def dump(self, report, out=None):
+        out = self._stream(out)
+        out.write(self.dumps(report))
+        out.flush()
+
+    def dump_many(self, reports, out=None, batch=WRITE_BATCH):
+        """Write reports with one write call per batch; returns the count written"""
+        out = self._stream(out)
+        empty = b"" if self.binary else ""
+        chunk = []
+        count = 0
+        for report in reports:
+            chunk.append(self.dumps(report))
+            if len(chunk) >= batch:
+                out.write(empty.join(chunk))
+                count += len(chunk)
+                chunk.clear()
+        if chunk:
+            out.write(empty.join(chunk))
+            count += len(chunk)
+        out.flush()
+        return count
+
+    def _stream(self, out):
+        if out is None:
+            out = sys.stdout.buffer if self.binary else sys.stdout
+        return out
+
+
+class JsonLinesSerializer(Serializer):
+    """One compact JSON object per line"""
+
+    def __init__(self):
+        import json  # Deferred: pulls in re, which text-only runs never need
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._decode = json.loads
+
+    def dumps(self, report):
+        return self._encode(report.to_dict()) + "\n"
+
+    def loads(self, data):
+        for line in data.splitlines():
+            if line.strip():
+                yield report_from_dict(self._decode(line))
+
+
+class BinarySerializer(Serializer):
+    """
+    Compact binary encoding using the MessagePack wire format.
+
+    Only the types reports need are supported (nil, bool, int, float64,
+    str, bin, array, map), so payloads can also be read by any
+    MessagePack library. Reports are written back to back.
+    """
+
+    binary = True
+
+    def dumps(self, report):
+        buffer = bytearray()
+        _pack(report.to_dict(), buffer)
+        return bytes(buffer)
+
+    def loads(self, data):
+        data = memoryview(data)
+        offset = 0
+        while offset < len(data):
+            value, offset = _unpack(data, offset)
+            yield report_from_dict(value)
+
+
+class TextSerializer(Serializer):
+    """Human-readable terminal rendering with ANSI colors (write-only)"""
+
+    def __init__(self, colors=None):
+        self.colors = COLORS if colors is None else colors
+
+    def dumps(self, report):
+        frame = Frame()
+        render = getattr(self, "_render_" + report.kind, None)
+        if render is None:
+            raise ValueError(f"No text rendering for {report.kind!r} reports")
+        render(frame, report)
+        return frame.getvalue()
+
+    def _render_full_report(self, frame, report):
+        frame.line("🌌" * 20)
+        frame.line("   AURORA BOREALIS COMPREHENSIVE TRACKER")
+        frame.line("🌌" * 20)
+        frame.line(f"Generated: {report.generated.strftime('%Y-%m-%d %H:%M:%S')}")
+        frame.line()
+
+        frame.line(f"🔮 CURRENT CONDITIONS")
+        frame.line(f"   KP Index: {report.kp_index:.1f}")
+        frame.line(f"   Activity: {report.activity_level}")
+        frame.line(f"   Visibility: {report.visibility_zone}")
+        frame.line()
+
+        frame.line("📊 7-DAY FORECAST")
+        for day in report.forecast:
+            frame.line(f"   {day.date}: KP {day.kp_index} - {day.activity_level}")
+        frame.line()
+
+        frame.line("📍 VIEWING PROBABILITIES (Next 24 Hours)")
+        for entry in report.probabilities:
+            frame.line(_location_prefix(entry.location) + _percent_text(entry.probability))
+        frame.line()
+
+        frame.line("🎨 EXPECTED COLORS")
+        for color in report.colors:
+            frame.line(f"   {color.name}: {color.altitude} altitude ({color.cause})")
+        frame.line()
+
+        frame.line("📸 PHOTOGRAPHY TIPS")
+        for tip in report.tips:
+            frame.line(f"   {tip}")
+        frame.line()
+
+        frame.line("💡 AURORA FACT OF THE DAY")
+        frame.line(f"   {report.fact}")
+        frame.line()
+
+        frame.line("✨ Happy Aurora Hunting! ✨")
+        frame.line("🌌" * 20)
+
+    def _render_info(self, frame, report):
+        frame.line("🌌 AURORA BOREALIS INFORMATION REPORT 🌌")
+        frame.line("=" * 50)
+        frame.line(f"Generated on: {report.generated.strftime('%Y-%m-%d %H:%M:%S')}")
+        frame.line()
+        frame.line(f"Current KP Index: {report.kp_index}/9")
+        frame.line(f"Visibility: {report.visibility}")
+        frame.line()
+        frame.line("🔍 Random Aurora Fact:")
+        frame.line(f"   {report.fact}")
+        frame.line()
+        frame.line("👀 Viewing Tips:")
+        for tip in report.tips:
+            frame.line(f"   • {tip}")
+        frame.line()
+        frame.line("✨ Happy aurora hunting! ✨")
+
+    def _render_bar_chart(self, frame, report):
+        c = self.colors
+        rows = report.rows
+        frame.line(f"📊 AURORA ACTIVITY - {report.title()} 📊", c['cyan'])
+        frame.line("=" * 50, c['white'])
+        if len(rows) < report.total_days:
+            frame.line(f"Showing the peak day of every ~{report.span_days() / len(rows):.0f} days")
+        frame.line()
+
+        frame.line(f"{'Date':<12} {'KP':<4} {'Activity':<15} {'Graph':<20}")
+        frame.line("-" * 55)
+
+        # Include the year once the chart spans more than a year
+        spans_years = rows and (rows[-1].date - rows[0].date).days > 365
+        date_format = "%Y-%m-%d" if spans_years else "%m-%d"
+
+        for row in rows:
+            kp_val = row.kp_index
+            frame.write(f"{row.date.strftime(date_format):<12} {kp_val:<4} {row.activity_level:<15} ")
+            frame.write('█' * int(kp_val * 2), c[row.color])
+            frame.line(f" {kp_val}")
+
+        frame.line()
+        frame.write("🟢 Quiet/Unsettled  ", c['green'])
+        frame.write("🟡 Active  ", c['yellow'])
+        frame.write("🔴 Storm  ", c['red'])
+        frame.line("🟣 Severe+", c['purple'])
+
+    def _render_line_graph(self, frame, report):
+        c = self.colors
+        points = report.points
+        frame.line()
+        frame.line("📈 KP INDEX TREND LINE 📈", c['blue'])
+        frame.line("=" * 40, c['white'])
+
+        height = 10
+        width = len(points)
+
+        frame.line()
+        frame.line(f"KP Range: {report.min_kp:.1f} - {report.max_kp:.1f}")
+        frame.line()
+
+        point_colors = [c[point.color] for point in points]
+        scaled_values = [(point.kp_index / 9) * height for point in points]
+
+        for row in range(height, 0, -1):
+            kp_level = (row / height) * 9  # Scale to 0-9
+            frame.write(f"{kp_level:4.1f} |")
+            for scaled_kp, color in zip(scaled_values, point_colors):
+                if abs(scaled_kp - row) < 0.8:
+                    frame.write("●", color)
+                else:
+                    frame.write(" ")
+            frame.newline()
+
+        frame.line("     " + "-" * width)
+        # One "MM/DD" label every 6 columns so labels never run past the axis
+        labels = [" "] * width
+        for i in range(0, width - 4, 6):
+            labels[i:i + 5] = points[i].date.strftime("%m/%d")
+        frame.line("     " + "".join(labels).rstrip())
+
+    def _render_statistics(self, frame, report):
+        c = self.colors
+        frame.line()
+        frame.line("📊 AURORA STATISTICS SUMMARY 📊", c['purple'])
+        frame.line("=" * 35, c['white'])
+
+        frame.line()
+        frame.line(f"📊 KP Index Statistics:")
+        if not report.count:
+            frame.line("   No readings")
+            return
+        frame.line(f"   Average KP: {report.mean:.1f}")
+        frame.line(f"   Maximum KP: {report.max:.1f}")
+        frame.line(f"   Minimum KP: {report.min:.1f}")
+
+        frame.line()
+        frame.line(f"⚡ Activity Summary:")
+        frame.line(f"   Storm Days (KP≥5): {report.storm_days}/{report.count} days ({report.storm_fraction*100:.0f}%)")
+        frame.line(f"   Active Days (KP≥3): {report.active_days}/{report.count} days ({report.active_fraction*100:.0f}%)")
+
+        frame.line()
+        frame.line(f"🎯 Best Viewing Chances:")
+        frame.line(f"   Excellent (KP≥4): {report.excellent_days} days")
+        frame.line(f"   Good (KP≥3): {report.good_days} days")
+
+        if report.max >= 6:
+            frame.line()
+            frame.line(f"🌟 Highlights:")
+            frame.line(f"   Peak activity reached {report.max:.1f} - {report.peak_level}!")
+            frame.line(f"   Aurora likely visible as far south as central US!")
+
+    def _render_ensemble(self, frame, report):
+        c = self.colors
+        seed = "unseeded" if report.seed is None else f"seed {report.seed}"
+        frame.line(f"🎲 ENSEMBLE FORECAST - {report.paths} PATHS ({seed}) 🎲", c['cyan'])
+        frame.line("=" * 60, c['white'])
+        frame.line()
+
+        header = f"{'Date':<12} {'Mean':>5}"
+        header += "".join(f" {'P' + format(level * 100, '.0f'):>5}" for level in report.quantile_levels)
+        header += "".join(f" {'KP≥' + format(t, 'g'):>6}" for t in report.thresholds)
+        frame.line(header)
+        frame.line("-" * len(header))
+        for day in report.days:
+            row = f"{day.date.strftime('%Y-%m-%d'):<12} {day.mean:5.1f}"
+            row += "".join(f" {value:5.1f}" for value in day.quantiles)
+            row += "".join(f" {value * 100:5.0f}%" for value in day.exceedance)
+            frame.line(row)
+
+        frame.line()
+        frame.line("🎨 EXPECTED COLORS (chance of appearing on an average day)")
+        for name, chance in zip(report.color_names, report.expected_colors):
+            frame.line(f"   {name:<7} {chance * 100:5.1f}%")
+
+    def _render_art(self, frame, report):
+        for line in report.lines:
+            frame.line(line.text, self.colors.get(line.color))
+
+    def _render_site(self, frame, report):
+        frame.line(f"📍 {report.name} ({report.lat:.2f}, {report.lon:.2f}, "
+                   f"magnetic {report.magnetic_lat:.1f})")
+        for date, kp, probability in zip(report.dates, report.kp_values, report.probabilities):
+            frame.line(_forecast_prefix(date, kp) + _percent_text(probability))
+
+
+# Report lines repeat across reports: every report lists the same sites,
+# and batch site reports share one forecast, so their fixed parts are
+# formatted once. Probabilities are clipped to 0-100 and shown rounded.
+_PERCENTS = tuple(f"{value:>3d}%" for value in range(101))
+
+
+def _percent_text(probability):
+    """f"{probability:>3.0f}%" without formatting the common cases"""
+    rounded = round(probability)
+    if 0 < rounded <= 100 or (rounded == 0 and math.copysign(1.0, probability) > 0):
+        return _PERCENTS[rounded]
+    return f"{probability:>3.0f}%"  # Out of range, or negative values that show "-0"
+
+
+@functools.lru_cache(maxsize=65536)
+def _location_prefix(location):
+    return f"   {location:<20}: "
+
+
+@functools.lru_cache(maxsize=4096)
+def _forecast_prefix(date, kp):
+    return f"   {date}: KP {kp} - "
+
+
+SERIALIZERS = {
+    "jsonl": JsonLinesSerializer,
+    "binary": BinarySerializer,
+    "text": TextSerializer,
+}
+
+
+def get_serializer(name, **kwargs):
+    """Serializer instance for a format name (jsonl, binary or text)"""
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown format {name!r}, expected one of {', '.join(SERIALIZERS)}")
+    return SERIALIZERS[name](**kwargs)
+
+
+# MessagePack subset used by BinarySerializer
+
+def _pack(value, buffer):
+    if value is None:
+        buffer.append(0xc0)
+    elif value is True:
+        buffer.append(0xc3)
+    elif value is False:
+        buffer.append(0xc2)
+    elif isinstance(value, int):
+        _pack_int(value, buffer)
+    elif isinstance(value, float):
+        buffer.append(0xcb)
+        buffer += struct.pack(">d", value)
+    elif isinstance(value, str):
+        raw = value.encode("utf-8")
+        _pack_header(len(raw), buffer, 0xa0, 32, (0xd9, 0xda, 0xdb))
+        buffer += raw
+    elif isinstance(value, (bytes, bytearray)):
+        _pack_header(len(value), buffer, None, 0, (0xc4, 0xc5, 0xc6))
+        buffer += value
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), buffer, 0x90, 16, (None, 0xdc, 0xdd))
+        for item in value:
+            _pack(item, buffer)
+    elif isinstance(value, dict):
+        _pack_header(len(value), buffer, 0x80, 16, (None, 0xde, 0xdf))
+        for key, item in value.items():
+            _pack(key, buffer)
+            _pack(item, buffer)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} values")
+
+
+def _pack_int(value, buffer):
+    if 0 <= value < 0x80:
+        buffer.append(value)
+    elif -32 <= value < 0:
+        buffer.append(value & 0xff)
+    elif value >= 0:
+        for code, fmt, limit in ((0xcc, ">B", 1 << 8), (0xcd, ">H", 1 << 16),
+                                 (0xce, ">I", 1 << 32), (0xcf, ">Q", 1 << 64)):
+            if value < limit:
+                buffer.append(code)
+                buffer += struct.pack(fmt, value)
+                return
+        raise OverflowError("Integer too large to encode")
+    else:
+        for code, fmt, limit in ((0xd0, ">b", 1 << 7), (0xd1, ">h", 1 << 15),
+                                 (0xd2, ">i", 1 << 31), (0xd3, ">q", 1 << 63)):
+            if value >= -limit:
+                buffer.append(code)
+                buffer += struct.pack(fmt, value)
+                return
+        raise OverflowError("Integer too small to encode")
+
+
+def _pack_header(length, buffer, fix_code, fix_limit, codes):
+    """Length prefix: fix form when short enough, else 8/16/32-bit form"""
+    if fix_code is not None and length < fix_limit:
+        buffer.append(fix_code | length)
+        return
+    code8, code16, code32 = codes
+    if code8 is not None and length < 1 << 8:
+        buffer.append(code8)
+        buffer += struct.pack(">B", length)
+    elif length < 1 << 16:
+        buffer.append(code16)
+        buffer += struct.pack(">H", length)
+    else:
+        buffer.append(code32)
+        buffer += struct.pack(">I", length)
+
+
+_FIXED = {
+    0xcc: ">B", 0xcd: ">H", 0xce: ">I", 0xcf: ">Q",
+    0xd0: ">b", 0xd1: ">h", 0xd2: ">i", 0xd3: ">q",
+    0xca: ">f", 0xcb: ">d",
+}
+_LENGTHS = {
+    0xd9: (">B", "str"), 0xda: (">H", "str"), 0xdb: (">I", "str"),
+    0xc4: (">B", "bin"), 0xc5: (">H", "bin"), 0xc6: (">I", "bin"),
+    0xdc: (">H", "array"), 0xdd: (">I", "array"),
+    0xde: (">H", "map"), 0xdf: (">I", "map"),
+}
+
+
+def _unpack(data, offset):
+    """Decode one value starting at offset; returns (value, next offset)"""
+    code = data[offset]
+    offset += 1
+    if code < 0x80:
+        return code, offset
+    if code >= 0xe0:
+        return code - 0x100, offset
+    if 0xa0 <= code <= 0xbf:
+        return _unpack_body(data, offset, code & 0x1f, "str")
+    if 0x90 <= code <= 0x9f:
+        return _unpack_body(data, offset, code & 0x0f, "array")
+    if 0x80 <= code <= 0x8f:
+        return _unpack_body(data, offset, code & 0x0f, "map")
+    if code == 0xc0:
+        return None, offset
+    if code == 0xc2:
+        return False, offset
+    if code == 0xc3:
+        return True, offset
+    if code in _FIXED:
+        fmt = _FIXED[code]
+        return struct.unpack_from(fmt, data, offset)[0], offset + struct.calcsize(fmt)
+    if code in _LENGTHS:
+        fmt, kind = _LENGTHS[code]
+        length = struct.unpack_from(fmt, data, offset)[0]
+        return _unpack_body(data, offset + struct.calcsize(fmt), length, kind)
+    raise ValueError(f"Unsupported MessagePack type byte 0x{code:02x}")
+
+
+def _unpack_body(data, offset, length, kind):
+    if kind == "str":
+        return str(data[offset:offset + length], "utf-8"), offset + length
+    if kind == "bin":
+        return bytes(data[offset:offset + length]), offset + length
+    if kind == "array":
+        items = []
+        for _ in range(length):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    result = {}
+    for _ in range(length):
+        key, offset = _unpack(data, offset)
+        result[key], offset = _unpack(data, offset)
+    return result, offset
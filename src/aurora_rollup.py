@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+KP Rollup Index
+Keeps 3-hourly KP readings rolled up by day, month and year for fast range queries
+"""
+
+import argparse
+import bisect
+import datetime
+import math
+import os
+import struct
+import sys
+from array import array
+
+from aurora_classify import activity_codes
+from aurora_series import EPOCH, KpSeries
+from aurora_stats import DEFAULT_THRESHOLDS
+
+LEVELS = ("3h", "day", "month", "year")
+
+# Saved levels live next to the archive in <archive>.rollup: a header tying
+# them to one version of the archive (size, mtime, record count), the
+# thresholds, then per level a bucket count and little-endian columns
+ROLLUP_SUFFIX = ".rollup"
+ROLLUP_MAGIC = b"AURRU\x00\x01\x00"
+ROLLUP_HEADER = struct.Struct("<8sqqII")  # magic, archive size, archive mtime_ns, records, thresholds
+_SAVED_LEVELS = ("day", "month", "year")
+
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def _hours(moment):
+    """Hours since the epoch for a date or naive UTC datetime"""
+    hours = (moment.toordinal() - _EPOCH_ORDINAL) * 24
+    if isinstance(moment, datetime.datetime):
+        hours += moment.hour
+    return hours
+
+
+def _moment(hours):
+    day, hour = divmod(hours, 24)
+    return datetime.datetime.combine(datetime.date.fromordinal(day + _EPOCH_ORDINAL),
+                                     datetime.time(hour))
+
+
+# Bucket keys are consecutive integers at every level, so the bucket after
+# key k is k + 1. Each level maps an epoch hour to its key and a key back
+# to the hour its bucket starts.
+
+def _day_key(hours):
+    return hours // 24
+
+
+def _day_start(key):
+    return key * 24
+
+
+def _month_key(hours):
+    date = datetime.date.fromordinal(hours // 24 + _EPOCH_ORDINAL)
+    return date.year * 12 + date.month - 1
+
+
+def _month_start(key):
+    year, month = divmod(key, 12)
+    return _hours(datetime.date(year, month + 1, 1))
+
+
+def _year_key(hours):
+    return datetime.date.fromordinal(hours // 24 + _EPOCH_ORDINAL).year
+
+
+def _year_start(key):
+    return _hours(datetime.date(key, 1, 1))
+
+
+def _slot_key(hours):
+    return hours // 3
+
+
+def _slot_start(key):
+    return key * 3
+
+
+def rollup_path(archive_path):
+    """Where the saved levels of an archive live"""
+    return archive_path + ROLLUP_SUFFIX
+
+
+def _column_bytes(typecode, values):
+    column = array(typecode, values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return struct.pack("<I", len(column)) + column.tobytes()
+
+
+def _read_column(data, offset, typecode):
+    (length,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    column = array(typecode)
+    end = offset + length * column.itemsize
+    if end > len(data):
+        raise ValueError("truncated rollup file")
+    column.frombytes(data[offset:end])
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column, end
+
+
+class RollupBucket:
+    """
+    Summary of the readings in one period (or a merged range of periods).
+
+    readings_at_least counts 3-hour readings with KP >= each threshold;
+    days_at_least counts days whose peak KP reached it.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "days", "readings_at_least", "days_at_least")
+
+    def __init__(self, thresholds=DEFAULT_THRESHOLDS):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.days = 0
+        self.readings_at_least = [0] * len(thresholds)
+        self.days_at_least = [0] * len(thresholds)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other):
+        """Fold another bucket's summary into this one"""
+        self.count += other.count
+        self.total += other.total
+        if other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+        self.days += other.days
+        for index, value in enumerate(other.readings_at_least):
+            self.readings_at_least[index] += value
+        for index, value in enumerate(other.days_at_least):
+            self.days_at_least[index] += value
+        return self
+
+    def to_dict(self, thresholds=DEFAULT_THRESHOLDS):
+        return {
+            "count": self.count,
+            "days": self.days,
+            "mean": self.mean,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "readings_at_least": dict(zip(thresholds, self.readings_at_least)),
+            "days_at_least": dict(zip(thresholds, self.days_at_least)),
+        }
+
+
+class _Level:
+    """Buckets of one resolution, keyed by period and kept in key order"""
+
+    __slots__ = ("key_of", "start_of", "keys", "buckets")
+
+    def __init__(self, key_of, start_of):
+        self.key_of = key_of
+        self.start_of = start_of
+        self.keys = []
+        self.buckets = {}
+
+    def bucket(self, key, thresholds):
+        """The bucket for key, created (and its key inserted in order) if new"""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = RollupBucket(thresholds)
+            if not self.keys or key > self.keys[-1]:
+                self.keys.append(key)  # Readings usually arrive in time order
+            else:
+                bisect.insort(self.keys, key)
+        return bucket
+
+    def key_range(self, first, last):
+        """Existing keys from first to last inclusive"""
+        keys = self.keys
+        return keys[bisect.bisect_left(keys, first):bisect.bisect_right(keys, last)]
+
+
+class KpRollup:
+    """
+    Multi-resolution index of KP readings: 3-hour, day, month and year.
+
+    The 3-hour level is the readings themselves, in time-sorted columns
+    like KpArchive. Each reading is folded into its day, month and year
+    bucket as it arrives, so the index is always current and adding a
+    reading costs a few dict lookups. A range query takes whole years
+    from the year level, the leftover whole months at either end from the
+    month level, then whole days, then single readings: it touches at
+    most ~2 x (11 months + 30 days + 7 readings) buckets plus one per
+    year, instead of every reading in the range. The day, month and year
+    levels can be saved beside an archive (save(), open_archive()), which
+    aurora_ingest keeps up to date, so later runs skip folding every
+    reading in again.
+    """
+
+    def __init__(self, thresholds=DEFAULT_THRESHOLDS):
+        self.thresholds = tuple(sorted(thresholds))
+        self.hours = array("i")
+        self.kp = array("d")
+        self.levels = {
+            "day": _Level(_day_key, _day_start),
+            "month": _Level(_month_key, _month_start),
+            "year": _Level(_year_key, _year_start),
+        }
+        self.reads = 0  # Buckets and readings touched by the last query
+
+    def __len__(self):
+        return len(self.kp)
+
+    @classmethod
+    def from_archive(cls, archive, thresholds=DEFAULT_THRESHOLDS):
+        """Index every reading of a KpArchive (aurora_ingest); see attach()"""
+        rollup = cls(thresholds)
+        rollup.attach(archive)
+        return rollup
+
+    def attach(self, archive, start=0):
+        """
+        Read the 3-hour readings through a KpArchive's views, folding in those from index start.
+
+        The levels must already cover the archive's first start readings
+        (from load() or an earlier archive this one extends). Nothing is
+        copied, so keep the archive open while querying; add() copies the
+        readings into arrays first.
+        """
+        self.hours, self.kp = archive.hours, archive.kp
+        hours, kp = archive.hours, archive.kp
+        for index in range(start, len(kp)):
+            self._fold(hours[index], kp[index])
+
+    @classmethod
+    def open_archive(cls, archive, thresholds=DEFAULT_THRESHOLDS):
+        """
+        Index a KpArchive from its saved levels when they match it.
+
+        Otherwise every reading is folded in and the levels are saved
+        for next time (skipped when the directory is read-only).
+        """
+        path = rollup_path(archive.path)
+        try:
+            return cls.load(path, archive, thresholds)
+        except (OSError, ValueError, struct.error):
+            pass
+        rollup = cls.from_archive(archive, thresholds)
+        try:
+            rollup.save(path, archive)
+        except OSError:
+            pass
+        return rollup
+
+    @classmethod
+    def load(cls, path, archive, thresholds=DEFAULT_THRESHOLDS):
+        """
+        Index a KpArchive with day, month and year levels read from save() output.
+
+        The readings are the archive's own views (see attach()). Raises ValueError when the file belongs to another version of the
+        archive or was saved with other thresholds.
+        """
+        with open(path, "rb") as handle:
+            data = handle.read()
+        magic, size, mtime, count, _ = ROLLUP_HEADER.unpack_from(data)
+        if magic != ROLLUP_MAGIC:
+            raise ValueError(f"{path} is not a rollup file")
+        stat = os.stat(archive.path)
+        if (size, mtime, count) != (stat.st_size, stat.st_mtime_ns, len(archive)):
+            raise ValueError(f"{path} is out of date")
+        rollup = cls(thresholds)
+        stored, offset = _read_column(data, ROLLUP_HEADER.size, "d")
+        if tuple(stored) != rollup.thresholds:
+            raise ValueError(f"{path} was saved with thresholds {tuple(stored)}")
+
+        width = len(rollup.thresholds)
+        for name in _SAVED_LEVELS:
+            columns = []
+            for typecode in ("i", "i", "i", "d", "d", "d", "i", "i"):
+                column, offset = _read_column(data, offset, typecode)
+                columns.append(column)
+            keys, counts, days, totals, lows, highs, readings, reached_days = columns
+            level = rollup.levels[name]
+            level.keys = list(keys)
+            for index, key in enumerate(keys):
+                bucket = level.buckets[key] = RollupBucket(())
+                bucket.count = counts[index]
+                bucket.days = days[index]
+                bucket.total = totals[index]
+                bucket.min = lows[index]
+                bucket.max = highs[index]
+                bucket.readings_at_least = readings[index * width:(index + 1) * width].tolist()
+                bucket.days_at_least = reached_days[index * width:(index + 1) * width].tolist()
+
+        rollup.attach(archive, len(archive))
+        return rollup
+
+    def save(self, path, archive):
+        """
+        Write the day, month and year levels for archive to path.
+
+        The 3-hour readings are not saved: they are the archive itself.
+        The file is written beside path and renamed into place.
+        """
+        stat = os.stat(archive.path)
+        parts = [ROLLUP_HEADER.pack(ROLLUP_MAGIC, stat.st_size, stat.st_mtime_ns, len(archive),
+                                    len(self.thresholds)),
+                 _column_bytes("d", self.thresholds)]
+        for name in _SAVED_LEVELS:
+            level = self.levels[name]
+            buckets = [level.buckets[key] for key in level.keys]
+            parts.append(_column_bytes("i", level.keys))
+            for field, typecode in (("count", "i"), ("days", "i"), ("total", "d"),
+                                    ("min", "d"), ("max", "d")):
+                parts.append(_column_bytes(typecode, [getattr(bucket, field) for bucket in buckets]))
+            for field in ("readings_at_least", "days_at_least"):
+                parts.append(_column_bytes("i", [value for bucket in buckets
+                                                 for value in getattr(bucket, field)]))
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as handle:
+                handle.write(b"".join(parts))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def from_series(cls, data, thresholds=DEFAULT_THRESHOLDS):
+        """Index a daily KpSeries, one reading at midnight per day"""
+        rollup = cls(thresholds)
+        rollup.extend_hours([day * 24 for day in data.days], data.kp_values())
+        return rollup
+
+    def add(self, moment, kp):
+        """Add one reading for a date or naive UTC datetime"""
+        self.add_hour(_hours(moment), kp)
+
+    def extend(self, records):
+        """Add (date or datetime, kp) pairs"""
+        for moment, kp in records:
+            self.add_hour(_hours(moment), kp)
+
+    def extend_hours(self, hours, values):
+        """Add readings given as epoch hours and KP columns"""
+        for hour, kp in zip(hours, values):
+            self.add_hour(hour, kp)
+
+    def add_hour(self, hour, kp):
+        """Add one reading at an epoch hour and update every rollup level"""
+        kp = float(kp)
+        if not isinstance(self.hours, array):
+            # Readings viewed from an archive (attach()) are read-only
+            self.hours, self.kp = array("i", self.hours), array("d", self.kp)
+        if not self.hours or hour >= self.hours[-1]:
+            self.hours.append(hour)
+            self.kp.append(kp)
+        else:
+            position = bisect.bisect_right(self.hours, hour)
+            self.hours.insert(position, hour)
+            self.kp.insert(position, kp)
+        self._fold(hour, kp)
+
+    def _fold(self, hour, kp):
+        """Update every rollup level with one reading"""
+        thresholds = self.thresholds
+        reached = bisect.bisect_right(thresholds, kp)  # Thresholds with kp >= t
+
+        day, month, year = (level.bucket(level.key_of(hour), thresholds)
+                            for level in self.levels.values())
+        new_day = day.count == 0
+        # Thresholds the day's peak crosses with this reading
+        crossed = range(bisect.bisect_right(thresholds, day.max) if day.count else 0, reached)
+
+        for bucket in (day, month, year):
+            bucket.count += 1
+            bucket.total += kp
+            if kp < bucket.min:
+                bucket.min = kp
+            if kp > bucket.max:
+                bucket.max = kp
+            if new_day:
+                bucket.days += 1
+            for index in range(reached):
+                bucket.readings_at_least[index] += 1
+            for index in crossed:
+                bucket.days_at_least[index] += 1
+
+    def summary(self, start=None, end=None):
+        """
+        RollupBucket for readings with start <= time < end.
+
+        start and end are dates or naive UTC datetimes (None for open
+        ends); they are rounded inwards to 3-hour slots.
+        """
+        result = RollupBucket(self.thresholds)
+        if not self.hours:
+            self.reads = 0
+            return result
+        low = self.hours[0] if start is None else _hours(start)
+        # An open end takes in the whole 3-hour slot of the last reading
+        high = _slot_start(_slot_key(self.hours[-1]) + 1) if end is None else _hours(end)
+        self.reads = 0
+        self._collect(("year", "month", "day"), low, high, result)
+        return result
+
+    def _collect(self, levels, low, high, result):
+        if low >= high:
+            return
+        if not levels:
+            # Finest level: the readings in whole 3-hour slots inside the range
+            first = _slot_start(_slot_key(low) + (1 if low % 3 else 0))
+            last = _slot_start(_slot_key(high))
+            begin = bisect.bisect_left(self.hours, first)
+            stop = bisect.bisect_left(self.hours, last)
+            self.reads += stop - begin
+            self._fold_readings(begin, stop, result)
+            return
+
+        level = self.levels[levels[0]]
+        first = level.key_of(low)
+        if level.start_of(first) < low:
+            first += 1
+        last = level.key_of(high) - 1
+        if first > last:
+            self._collect(levels[1:], low, high, result)
+            return
+
+        for key in level.key_range(first, last):
+            result.merge(level.buckets[key])
+            self.reads += 1
+        self._collect(levels[1:], low, level.start_of(first), result)
+        self._collect(levels[1:], level.start_of(last + 1), high, result)
+
+    def _fold_readings(self, begin, stop, result):
+        thresholds = self.thresholds
+        day_peaks = {}
+        for index in range(begin, stop):
+            kp = self.kp[index]
+            result.count += 1
+            result.total += kp
+            if kp < result.min:
+                result.min = kp
+            if kp > result.max:
+                result.max = kp
+            for position in range(bisect.bisect_right(thresholds, kp)):
+                result.readings_at_least[position] += 1
+            day = self.hours[index] // 24
+            if kp > day_peaks.get(day, -math.inf):
+                day_peaks[day] = kp
+        # Part-days count as days with the peak seen inside the range
+        result.days += len(day_peaks)
+        for peak in day_peaks.values():
+            for position in range(bisect.bisect_right(thresholds, peak)):
+                result.days_at_least[position] += 1
+
+    def buckets(self, level, start=None, end=None):
+        """(period start datetime, RollupBucket) pairs for a level's periods overlapping a range"""
+        if level == "3h":
+            raise ValueError("3-hour readings are in the hours and kp columns")
+        if level not in self.levels:
+            raise ValueError(f"Unknown level {level!r}, expected one of {', '.join(LEVELS)}")
+        rollup = self.levels[level]
+        if not rollup.keys:
+            return []
+        first = rollup.keys[0] if start is None else rollup.key_of(_hours(start))
+        last = rollup.keys[-1] if end is None else rollup.key_of(_hours(end) - 1)
+        return [(_moment(rollup.start_of(key)), rollup.buckets[key])
+                for key in rollup.key_range(first, last)]
+
+    def to_series(self, start=None, end=None):
+        """Daily-maximum KpSeries from the day level (for the graph tools)"""
+        series = KpSeries()
+        days = self.levels["day"]
+        if not days.keys:
+            return series
+        first = days.keys[0] if start is None else _day_key(_hours(start))
+        last = days.keys[-1] if end is None else _day_key(_hours(end) - 1)
+        keys = days.key_range(first, last)
+        series.days = array("i", keys)
+        series.kp = array("f", [days.buckets[key].max for key in keys])
+        series.levels = array("B", activity_codes(series.kp))
+        return series
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a KP archive over a date range")
+    parser.add_argument("archive", help="Archive written by aurora_ingest.py")
+    parser.add_argument("--start", type=datetime.date.fromisoformat)
+    parser.add_argument("--end", type=datetime.date.fromisoformat, help="Exclusive end date")
+    parser.add_argument("--by", choices=("day", "month", "year"), help="Also list each period")
+    args = parser.parse_args(argv)
+
+    from aurora_ingest import KpArchive
+    with KpArchive(args.archive) as archive:
+        rollup = KpRollup.open_archive(archive)
+        _print_summary(rollup, args)
+    return 0
+
+
+def _print_summary(rollup, args):
+    thresholds = rollup.thresholds
+    if args.by:
+        print(f"{'period':<12} {'mean':>5} {'max':>4} {'days':>5} " +
+              " ".join(f"{f'days>={t}':>8}" for t in thresholds))
+        date_format = {"day": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}[args.by]
+        for moment, bucket in rollup.buckets(args.by, args.start, args.end):
+            print(f"{moment.strftime(date_format):<12} {bucket.mean:5.2f} {bucket.max:4.1f} "
+                  f"{bucket.days:>5} " + " ".join(f"{n:>8}" for n in bucket.days_at_least))
+
+    summary = rollup.summary(args.start, args.end)
+    print(f"📚 {summary.count} readings over {summary.days} days ({rollup.reads} buckets read)")
+    if summary.count:
+        print(f"   KP mean {summary.mean:.2f}, min {summary.min:.1f}, max {summary.max:.1f}")
+        for threshold, readings, days in zip(thresholds, summary.readings_at_least,
+                                             summary.days_at_least):
+            print(f"   KP >= {threshold}: {readings} readings on {days} days")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Columnar KP Time Series
+Compact storage for long KP records with a dict-compatible row view
+"""
+
+import datetime
+from array import array
+from collections.abc import Mapping
+
+from aurora_classify import ACTIVITY_LEVELS, VISIBILITY_ZONES, activity_code
+
+EPOCH = datetime.date(1970, 1, 1)
+ISO_DATE_FORMAT = "%Y-%m-%d"
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+RECORD_FIELDS = ("date", "kp_index", "activity_level", "visibility_zone")
+_STORED_FIELDS = ("date", "kp_index", "activity_level")
+
+
+def to_epoch_day(value):
+    """Convert a date, datetime or ISO date string to days since 1970-01-01"""
+    if isinstance(value, str):
+        value = datetime.date.fromisoformat(value[:10])
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def from_epoch_day(day):
+    """Convert days since 1970-01-01 back to a date"""
+    return datetime.date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+class KpRecord(dict):
+    """
+    One row of a KpSeries as a plain dict.
+
+    Assigning date, kp_index or activity_level writes the change back to
+    the series (and refreshes the derived fields); other keys are kept in
+    this dict only.
+    """
+
+    __slots__ = ("_series", "_index")
+
+    def __init__(self, series, index):
+        self._series = series
+        self._index = index
+        level = series.levels[index]
+        super().__init__(date=series.date_at(index), kp_index=series.kp_at(index),
+                         activity_level=ACTIVITY_LEVELS[level],
+                         visibility_zone=VISIBILITY_ZONES[level])
+
+    def __setitem__(self, key, value):
+        if key in _STORED_FIELDS:
+            row = {**self, key: value}
+            if key == "kp_index":
+                del row["activity_level"]  # Reclassify the new value
+            self._series[self._index] = row
+            self.update(KpRecord(self._series, self._index))
+        else:
+            super().__setitem__(key, value)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class KpSeries:
+    """
+    KP readings stored as three parallel typed arrays.
+
+    kp holds float32 values, days holds int32 days since 1970-01-01 and
+    levels holds the uint8 activity code. Indexing or iterating yields
+    KpRecord dicts, and rows can be assigned or appended as dicts, so
+    code written for the old list-of-dicts format ("date", "kp_index",
+    "activity_level") keeps working.
+
+    date_format controls how the "date" key is presented: None gives
+    datetime.date objects, a strftime pattern gives strings. decimals is
+    the rounding applied to "kp_index" when read through a record.
+    """
+
+    def __init__(self, date_format=None, decimals=1):
+        self.days = array("i")
+        self.kp = array("f")
+        self.levels = array("B")
+        self.date_format = date_format
+        self.decimals = decimals
+
+    @classmethod
+    def from_records(cls, records, date_format=None, decimals=1):
+        """
+        Build a series from an iterable of dicts with date and kp_index.
+
+        String dates come back as strings: date_format defaults to ISO
+        when the first record's date is a string.
+        """
+        if isinstance(records, cls):
+            return records
+        series = cls(date_format=date_format, decimals=decimals)
+        for record in records:
+            if series.date_format is None and not len(series) and isinstance(record["date"], str):
+                series.date_format = ISO_DATE_FORMAT
+            series.append(record)
+        return series
+
+    @staticmethod
+    def _row(record):
+        """(epoch day, kp, level code or None) of a record dict"""
+        date = record["date"]
+        # Keep the stored level: producers classify the unrounded value
+        level = record.get("activity_level")
+        level = ACTIVITY_LEVELS.index(level) if level in ACTIVITY_LEVELS else None
+        return (date if isinstance(date, int) else to_epoch_day(date)), record["kp_index"], level
+
+    def append(self, date, kp=None, level=None):
+        """
+        Append one reading; level defaults to the code derived from kp.
+
+        A record dict (date, kp_index and optionally activity_level) may
+        be passed in place of date, like list.append on the old format.
+        """
+        if isinstance(date, Mapping):
+            date, kp, level = self._row(date)
+        elif not isinstance(date, int):
+            date = to_epoch_day(date)
+        self.days.append(date)
+        self.kp.append(kp)
+        self.levels.append(activity_code(kp) if level is None else level)
+
+    def __setitem__(self, index, record):
+        """Replace one row with a record dict"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("KpSeries index out of range")
+        day, kp, level = self._row(record)
+        self.days[index] = day
+        self.kp[index] = kp
+        self.levels[index] = activity_code(kp) if level is None else level
+
+    def __len__(self):
+        return len(self.kp)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            subset = KpSeries(self.date_format, self.decimals)
+            subset.days = self.days[index]
+            subset.kp = self.kp[index]
+            subset.levels = self.levels[index]
+            return subset
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("KpSeries index out of range")
+        return KpRecord(self, index)
+
+    def take(self, indices):
+        """New series holding the rows at the given indexes"""
+        subset = KpSeries(self.date_format, self.decimals)
+        days, kp, levels = self.days, self.kp, self.levels
+        subset.days = array("i", [days[i] for i in indices])
+        subset.kp = array("f", [kp[i] for i in indices])
+        subset.levels = array("B", [levels[i] for i in indices])
+        return subset
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield KpRecord(self, index)
+
+    def kp_at(self, index):
+        """KP value of one row, rounded to the series precision"""
+        value = self.kp[index]
+        if self.decimals is None:
+            return value
+        return round(value, self.decimals)
+
+    def date_at(self, index):
+        """Date of one row in the series presentation format"""
+        date = from_epoch_day(self.days[index])
+        if self.date_format is None:
+            return date
+        return date.strftime(self.date_format)
+
+    def kp_values(self):
+        """All KP values as rounded Python floats"""
+        return [self.kp_at(index) for index in range(len(self))]
+
+    def to_list(self):
+        """Materialize the series as a list of plain dicts"""
+        return [dict(record) for record in self]
+
+
+def as_series(data):
+    """Return data as a KpSeries, converting a list of dicts or any object with to_series()"""
+    if isinstance(data, KpSeries):
+        return data
+    if hasattr(data, "to_series"):
+        return data.to_series()
+    return KpSeries.from_records(data)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Aurora Dashboard API Server
+Local asyncio HTTP server exposing tracker forecasts as JSON for the web dashboard
+"""
+
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import mimetypes
+import os
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from aurora_cache import DEFAULT_BUCKET_SECONDS, time_bucket
+from aurora_profile import METRICS, count, stage
+from aurora_tracker import AuroraTracker
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_WEB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "web")
+
+FORECAST_DAYS = 30
+KEEPALIVE_TIMEOUT = 15
+MAX_CACHED_RESPONSES = 256
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def make_etag(body):
+    """Strong ETag for a response body"""
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value covers etag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+class Response:
+    """Encoded response body with its content type and ETag"""
+
+    __slots__ = ("status", "body", "content_type", "etag")
+
+    def __init__(self, status, body, content_type="application/json"):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.etag = make_etag(body) if status == 200 else None
+
+    @classmethod
+    def json(cls, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return cls(status, body)
+
+    @classmethod
+    def error(cls, status, message):
+        return cls.json({"error": message}, status)
+
+
+class DashboardState:
+    """
+    Forecast snapshot shared by every client.
+
+    The snapshot is computed once per forecast window (3 hours by
+    default) in a worker thread so the event loop keeps serving other
+    clients. Concurrent requests that arrive while it is being computed
+    wait on the same lock instead of starting their own computation.
+    Encoded responses are memoized per snapshot so repeated requests and
+    ETag revalidation cost a dict lookup.
+    """
+
+    def __init__(self, tracker=None, bucket_seconds=DEFAULT_BUCKET_SECONDS):
+        self.tracker = AuroraTracker() if tracker is None else tracker
+        self.bucket_seconds = bucket_seconds
+        self.snapshot = None
+        self.computations = 0
+        self._bucket = None
+        self._lock = None  # Created on first use, inside the running loop
+        self._responses = OrderedDict()
+
+    async def current(self):
+        """The snapshot for the current forecast window"""
+        bucket = time_bucket(self.bucket_seconds)
+        if bucket != self._bucket:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if bucket != self._bucket:
+                    loop = asyncio.get_running_loop()
+                    self.snapshot = await loop.run_in_executor(None, self._compute)
+                    self._responses.clear()
+                    self._bucket = bucket
+                    self.computations += 1
+        return self.snapshot
+
+    def _compute(self):
+        with stage("server.snapshot"):
+            return self._snapshot()
+
+    def _snapshot(self):
+        tracker = self.tracker
+        current_kp = tracker.estimate_current_kp()
+        forecast = tracker.generate_kp_forecast(FORECAST_DAYS)
+        return {
+            "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+            "current": {
+                "kp_index": round(current_kp, 1),
+                "activity_level": tracker.get_activity_level(current_kp),
+                "visibility_zone": tracker.get_visibility_zone(current_kp),
+            },
+            "forecast": forecast.to_list(),
+            "probabilities": self._probabilities(current_kp),
+            "colors": [
+                dict(name=color, **tracker.aurora_colors[color])
+                for color in tracker.predict_colors(current_kp)
+            ],
+            "tips": tracker.generate_photography_tips(current_kp),
+        }
+
+    def _probabilities(self, kp):
+        locations = self.tracker.locations
+        names = list(locations)
+        matrix = self.tracker.calculate_viewing_probabilities(
+            [locations[name]["magnetic_lat"] for name in names], [kp])
+        factors = self.tracker.sky_factors(names)
+        return [{"location": name, "probability": round(float(row[0]) * factor, 1)}
+                for name, row, factor in zip(names, matrix, factors)]
+
+    async def respond(self, path, query):
+        """Response for an API path, memoized per snapshot"""
+        count("server.api_requests")
+        if path == "/api/metrics":
+            return Response.json(METRICS.snapshot())  # Live, never memoized
+        snapshot = await self.current()
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in query.items())))
+        response = self._responses.get(key)
+        if response is None:
+            # ?kp= probabilities and encoding run in a worker thread, like the snapshot
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(None, self._route, snapshot, path, query)
+            self._responses[key] = response
+            while len(self._responses) > MAX_CACHED_RESPONSES:
+                self._responses.popitem(last=False)
+        return response
+
+    def _route(self, snapshot, path, query):
+        if path == "/api/dashboard":
+            payload = dict(snapshot, forecast=snapshot["forecast"][:7])
+            return Response.json(payload)
+        if path == "/api/current":
+            return Response.json(dict(snapshot["current"], generated=snapshot["generated"]))
+        if path == "/api/forecast":
+            days = _int_param(query, "days", 7)
+            if days is None or not 1 <= days <= FORECAST_DAYS:
+                return Response.error(400, f"days must be between 1 and {FORECAST_DAYS}")
+            return Response.json(snapshot["forecast"][:days])
+        if path == "/api/probabilities":
+            if "kp" not in query:
+                return Response.json(snapshot["probabilities"])
+            kp = _float_param(query, "kp")
+            if kp is None or not 0 <= kp <= 9:
+                return Response.error(400, "kp must be a number between 0 and 9")
+            return Response.json(self._probabilities(kp))
+        if path == "/api/colors":
+            return Response.json(snapshot["colors"])
+        return Response.error(404, "Unknown endpoint")
+
+
+def _int_param(query, name, default):
+    try:
+        return int(query[name][0]) if name in query else default
+    except ValueError:
+        return None
+
+
+def _float_param(query, name):
+    try:
+        return float(query[name][0])
+    except (KeyError, ValueError):
+        return None
+
+
+class DashboardServer:
+    """HTTP/1.1 server with keep-alive, static files and JSON API routes"""
+
+    def __init__(self, state=None, web_dir=DEFAULT_WEB_DIR):
+        self.state = DashboardState() if state is None else state
+        self.web_dir = os.path.realpath(web_dir) if web_dir else None
+        self._static = {}
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it closes or idles out"""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                    if not request_line:
+                        break
+                    headers = await self._read_headers(reader)
+                except asyncio.TimeoutError:
+                    break
+                except ValueError:  # readline: a line longer than the stream limit
+                    await self._send(writer, "GET", Response.error(400, "Request line or header too long"), False)
+                    break
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._send(writer, "HEAD", Response.error(400, "Malformed request line"), False)
+                    break
+                method, target, version = parts
+
+                keep_alive = (version == "HTTP/1.1" and
+                              headers.get("connection", "").lower() != "close")
+                response = await self._dispatch(method, target)
+                if response.etag and etag_matches(headers.get("if-none-match"), response.etag):
+                    not_modified = Response(304, b"", response.content_type)
+                    not_modified.etag = response.etag
+                    response = not_modified
+                await self._send(writer, method, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_headers(self, reader):
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    async def _dispatch(self, method, target):
+        if method not in ("GET", "HEAD"):
+            return Response.error(405, "Only GET and HEAD are supported")
+        url = urlsplit(target)
+        path = unquote(url.path)
+        try:
+            if path.startswith("/api/"):
+                return await self.state.respond(path, parse_qs(url.query))
+            return self._static_file(path)
+        except Exception as error:  # Keep serving other clients
+            return Response.error(500, str(error))
+
+    def _static_file(self, path):
+        if self.web_dir is None:
+            return Response.error(404, "Not found")
+        if path.endswith("/"):
+            path += "index.html"
+        full_path = os.path.realpath(os.path.join(self.web_dir, path.lstrip("/")))
+        if not full_path.startswith(self.web_dir + os.sep) or not os.path.isfile(full_path):
+            return Response.error(404, "Not found")
+
+        mtime = os.path.getmtime(full_path)
+        cached = self._static.get(full_path)
+        if cached is None or cached[0] != mtime:
+            with open(full_path, "rb") as handle:
+                body = handle.read()
+            content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type.endswith("javascript"):
+                content_type += "; charset=utf-8"
+            cached = (mtime, Response(200, body, content_type))
+            self._static[full_path] = cached
+        return cached[1]
+
+    async def _send(self, writer, method, response, keep_alive):
+        head = [
+            f"HTTP/1.1 {response.status} {REASONS.get(response.status, '')}",
+            f"Content-Type: {response.content_type}",
+            f"Content-Length: {len(response.body)}",
+            "Cache-Control: no-cache",
+            "Access-Control-Allow-Origin: *",
+            "Connection: " + ("keep-alive" if keep_alive else "close"),
+        ]
+        if response.etag:
+            head.append(f"ETag: {response.etag}")
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1")
+        if method != "HEAD" and response.status != 304:
+            payload += response.body
+        writer.write(payload)
+        await writer.drain()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, web_dir=DEFAULT_WEB_DIR, tracker=None):
+    """Run the dashboard server until cancelled"""
+    server = DashboardServer(DashboardState(tracker), web_dir)
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"🌌 Aurora dashboard serving on http://{host}:{port}/")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the aurora dashboard and its JSON API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--web-dir", default=DEFAULT_WEB_DIR,
+                        help="Directory with the dashboard files (default: ../web)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.web_dir))
+    except KeyboardInterrupt:
+        print("\n✨ Server stopped ✨")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Streaming KP Statistics
+One-pass, mergeable summaries of KP readings
+"""
+
+import math
+
+from aurora_classify import ACTIVITY_LEVELS, activity_code
+from aurora_series import as_series
+
+DEFAULT_THRESHOLDS = (3, 4, 5)
+
+# Histogram bin width: KP is published in tenths (this toolkit) or thirds
+# (official 0, 0+, 1-, ... steps), and both fall exactly on 1/30 bins
+DEFAULT_RESOLUTION = 1 / 30
+
+
+class KpStatistics:
+    """
+    Incremental accumulator for KP readings.
+
+    Mean and variance use Welford's update (and Chan's formula to merge),
+    min/max and threshold counts are running values, and percentiles come
+    from a histogram binned at `resolution` KP units. The default 1/30
+    bins hold values in tenths and in thirds exactly; other values are
+    reported to the nearest bin. min and max are None until a reading is
+    added. Partial results from shards or worker processes are combined
+    with merge().
+    """
+
+    def __init__(self, thresholds=DEFAULT_THRESHOLDS, resolution=DEFAULT_RESOLUTION):
+        self.thresholds = tuple(sorted(thresholds))
+        self.resolution = resolution
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self.threshold_counts = dict.fromkeys(self.thresholds, 0)
+        self.level_counts = [0] * len(ACTIVITY_LEVELS)
+        self._histogram = {}
+
+    @classmethod
+    def from_series(cls, data, **kwargs):
+        """Summarize a KpSeries or list of KP dicts in one pass"""
+        data = as_series(data)
+        stats = cls(**kwargs)
+        for index, level in enumerate(data.levels):
+            stats.add(data.kp_at(index), level)
+        return stats
+
+    def add(self, kp, level=None):
+        """Fold one reading into the summary"""
+        self.count += 1
+        delta = kp - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (kp - self.mean)
+
+        if kp < self._min:
+            self._min = kp
+        if kp > self._max:
+            self._max = kp
+
+        for threshold in self.thresholds:
+            if kp < threshold:
+                break
+            self.threshold_counts[threshold] += 1
+
+        if level is None:
+            level = activity_code(kp)
+        self.level_counts[level] += 1
+
+        key = round(kp / self.resolution)
+        self._histogram[key] = self._histogram.get(key, 0) + 1
+
+    def extend(self, values):
+        """Fold an iterable of KP values into the summary"""
+        for kp in values:
+            self.add(kp)
+        return self
+
+    def merge(self, other):
+        """Combine another summary into this one in place"""
+        if (other.thresholds != self.thresholds or
+                other.resolution != self.resolution):
+            raise ValueError("Cannot merge statistics with different thresholds or resolution")
+        if other.count == 0:
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+        for threshold, count in other.threshold_counts.items():
+            self.threshold_counts[threshold] += count
+        for level, count in enumerate(other.level_counts):
+            self.level_counts[level] += count
+        for key, count in other._histogram.items():
+            self._histogram[key] = self._histogram.get(key, 0) + count
+        return self
+
+    def __add__(self, other):
+        combined = KpStatistics(self.thresholds, self.resolution)
+        return combined.merge(self).merge(other)
+
+    @property
+    def min(self):
+        """Lowest reading, or None when empty"""
+        return self._min if self.count else None
+
+    @property
+    def max(self):
+        """Highest reading, or None when empty"""
+        return self._max if self.count else None
+
+    @property
+    def variance(self):
+        """Population variance of the readings"""
+        if self.count == 0:
+            return 0.0
+        return self._m2 / self.count
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def percentile(self, percent):
+        """Nearest-rank percentile (0-100) from the histogram"""
+        if self.count == 0:
+            raise ValueError("No readings recorded")
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for key in sorted(self._histogram):
+            seen += self._histogram[key]
+            if seen >= rank:
+                return round(key * self.resolution, 9)
+        return self.max
+
+    def count_at_least(self, threshold):
+        """Number of readings with KP >= threshold (one of the configured thresholds)"""
+        if threshold not in self.threshold_counts:
+            raise ValueError(f"KP {threshold} is not a tracked threshold; "
+                             f"pass it in thresholds= (tracking {list(self.thresholds)})")
+        return self.threshold_counts[threshold]
+
+    def fraction_at_least(self, threshold):
+        """Share of readings with KP >= threshold"""
+        count = self.count_at_least(threshold)
+        if self.count == 0:
+            return 0.0
+        return count / self.count
+
+    def activity_counts(self):
+        """Readings per activity level name, skipping empty levels"""
+        return {ACTIVITY_LEVELS[level]: count
+                for level, count in enumerate(self.level_counts) if count}
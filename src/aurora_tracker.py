@@ -6,85 +6,179 @@ A comprehensive tool for aurora enthusiasts!
 
 import random
 import datetime
-import math
-import json
+import hashlib
+import sys
+
+from aurora_cache import ForecastCache, cached
+from aurora_classify import ACTIVITY_LEVELS, COLOR_RULES, activity_code, kp_bucket
+from aurora_ensemble import DAILY_STEP, START_KP, ensemble_forecast
+from aurora_probability import viewing_probability, viewing_probability_matrix
+from aurora_profile import count, pop_profile_flag, run_profiled, stage
+from aurora_report import ColorInfo, ForecastDay, FullReport, LocationProbability, TextSerializer
+from aurora_series import KpSeries, from_epoch_day, to_epoch_day
+
+# Built-in observer sites: name -> geographic and magnetic coordinates
+DEFAULT_LOCATIONS = {
+    "Fairbanks, Alaska": {"lat": 64.8, "lon": -147.7, "magnetic_lat": 65.1},
+    "Yellowknife, Canada": {"lat": 62.5, "lon": -114.3, "magnetic_lat": 68.6},
+    "Reykjavik, Iceland": {"lat": 64.1, "lon": -21.9, "magnetic_lat": 64.8},
+    "Tromsø, Norway": {"lat": 69.6, "lon": 18.9, "magnetic_lat": 66.7},
+    "Anchorage, Alaska": {"lat": 61.2, "lon": -149.9, "magnetic_lat": 61.8},
+    "Calgary, Canada": {"lat": 51.0, "lon": -114.1, "magnetic_lat": 58.2},
+    "Seattle, Washington": {"lat": 47.6, "lon": -122.3, "magnetic_lat": 54.2},
+    "Minneapolis, Minnesota": {"lat": 44.98, "lon": -93.3, "magnetic_lat": 54.8}
+}
+
+AURORA_COLORS = {
+    "Green": {"altitude": "80-150 km", "cause": "Oxygen atoms", "frequency": 60},
+    "Red": {"altitude": "150-300 km", "cause": "High altitude oxygen", "frequency": 15},
+    "Blue": {"altitude": "80-120 km", "cause": "Nitrogen molecules", "frequency": 10},
+    "Pink": {"altitude": "80-150 km", "cause": "Nitrogen + oxygen mix", "frequency": 10},
+    "Purple": {"altitude": "80-120 km", "cause": "Nitrogen at lower altitudes", "frequency": 5}
+}
+
+# Fun facts
+AURORA_FACTS = (
+    "The aurora follows Earth's magnetic field lines",
+    "Solar wind travels at 400-800 km/s to reach Earth",
+    "Aurora activity follows an 11-year solar cycle",
+    "The aurora oval is typically 3,000 km wide",
+    "Aboriginal peoples have over 100 names for aurora"
+)
+
+USAGE = """usage: aurora-tracker [--json] [--visible-only] [--seed N] [--profile[=PREFIX]]
+
+Print the comprehensive aurora report.
+
+  --json          print the report as JSON instead of text
+  --visible-only  list only sites inside the current visibility zone
+  --seed N        seed the simulation for reproducible output
+  --profile       write a stage breakdown, cProfile dump and allocation
+                  stats to PREFIX.prof/PREFIX.txt (default: aurora-profile)
+
+Set AURORA_CACHE_DIR to reuse forecasts between runs in the same 3-hour KP window."""
 
 class AuroraTracker:
-    def __init__(self):
-        self.locations = {
-            "Fairbanks, Alaska": {"lat": 64.8, "lon": -147.7, "magnetic_lat": 65.1},
-            "Yellowknife, Canada": {"lat": 62.5, "lon": -114.3, "magnetic_lat": 68.6},
-            "Reykjavik, Iceland": {"lat": 64.1, "lon": -21.9, "magnetic_lat": 64.8},
-            "Tromsø, Norway": {"lat": 69.6, "lon": 18.9, "magnetic_lat": 66.7},
-            "Anchorage, Alaska": {"lat": 61.2, "lon": -149.9, "magnetic_lat": 61.8},
-            "Calgary, Canada": {"lat": 51.0, "lon": -114.1, "magnetic_lat": 58.2},
-            "Seattle, Washington": {"lat": 47.6, "lon": -122.3, "magnetic_lat": 54.2},
-            "Minneapolis, Minnesota": {"lat": 44.98, "lon": -93.3, "magnetic_lat": 54.8}
-        }
-        
-        self.aurora_colors = {
-            "Green": {"altitude": "80-150 km", "cause": "Oxygen atoms", "frequency": 60},
-            "Red": {"altitude": "150-300 km", "cause": "High altitude oxygen", "frequency": 15},
-            "Blue": {"altitude": "80-120 km", "cause": "Nitrogen molecules", "frequency": 10},
-            "Pink": {"altitude": "80-150 km", "cause": "Nitrogen + oxygen mix", "frequency": 10},
-            "Purple": {"altitude": "80-120 km", "cause": "Nitrogen at lower altitudes", "frequency": 5}
-        }
+    def __init__(self, cache=None, seed=None, model=None, conditions=None):
+        # Optional ForecastCache; forecasts and reports are recomputed when None
+        self.cache = cache
+        # Optional aurora_model.KpModel; forecasts are a random walk when None
+        self.model = model
+        # Optional aurora_raster.SkyConditions; probabilities ignore clouds and city lights when None
+        self.conditions = conditions
+        self._sky_factors = {}
+        self._sky_version = None
+        # Simulations draw from the global random module unless seeded
+        self.seed = seed
+        self.rng = random if seed is None else random.Random(seed)
+        self.aurora_colors = AURORA_COLORS
+        self._site_index = None
+        self._cache_token = None
         
+    @property
+    def site_index(self):
+        """Sites indexed by magnetic latitude, built from DEFAULT_LOCATIONS on first use"""
+        if self._site_index is None:
+            from aurora_geomag import SiteIndex
+            self._site_index = SiteIndex()
+            for name, site in DEFAULT_LOCATIONS.items():
+                self._site_index.add(name, site["lat"], site["lon"], site["magnetic_lat"])
+        return self._site_index
+    
+    @property
+    def locations(self):
+        """Name -> site dict, including sites added via add_location()"""
+        return self.site_index.sites
+    
+    def add_location(self, name, lat, lon, magnetic_lat=None):
+        """Add an observer site, deriving magnetic latitude from a dipole model"""
+        return self.site_index.add(name, lat, lon, magnetic_lat)
+    
+    def add_locations(self, sites):
+        """Bulk-add (name, lat, lon) observer sites"""
+        self.site_index.extend(sites)
+    
+    def visible_locations(self, kp_index):
+        """Names of all sites inside the visibility zone for a KP value"""
+        return self.site_index.visible_sites(kp_index)
+    
+    @property
+    def cache_token(self):
+        """Fingerprint of the site catalog, seed, model and sky layers, part of every cache key"""
+        version = (self.site_index.version, None if self.model is None else self.model.version,
+                   None if self.conditions is None else self.conditions.version)
+        if self._cache_token is None or self._cache_token[0] != version:
+            catalog = repr((self.seed, version[1], version[2], sorted((name, site["magnetic_lat"])
+                                                          for name, site in self.locations.items())))
+            self._cache_token = (version, hashlib.sha1(catalog.encode("utf-8")).hexdigest())
+        return self._cache_token[1]
+    
+    @property
+    def cache_rng(self):
+        """Seeded generator cached results draw from (None when unseeded)"""
+        return None if self.seed is None else self.rng
+    
+    def estimate_current_kp(self):
+        """Simulated current KP reading"""
+        return self.rng.uniform(1, 6)
+    
+    @cached()
     def generate_kp_forecast(self, days=7):
         """Generate a realistic KP index forecast"""
-        forecast = []
-        current_kp = random.uniform(1, 4)  # Start with moderate activity
+        if self.model is not None:
+            # Fitted model: from today, or the day after the latest observation
+            start = max(to_epoch_day(datetime.date.today()), self.model.last_day + 1)
+            # A stale archive leaves today past the model's horizon; use the random walk
+            if start - self.model.last_day - 1 + days <= self.model.max_horizon:
+                return self.model.forecast(days, start)
+        
+        forecast = KpSeries(date_format="%Y-%m-%d")
+        current_kp = self.rng.uniform(*START_KP)  # Start with moderate activity
         
         for day in range(days):
             # Simulate solar cycle variations
-            daily_variation = random.uniform(-1.5, 2.0)
+            daily_variation = self.rng.uniform(*DAILY_STEP)
             current_kp = max(0, min(9, current_kp + daily_variation))
             
             date = datetime.date.today() + datetime.timedelta(days=day)
-            forecast.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "kp_index": round(current_kp, 1),
-                "activity_level": self.get_activity_level(current_kp),
-                "visibility_zone": self.get_visibility_zone(current_kp)
-            })
+            forecast.append(date, round(current_kp, 1), activity_code(current_kp))
             
         return forecast
     
+    @cached()
+    def ensemble_forecast(self, days=7, paths=10000, seed=None):
+        """Probabilistic forecast from many simulated KP paths (EnsembleReport)"""
+        return ensemble_forecast(days, paths, self.seed if seed is None else seed)
+    
+    def watch(self, feeds=None, interval=60, duration=None, out=None):
+        """Refresh forecasts from feeds and keep a live probability table (blocks)"""
+        import asyncio
+        from aurora_watch import AuroraWatch
+        watcher = AuroraWatch(self, feeds, interval, out)
+        asyncio.run(watcher.run(duration))
+        return watcher
+    
+    def plan_windows(self, days=30, top=20):
+        """Best observing windows (KP x darkness x moonlight) over the next nights"""
+        from aurora_planner import ObservingPlanner
+        return ObservingPlanner(self).plan(days, top=top)
+    
+    def oval_map(self, kp_index=None, out=None):
+        """Print a polar heat map of the auroral oval with the tracker's sites marked"""
+        from aurora_oval import OvalModel
+        if kp_index is None:
+            kp_index = self.estimate_current_kp()
+        text = OvalModel().heatmap(kp_index, sites=self.locations)
+        (out or sys.stdout).write(text)
+        return text
+    
     def get_activity_level(self, kp):
-        if kp < 2:
-            return "Quiet"
-        elif kp < 3:
-            return "Unsettled"
-        elif kp < 4:
-            return "Active"
-        elif kp < 5:
-            return "Minor Storm"
-        elif kp < 6:
-            return "Moderate Storm"
-        elif kp < 7:
-            return "Strong Storm"
-        elif kp < 8:
-            return "Severe Storm"
-        else:
-            return "Extreme Storm"
+        """Convert KP index to activity level"""
+        return kp_bucket(kp).level
     
     def get_visibility_zone(self, kp):
-        if kp < 2:
-            return "Arctic Circle only"
-        elif kp < 3:
-            return "Northern Canada, Alaska"
-        elif kp < 4:
-            return "Northern border states"
-        elif kp < 5:
-            return "Northern US, southern Canada"
-        elif kp < 6:
-            return "Most of northern US"
-        elif kp < 7:
-            return "Central US states"
-        elif kp < 8:
-            return "Southern US possible"
-        else:
-            return "Visible to southern latitudes"
+        """Describe how far south aurora can be seen at a KP index"""
+        return kp_bucket(kp).zone
     
     def calculate_viewing_probability(self, location, kp_index):
         """Calculate probability of seeing aurora at given location"""
@@ -92,127 +186,153 @@ class AuroraTracker:
             return 0
         
         magnetic_lat = self.locations[location]["magnetic_lat"]
-        
-        # Simplified formula based on magnetic latitude and KP index
-        threshold_lat = 67 - (kp_index * 2.5)  # Approximation
-        
-        if magnetic_lat >= threshold_lat:
-            probability = min(95, (magnetic_lat - threshold_lat + 5) * 10)
-        else:
-            probability = max(0, (magnetic_lat - threshold_lat + 10) * 2)
-        
-        return max(0, min(100, probability))
+        probability = viewing_probability(magnetic_lat, kp_index)
+        if self.conditions is not None:
+            probability *= self.sky_factors([location])[0]
+        return probability
+    
+    def sky_factors(self, names):
+        """Cloud and light-pollution multiplier per site, sampled once per site (1.0 without layers)"""
+        if self.conditions is None:
+            return [1.0] * len(names)
+        version = (self.site_index.version, self.conditions.version)
+        if version != self._sky_version:
+            self._sky_factors = {}
+            self._sky_version = version
+        factors = self._sky_factors
+        missing = [name for name in dict.fromkeys(names) if name not in factors]
+        if missing:
+            sites = [self.locations[name] for name in missing]
+            with stage("tracker.sky"):
+                sampled = self.conditions.factors([site["lat"] for site in sites],
+                                                  [site["lon"] for site in sites])
+            factors.update(zip(missing, sampled))
+        return [factors[name] for name in names]
+    
+    def calculate_viewing_probabilities(self, magnetic_lats, kp_values):
+        """Calculate a site x KP probability matrix in one vectorized pass"""
+        return viewing_probability_matrix(magnetic_lats, kp_values)
     
     def generate_photography_tips(self, kp_index):
-        """Generate photography tips based on expected intensity"""
-        tips = [
-            "🌍 Find a location away from city lights",
-            "🕐 Best viewing: 10 PM - 2 AM local time",
-            "🌙 New moon periods offer darkest skies",
-            "📱 Use aurora prediction apps for real-time updates"
-        ]
-        
-        if kp_index >= 3:
-            tips.extend([
-                "📸 Camera settings: ISO 800-1600, f/2.8, 15-20 sec exposure",
-                "🎯 Focus on infinity or distant lights",
-                "🔋 Bring extra batteries - cold drains them fast!"
-            ])
-        
-        if kp_index >= 5:
-            tips.extend([
-                "🎨 Expect dynamic, dancing aurora!",
-                "📹 Consider time-lapse photography",
-                "👥 Aurora may be visible to naked eye"
-            ])
-        
-        return tips
+        """Photography tips for the expected intensity (a shared, immutable tuple)"""
+        return kp_bucket(kp_index).tips
     
     def predict_colors(self, kp_index):
         """Predict likely aurora colors based on activity"""
-        predicted_colors = []
-        
-        # Green is almost always present
-        if kp_index >= 1:
-            predicted_colors.append("Green")
-        
-        # Red appears with higher activity
-        if kp_index >= 4:
-            predicted_colors.append("Red")
-        
-        # Blue and pink with moderate activity
-        if kp_index >= 3:
-            if random.random() < 0.6:
-                predicted_colors.append("Pink")
-            if random.random() < 0.4:
-                predicted_colors.append("Blue")
-        
-        # Purple is rare but possible in strong storms
-        if kp_index >= 6 and random.random() < 0.3:
-            predicted_colors.append("Purple")
-        
-        return predicted_colors
-    
-    def generate_full_report(self):
-        """Generate comprehensive aurora report"""
-        print("🌌" * 20)
-        print("   AURORA BOREALIS COMPREHENSIVE TRACKER")
-        print("🌌" * 20)
-        print(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print()
-        
-        # Current conditions
-        current_kp = random.uniform(1, 6)
-        print(f"🔮 CURRENT CONDITIONS")
-        print(f"   KP Index: {current_kp:.1f}")
-        print(f"   Activity: {self.get_activity_level(current_kp)}")
-        print(f"   Visibility: {self.get_visibility_zone(current_kp)}")
-        print()
-        
-        # Forecast
-        print("📊 7-DAY FORECAST")
-        forecast = self.generate_kp_forecast()
-        for day in forecast:
-            print(f"   {day['date']}: KP {day['kp_index']} - {day['activity_level']}")
-        print()
+        return [
+            color for color, min_kp, chance in COLOR_RULES
+            if kp_index >= min_kp and (chance >= 1 or self.rng.random() < chance)
+        ]
+    
+    def generate_full_report(self, visible_only=False, out=None):
+        """Generate comprehensive aurora report
         
-        # Location probabilities
-        print("📍 VIEWING PROBABILITIES (Next 24 Hours)")
-        for location in self.locations:
-            prob = self.calculate_viewing_probability(location, current_kp)
-            print(f"   {location:<20}: {prob:>3.0f}%")
-        print()
+        With visible_only=True only sites inside the current visibility
+        zone are listed, which keeps reports readable for large catalogs.
+        Prints the report and returns it as a FullReport.
+        """
+        with stage("tracker.report"):
+            report = self.full_report(visible_only)
+        with stage("tracker.output"):
+            TextSerializer().dump(report, out)
+        return report
+    
+    def render_full_report(self, visible_only=False):
+        """Render the full report as text"""
+        return TextSerializer().dumps(self.full_report(visible_only))
+    
+    def full_report(self, visible_only=False):
+        """Compute the full report (cached per forecast window, stamped with the current time)"""
+        report = self._full_report(visible_only)
+        return report.replace(generated=datetime.datetime.now().replace(microsecond=0))
+    
+    @cached()
+    def _full_report(self, visible_only=False):
+        current_kp = self.estimate_current_kp()
         
-        # Expected colors
-        colors = self.predict_colors(current_kp)
-        print("🎨 EXPECTED COLORS")
-        for color in colors:
-            info = self.aurora_colors[color]
-            print(f"   {color}: {info['altitude']} altitude ({info['cause']})")
-        print()
+        with stage("tracker.forecast"):
+            forecast = self.generate_kp_forecast()
+            forecast_days = [
+                ForecastDay(from_epoch_day(forecast.days[i]), forecast.kp_at(i),
+                            ACTIVITY_LEVELS[forecast.levels[i]])
+                for i in range(len(forecast))
+            ]
         
-        # Photography tips
-        print("📸 PHOTOGRAPHY TIPS")
-        tips = self.generate_photography_tips(current_kp)
-        for tip in tips:
-            print(f"   {tip}")
-        print()
+        with stage("tracker.probabilities"):
+            if visible_only:
+                locations = self.visible_locations(current_kp)
+            else:
+                locations = self.locations
+            if self.conditions is not None:
+                self.sky_factors(list(locations))  # Sample every site in one pass
+            probabilities = [
+                LocationProbability(location, self.calculate_viewing_probability(location, current_kp))
+                for location in locations
+            ]
+        count("tracker.sites_scored", len(probabilities))
         
-        # Fun facts
-        facts = [
-            "The aurora follows Earth's magnetic field lines",
-            "Solar wind travels at 400-800 km/s to reach Earth",
-            "Aurora activity follows an 11-year solar cycle",
-            "The aurora oval is typically 3,000 km wide",
-            "Aboriginal peoples have over 100 names for aurora"
-        ]
-        print("💡 AURORA FACT OF THE DAY")
-        print(f"   {random.choice(facts)}")
-        print()
+        with stage("tracker.colors"):
+            colors = [
+                ColorInfo(color, self.aurora_colors[color]["altitude"], self.aurora_colors[color]["cause"])
+                for color in self.predict_colors(current_kp)
+            ]
+        bucket = kp_bucket(current_kp)
         
-        print("✨ Happy Aurora Hunting! ✨")
-        print("🌌" * 20)
+        return FullReport(
+            generated=None,  # Stamped by full_report()
+            kp_index=current_kp,
+            activity_level=bucket.level,
+            visibility_zone=bucket.zone,
+            forecast=forecast_days,
+            probabilities=probabilities,
+            colors=colors,
+            tips=bucket.tips,
+            fact=self.rng.choice(AURORA_FACTS),
+        )
+
+def main(argv=None):
+    """Command-line entry point"""
+    # Flags are parsed by hand: argparse and the re module it imports would
+    # cost more than everything else this command loads at startup
+    args = sys.argv[1:] if argv is None else list(argv)
+    if "-h" in args or "--help" in args:
+        print(USAGE)
+        return 0
+    
+    profile = pop_profile_flag(args)
+    seed = None
+    if "--seed" in args:
+        position = args.index("--seed")
+        try:
+            seed = int(args[position + 1])
+        except (IndexError, ValueError):
+            print(USAGE, file=sys.stderr)
+            return 2
+        del args[position:position + 2]
+    as_json = "--json" in args
+    visible_only = "--visible-only" in args
+    unknown = [arg for arg in args if arg not in ("--json", "--visible-only")]
+    if unknown:
+        print(f"aurora-tracker: unrecognized arguments: {' '.join(unknown)}", file=sys.stderr)
+        print(USAGE, file=sys.stderr)
+        return 2
+    
+    # Profiles measure the computation, never a cache hit
+    cache = None if profile else ForecastCache.from_env()
+    tracker = AuroraTracker(cache=cache, seed=seed)
+    
+    def run():
+        if as_json:
+            import json
+            print(json.dumps(tracker.full_report(visible_only).to_dict(), indent=2, ensure_ascii=False))
+        else:
+            tracker.generate_full_report(visible_only)
+    
+    if profile:
+        run_profiled(run, profile)
+    else:
+        run()
+    return 0
 
 if __name__ == "__main__":
-    tracker = AuroraTracker()
-    tracker.generate_full_report()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Aurora Watch Mode
+Keeps refreshing KP feeds and updates a live terminal table in place
+"""
+
+import argparse
+import asyncio
+import collections
+import csv
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+from aurora_ensemble import DAILY_STEP, START_KP
+from aurora_probability import viewing_probability_matrix, visibility_threshold
+from aurora_profile import METRICS, count, stage, timed
+from aurora_render import RESET
+
+DEFAULT_INTERVAL = 60
+DEFAULT_DAYS = 7
+DEFAULT_ROWS = 20
+ALERT_LINES = 5
+
+HIDE_CURSOR = '\033[?25l'
+SHOW_CURSOR = '\033[?25h'
+CLEAR_SCREEN = '\033[2J'
+CLEAR_LINE = '\033[K'
+GREEN = '\033[92m'
+CYAN = '\033[96m'
+
+
+class SimulatedFeed:
+    """
+    Stand-in for a live KP forecast feed.
+
+    Starts from the tracker's random walk and, on every refresh, revises
+    a couple of upcoming days the way real forecasts get revised, so most
+    days stay unchanged between refreshes. The window rolls forward when
+    the date changes.
+    """
+
+    def __init__(self, name="simulated", days=DEFAULT_DAYS, seed=None, revisions=2,
+                 today=datetime.date.today):
+        self.name = name
+        self.days = days
+        self.revisions = revisions
+        self.today = today
+        self._rng = random.Random(seed)
+        self._kp = {}
+
+    def fetch(self):
+        """Current forecast as a {date: kp} dict"""
+        rng = self._rng
+        start = self.today()
+        dates = [start + datetime.timedelta(days=day) for day in range(self.days)]
+        kp = {date: self._kp[date] for date in dates if date in self._kp}
+
+        if kp:
+            for date in rng.sample(dates, min(self.revisions, len(dates))):
+                if date in kp:
+                    kp[date] = round(min(9.0, max(0.0, kp[date] + rng.uniform(-0.7, 0.7))), 1)
+
+        # Extend the walk over any days that are new to the window
+        value = kp[max(kp)] if kp else rng.uniform(*START_KP)
+        for date in dates:
+            if date not in kp:
+                value = min(9.0, max(0.0, value + rng.uniform(*DAILY_STEP)))
+                kp[date] = round(value, 1)
+            else:
+                value = kp[date]
+
+        self._kp = kp
+        return dict(kp)
+
+
+class FileFeed:
+    """
+    Forecast read from a local file refreshed by another process.
+
+    Accepts CSV with date and kp_index (or kp) columns, or the JSON list
+    returned by the dashboard's /api/forecast endpoint. The file is only
+    re-read when its modification time changes.
+    """
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self._mtime = None
+        self._kp = {}
+
+    def fetch(self):
+        mtime = os.path.getmtime(self.path)
+        if mtime != self._mtime:
+            with open(self.path, encoding="utf-8") as handle:
+                if self.path.lower().endswith(".json"):
+                    rows = json.load(handle)
+                else:
+                    rows = list(csv.DictReader(handle))
+            self._kp = {
+                datetime.date.fromisoformat(str(row["date"])[:10]):
+                    float(row["kp_index"] if "kp_index" in row else row["kp"])
+                for row in rows
+            }
+            self._mtime = mtime
+        return dict(self._kp)
+
+
+class FeedState:
+    """Last forecast from one feed and the site x day probabilities derived from it"""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.kp = {}
+        self.probabilities = {}  # site name -> {date: probability}
+        self.sites = {}          # site name -> magnetic latitude used
+        self.updated = None
+        self.recomputed = 0      # cells recomputed by the last refresh
+        self.error = None
+
+    def apply(self, kp, sites):
+        """
+        Bring probabilities up to date with a new forecast and site list.
+
+        Only the forecast days whose KP changed are recomputed for existing
+        sites, new sites get every day, and removed sites and days are
+        dropped. Each group is scored with one vectorized matrix call.
+        Returns the number of cells recomputed.
+        """
+        changed_days = [date for date, value in kp.items() if self.kp.get(date) != value]
+        # Sites recorded while the forecast was empty have no scores yet
+        new_sites = [name for name, mlat in sites.items()
+                     if self.sites.get(name) != mlat or name not in self.probabilities]
+        kept_sites = [name for name in sites if name not in new_sites]
+        probabilities = self.probabilities
+
+        for name in list(probabilities):
+            if name not in sites:
+                del probabilities[name]
+        for row in probabilities.values():
+            for date in list(row):
+                if date not in kp:
+                    del row[date]
+
+        recomputed = 0
+        if changed_days and kept_sites:
+            matrix = viewing_probability_matrix([sites[name] for name in kept_sites],
+                                                [kp[date] for date in changed_days])
+            for name, values in zip(kept_sites, matrix):
+                row = probabilities[name]
+                for date, value in zip(changed_days, values):
+                    row[date] = float(value)
+            recomputed += len(kept_sites) * len(changed_days)
+        if new_sites and kp:
+            dates = list(kp)
+            matrix = viewing_probability_matrix([sites[name] for name in new_sites],
+                                                [kp[date] for date in dates])
+            for name, values in zip(new_sites, matrix):
+                probabilities[name] = {date: float(value) for date, value in zip(dates, values)}
+            recomputed += len(new_sites) * len(dates)
+
+        self.kp = dict(kp)
+        self.sites = dict(sites)
+        self.recomputed = recomputed
+        return recomputed
+
+
+class AuroraWatch:
+    """
+    Watch several KP feeds for a site catalog from one asyncio loop.
+
+    Every feed is polled by its own task that sleeps between refreshes,
+    and blocking fetches run in the default executor, so the process
+    idles between updates however many feeds and sites it watches.
+    After each refresh the screen is rebuilt as lines and only the lines
+    that changed are rewritten in place. When output is not a terminal
+    the whole table is printed again whenever anything changed, so each
+    logged row keeps its header.
+    """
+
+    def __init__(self, tracker=None, feeds=None, interval=DEFAULT_INTERVAL, out=None,
+                 max_rows=DEFAULT_ROWS, in_place=None, clock=time.time, alerts=None,
+                 show_metrics=False):
+        if tracker is None:
+            from aurora_tracker import AuroraTracker
+            tracker = AuroraTracker()
+        self.tracker = tracker
+        self.states = [FeedState(feed) for feed in (feeds or [SimulatedFeed()])]
+        self.interval = interval
+        self.out = sys.stdout if out is None else out
+        self.max_rows = max_rows
+        self.in_place = self.out.isatty() if in_place is None else in_place
+        self.clock = clock
+        # Optional AlertEngine fed with every refreshed forecast
+        self.alerts = alerts
+        self.recent_alerts = collections.deque(maxlen=ALERT_LINES)
+        self.show_metrics = show_metrics
+        self.refreshes = 0
+        self._screen = []
+
+    def site_latitudes(self):
+        return {name: site["magnetic_lat"] for name, site in self.tracker.locations.items()}
+
+    async def refresh(self, state):
+        """Fetch one feed and fold the result into its state"""
+        loop = asyncio.get_running_loop()
+        try:
+            kp = await loop.run_in_executor(None, state.feed.fetch)
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            # Unreadable file or malformed rows: keep the last good forecast
+            state.error = f"{type(error).__name__}: {error}"
+            return
+        state.error = None
+        with stage("watch.recompute"):
+            count("watch.cells_recomputed", state.apply(kp, self.site_latitudes()))
+        state.updated = self.clock()
+        if self.alerts is not None:
+            # Past nights can no longer alert; dropping them keeps the engine's state bounded
+            today = datetime.date.fromtimestamp(self.clock())
+            self.alerts.forget_before(today)
+            upcoming = {date: value for date, value in kp.items() if date >= today}
+            self.recent_alerts.extend(self.alerts.update_forecast(upcoming))
+        self.refreshes += 1
+
+    async def _poll(self, state):
+        while True:
+            await self.refresh(state)
+            self.redraw()
+            await asyncio.sleep(self.interval)
+
+    async def run(self, duration=None):
+        """Watch until duration seconds have passed (forever when None)"""
+        if self.in_place:
+            self.out.write(HIDE_CURSOR + CLEAR_SCREEN)
+        tasks = [asyncio.ensure_future(self._poll(state)) for state in self.states]
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.in_place:
+                self.out.write(f"{RESET}\033[{len(self._screen) + 1};1H{SHOW_CURSOR}")
+                self.out.flush()
+
+    def render_lines(self):
+        """The whole screen as a list of lines"""
+        lines = [f"{CYAN}🔭 AURORA WATCH - {len(self.site_latitudes())} sites, "
+                 f"refresh every {self.interval:g}s{RESET}"]
+        for state in self.states:
+            lines.append("")
+            lines.extend(self._render_feed(state))
+        if self.recent_alerts:
+            lines.append("")
+            lines.extend(str(alert) for alert in self.recent_alerts)
+        if self.show_metrics:
+            lines.append("")
+            lines.extend(METRICS.format_stages())
+        return lines
+
+    def _render_feed(self, state):
+        stamp = "never" if state.updated is None else time.strftime(
+            "%H:%M:%S", time.localtime(state.updated))
+        lines = [f"📡 {state.feed.name} - updated {stamp}, {state.recomputed} cells recomputed"]
+        if state.error:
+            lines.append(f"   ⚠️  {state.error}")
+        if not state.kp:
+            return lines
+
+        dates = sorted(state.kp)
+        lines.append(f"   {'Date':<22}" + "".join(f"{date.strftime('%m-%d'):>7}" for date in dates))
+        lines.append(f"   {'KP':<22}" + "".join(f"{state.kp[date]:>7.1f}" for date in dates))
+
+        # Most promising sites first; the rest are summarized
+        ranked = sorted(state.probabilities.items(), key=lambda item: -max(item[1].values()))
+        for name, row in ranked[:self.max_rows]:
+            cells = []
+            for date in dates:
+                probability = row[date]
+                text = f"{probability:>6.0f}%"
+                if state.sites[name] >= visibility_threshold(state.kp[date]):
+                    text = f"{GREEN}{text}{RESET}"
+                cells.append(text)
+            lines.append(f"   {name[:22]:<22}" + "".join(cells))
+        if len(ranked) > self.max_rows:
+            lines.append(f"   ... and {len(ranked) - self.max_rows} more sites")
+        return lines
+
+    @timed("watch.redraw")
+    def redraw(self):
+        """Rewrite only the screen lines that changed since the last draw"""
+        lines = self.render_lines()
+        if not self.in_place:
+            # Plain output (pipes, logs): print the whole table when it changed
+            if lines != self._screen:
+                self.out.write("\n".join(lines) + "\n\n")
+        else:
+            parts = []
+            for index in range(max(len(lines), len(self._screen))):
+                line = lines[index] if index < len(lines) else ""
+                if index < len(self._screen) and self._screen[index] == line:
+                    continue
+                parts.append(f"\033[{index + 1};1H{line}{CLEAR_LINE}")
+            self.out.write("".join(parts))
+        self.out.flush()
+        self._screen = lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch KP feeds and keep a live probability table")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Seconds between feed refreshes (default: %(default)s)")
+    parser.add_argument("--feed", action="append", default=[],
+                        help="Forecast CSV/JSON file to watch (repeatable; default: simulated feed)")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Days in the simulated feed")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Sites shown per feed")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--alert", action="append", default=[], metavar="SITE=PCT[@START..END]",
+                        help="Alert subscription (repeatable), shown below the table")
+    parser.add_argument("--alert-log", help="Append alerts to this JSON-lines file")
+    parser.add_argument("--metrics", action="store_true", help="Show stage timers below the table")
+    args = parser.parse_args(argv)
+
+    feeds = [FileFeed(path) for path in args.feed] or [SimulatedFeed(days=args.days, seed=args.seed)]
+    watch = AuroraWatch(feeds=feeds, interval=args.interval, max_rows=args.rows,
+                        show_metrics=args.metrics)
+    if args.alert:
+        from aurora_alerts import AlertEngine, FileSink, parse_rule
+        engine = AlertEngine([FileSink(args.alert_log)] if args.alert_log else [],
+                             watch.tracker.locations)
+        try:
+            for text in args.alert:
+                engine.subscribe(*parse_rule(text))
+        except (KeyError, ValueError) as error:
+            parser.error(str(error.args[0]))
+        watch.alerts = engine
+    try:
+        asyncio.run(watch.run(args.duration))
+    except KeyboardInterrupt:
+        pass
+    print("✨ Watch stopped ✨")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Shared pytest setup: the tools are flat modules in src/"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
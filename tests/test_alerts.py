@@ -0,0 +1,92 @@
+"""AlertEngine matches exactly what a brute-force scan of every rule finds"""
+
+import datetime
+import random
+
+from aurora_alerts import AlertEngine, firing_kp
+from aurora_probability import viewing_probability
+
+DAY = datetime.date(2024, 3, 1)
+
+
+class BruteForce:
+    """Check every rule on every update"""
+
+    def __init__(self):
+        self.rules = []
+        self.peaks = {}
+        self.delivered = set()
+
+    def subscribe(self, rule_id, magnetic_lat, probability, start, end):
+        self.rules.append((rule_id, magnetic_lat, probability, start, end))
+        return {key for date, kp in self.peaks.items() for key in self._check(date, kp)}
+
+    def update(self, date, kp):
+        self.peaks[date] = max(kp, self.peaks.get(date, kp))
+        return self._check(date, kp)
+
+    def _check(self, date, kp):
+        fired = set()
+        for rule_id, magnetic_lat, probability, start, end in self.rules:
+            key = (rule_id, date)
+            if key in self.delivered or not (start is None or start <= date) or not (end is None or date <= end):
+                continue
+            if viewing_probability(magnetic_lat, kp) >= probability:
+                self.delivered.add(key)
+                fired.add(key)
+        return fired
+
+
+def test_rounding_at_the_previous_peak():
+    # viewing_probability(54.8, 5.8) is 72.99999..., so the rule fires only above 5.8
+    engine = AlertEngine(sinks=[])
+    engine.subscribe("Minneapolis", 73, magnetic_lat=54.8)
+    assert engine.update(DAY, 5.8) == []
+    assert [alert.kp_index for alert in engine.update(DAY, 6.0)] == [6.0]
+
+
+class ListSink:
+    def __init__(self):
+        self.alerts = []
+
+    def send(self, alert):
+        self.alerts.append(alert)
+
+
+def test_matches_brute_force():
+    rng = random.Random(17)
+    sink = ListSink()
+    engine, brute = AlertEngine(sinks=[sink]), BruteForce()
+    dates = [DAY + datetime.timedelta(days=offset) for offset in range(40)]
+
+    def delivered(action):
+        del sink.alerts[:]
+        action()
+        return {(alert.rule_id, alert.date) for alert in sink.alerts}
+
+    def subscribe():
+        magnetic_lat = rng.choice([54.8, 58.2, 61.8, 65.1]) + rng.choice([0, 0, 0.1, 0.3])
+        probability = rng.choice([1, 5, 20, 21, 50, 51, 60, 73, 80, 95, 96])
+        start = rng.choice([None, None, dates[5]])
+        end = rng.choice([None, None, dates[30]])
+        rule_ids = []
+        keys = delivered(lambda: rule_ids.append(
+            engine.subscribe(f"site-{len(brute.rules)}", probability, start, end, magnetic_lat)))
+        assert keys == brute.subscribe(rule_ids[0], magnetic_lat, probability, start, end)
+
+    for _ in range(200):
+        subscribe()
+    for step in range(2000):
+        date = rng.choice(dates)
+        if rng.random() < 0.5:
+            kp = rng.randrange(0, 91) / 10
+        else:  # Land right on some rule's fire KP, where rounding matters
+            rule = rng.choice(brute.rules)
+            fire_kp = firing_kp(rule[1], rule[2])
+            if abs(fire_kp) == float("inf"):
+                continue
+            kp = min(9.0, max(0.0, round(fire_kp, 1) + rng.choice([-1, 0, 0, 1]) * 0.1))
+        assert delivered(lambda: engine.update(date, kp)) == brute.update(date, kp)
+        if step % 50 == 0:
+            subscribe()
+    assert brute.delivered
@@ -0,0 +1,33 @@
+"""aurora_art command line and animation sizing"""
+
+import io
+
+import aurora_art
+from aurora_animate import AuroraAnimation
+
+
+class TtyStream(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def test_animation_sizes_from_its_own_stream(monkeypatch):
+    monkeypatch.setattr("sys.stdout", TtyStream())  # Not where frames go
+    animation = AuroraAnimation(out=io.StringIO())
+    assert (animation.width, animation.height) == (80, 23)
+
+
+def test_animate_flag(monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(aurora_art.AuroraArt, "animate_aurora",
+                        lambda self, **kwargs: calls.append(kwargs) or
+                        {"frames": 3, "dropped": 0, "fps": 12.0, "busy_ratio": 0.1})
+    assert aurora_art.main(["--animate", "--fps=12", "--duration", "0.25"]) == 0
+    assert calls == [{"duration": 0.25, "fps": 12.0}]
+    assert "3 frames" in capsys.readouterr().out
+
+
+def test_bad_options():
+    assert aurora_art.main(["--fps", "10"]) == 2
+    assert aurora_art.main(["--animate", "--fps", "-1"]) == 2
+    assert aurora_art.main(["--sparkle"]) == 2
@@ -0,0 +1,50 @@
+"""Batch site reports: worker count does not change the output, sky layers apply"""
+
+import random
+
+from aurora_batch import BatchReporter, build_reports
+from aurora_raster import SkyConditions, write_raster
+from aurora_tracker import AuroraTracker
+
+
+def random_sites(count, seed=2):
+    rng = random.Random(seed)
+    return [(f"site-{i}", rng.uniform(40, 80), rng.uniform(-180, 180)) for i in range(count)]
+
+
+def run(workers, sites, tracker=None):
+    reporter = BatchReporter(tracker or AuroraTracker(seed=4), workers=workers, chunk_size=100)
+    return [report.to_dict() for report in reporter.run(sites, days=5)]
+
+
+def test_parallel_reports_match_in_process_in_order():
+    sites = random_sites(700)
+    single = run(1, sites)
+    assert [report["name"] for report in single] == [site[0] for site in sites]
+    assert run(2, sites) == single
+
+
+def test_build_reports_derives_magnetic_latitude():
+    site, = build_reports([("Oulu", 65.0, 25.5, None)], ("2024-05-10",), (5.0,))
+    tracker = AuroraTracker()
+    tracker.add_location("Oulu", 65.0, 25.5)
+    assert site.magnetic_lat == tracker.locations["Oulu"]["magnetic_lat"]
+    assert site.probabilities == (round(tracker.calculate_viewing_probability("Oulu", 5.0), 1),)
+
+
+def test_sky_layers_scale_batch_probabilities(tmp_path):
+    cloud = str(tmp_path / "cloud.raster")
+    write_raster(cloud, [[30.0] * 4, [80.0] * 4])  # Northern half 30% cloud, southern 80%
+    conditions = SkyConditions(cloud)
+    tracker = AuroraTracker(seed=4, conditions=conditions)
+    reporter = BatchReporter(tracker, workers=1)
+    for report in reporter.run(reporter.catalog_sites(), days=5):
+        expected = tuple(round(tracker.calculate_viewing_probability(report.name, kp), 1)
+                         for kp in report.kp_values)
+        assert report.probabilities == expected
+
+    sites = random_sites(300)
+    shaded = run(1, sites, AuroraTracker(seed=4, conditions=conditions))
+    assert run(2, sites, AuroraTracker(seed=4, conditions=conditions)) == shaded
+    assert shaded != run(1, sites)
+    conditions.close()
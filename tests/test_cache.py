@@ -0,0 +1,70 @@
+"""Cached and uncached runs give the same output"""
+
+import datetime
+
+from aurora_cache import ForecastCache
+from aurora_tracker import AuroraTracker
+
+
+def run(tracker):
+    forecast = [(day["date"], day["kp_index"]) for day in tracker.generate_kp_forecast(3)]
+    report = tracker.full_report()
+    return (forecast, report.kp_index, report.fact, [color.name for color in report.colors],
+            [(day.date, day.kp_index) for day in report.forecast])
+
+
+def test_seeded_output_does_not_depend_on_cache_state(tmp_path):
+    expected = run(AuroraTracker(seed=7))
+    path = str(tmp_path / "cache.sqlite3")
+    memory = ForecastCache(path)
+    for _ in range(2):  # Cold, then warm from memory
+        assert run(AuroraTracker(cache=memory, seed=7)) == expected
+    disk = ForecastCache(path)  # Warm from disk only
+    assert run(AuroraTracker(cache=disk, seed=7)) == expected
+    assert disk.hits and not disk.misses
+
+    partial = ForecastCache()  # Only the forecast is warm
+    AuroraTracker(cache=partial, seed=7).generate_kp_forecast(3)
+    assert run(AuroraTracker(cache=partial, seed=7)) == expected
+
+
+def test_generated_is_fresh_on_a_hit():
+    cache = ForecastCache()
+    tracker = AuroraTracker(cache=cache, seed=1)
+    first = tracker.full_report()
+    second = AuroraTracker(cache=cache, seed=1).full_report()
+    assert cache.hits
+    assert first.generated is not None and second.generated >= first.generated
+    assert second is not first
+
+
+def test_key_rolls_over_with_the_local_date():
+    clock = [datetime.datetime(2024, 3, 1, 23, 30).timestamp()]
+    cache = ForecastCache(clock=lambda: clock[0])
+    tracker = AuroraTracker(cache=cache)
+    tracker.generate_kp_forecast(2)
+    clock[0] += 3600  # Past local midnight, possibly inside the same 3-hour window
+    tracker.generate_kp_forecast(2)
+    assert cache.misses == 2
+
+
+def test_disk_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("AURORA_CACHE_DIR", raising=False)
+    assert ForecastCache.from_env() is None
+    monkeypatch.setenv("AURORA_CACHE_DIR", str(tmp_path))
+    cache = ForecastCache.from_env()
+    assert cache.path.startswith(str(tmp_path))
+    cache.close()
+
+
+def test_profile_bypasses_the_cache(monkeypatch, tmp_path):
+    import aurora_tracker
+    monkeypatch.setenv("AURORA_CACHE_DIR", str(tmp_path))
+    seen = []
+    monkeypatch.setattr(aurora_tracker, "run_profiled", lambda run, prefix: seen.append(prefix))
+    created = []
+    original = aurora_tracker.AuroraTracker.__init__
+    monkeypatch.setattr(aurora_tracker.AuroraTracker, "__init__",
+                        lambda self, **kwargs: created.append(kwargs) or original(self, **kwargs))
+    assert aurora_tracker.main(["--profile=run"]) == 0
+    assert seen == ["run"] and created[0]["cache"] is None
@@ -0,0 +1,90 @@
+"""Threshold tables give the same classes as the if/elif ladders they replaced"""
+
+import math
+
+import pytest
+
+import aurora_numpy
+from aurora_classify import (ACTIVITY_TABLE, BAR_COLOR_TABLE, COLOR_RULES, KP_BUCKETS,
+                             LINE_COLOR_TABLE, REPORT_VISIBILITY_TABLE, VISIBILITY_TABLE,
+                             activity_code, activity_codes, activity_level, kp_bucket,
+                             visibility_zone)
+from aurora_tracker import AuroraTracker
+
+# Every cut of every table, probed just below, at and just above
+CUTS = (1, 2, 3, 4, 5, 6, 7, 8)
+KP_VALUES = sorted({0.0, 9.0, *(value for cut in CUTS for value in (
+    cut - 0.1, math.nextafter(cut, -math.inf), float(cut), math.nextafter(cut, math.inf), cut + 0.1))})
+
+
+def ladder(kp, bounds, labels, inclusive=False):
+    """The original `kp < bound` (or `kp <= bound`) if/elif chain"""
+    for bound, label in zip(bounds, labels):
+        if (kp <= bound) if inclusive else (kp < bound):
+            return label
+    return labels[-1]
+
+
+LEVELS = ("Quiet", "Unsettled", "Active", "Minor Storm", "Moderate Storm", "Strong Storm",
+          "Severe Storm", "Extreme Storm")
+ZONES = ("Arctic Circle only", "Northern Canada, Alaska", "Northern border states",
+         "Northern US, southern Canada", "Most of northern US", "Central US states",
+         "Southern US possible", "Visible to southern latitudes")
+TIPS = {0: 4, 3: 7, 5: 10}  # Tip count from each KP on
+
+
+@pytest.mark.parametrize("kp", KP_VALUES)
+def test_activity_level_and_zone(kp):
+    bounds = (2, 3, 4, 5, 6, 7, 8)
+    assert activity_level(kp) == ACTIVITY_TABLE.label(kp) == ladder(kp, bounds, LEVELS)
+    assert visibility_zone(kp) == VISIBILITY_TABLE.label(kp) == ladder(kp, bounds, ZONES)
+    tracker = AuroraTracker()
+    assert tracker.get_activity_level(kp) == activity_level(kp)
+    assert tracker.get_visibility_zone(kp) == visibility_zone(kp)
+
+
+@pytest.mark.parametrize("kp", KP_VALUES)
+def test_chart_colors(kp):
+    assert BAR_COLOR_TABLE.label(kp) == ladder(kp, (2, 4, 6), ("green", "yellow", "red", "purple"))
+    assert LINE_COLOR_TABLE.label(kp) == ladder(kp, (3, 5), ("green", "yellow", "red"))
+
+
+@pytest.mark.parametrize("kp", KP_VALUES)
+def test_report_visibility_is_inclusive(kp):
+    labels = REPORT_VISIBILITY_TABLE.labels
+    assert REPORT_VISIBILITY_TABLE.label(kp) == ladder(kp, (2, 4, 6), labels, inclusive=True)
+
+
+@pytest.mark.parametrize("kp", KP_VALUES)
+def test_shared_buckets(kp):
+    bucket = kp_bucket(kp)
+    assert bucket is KP_BUCKETS[activity_code(kp)]
+    assert bucket.level == activity_level(kp) and bucket.zone == visibility_zone(kp)
+    expected_tips = max(count for min_kp, count in TIPS.items() if kp >= min_kp)
+    assert len(bucket.tips) == expected_tips
+    assert AuroraTracker().generate_photography_tips(kp) is bucket.tips
+
+
+@pytest.mark.parametrize("kp", KP_VALUES)
+def test_certain_colors(kp):
+    tracker = AuroraTracker(seed=0)
+    certain = [color for color, min_kp, chance in COLOR_RULES if chance >= 1 and kp >= min_kp]
+    assert certain == [color for color in ("Green", "Red") if kp >= {"Green": 1, "Red": 4}[color]]
+    predicted = tracker.predict_colors(kp)
+    assert [color for color in predicted if color in ("Green", "Red")] == certain
+    possible = {color for color, min_kp, _ in COLOR_RULES if kp >= min_kp}
+    assert set(predicted) <= possible
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_vectorized_codes_match(use_numpy):
+    if use_numpy and aurora_numpy.numpy_for() is None:
+        pytest.skip("numpy is not installed")
+    previous = aurora_numpy.default()
+    aurora_numpy.set_default(use_numpy)
+    try:
+        for table in (ACTIVITY_TABLE, BAR_COLOR_TABLE, LINE_COLOR_TABLE, REPORT_VISIBILITY_TABLE):
+            assert table.labels_for(KP_VALUES) == [table.label(kp) for kp in KP_VALUES]
+        assert list(activity_codes(KP_VALUES)) == [activity_code(kp) for kp in KP_VALUES]
+    finally:
+        aurora_numpy.set_default(previous)
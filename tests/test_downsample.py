@@ -0,0 +1,73 @@
+"""Downsampling keeps endpoints and peaks and never exceeds the point budget"""
+
+import random
+
+import pytest
+
+from aurora_downsample import (downsample_indices, downsample_series, lttb, max_buckets,
+                               minmax_buckets)
+from aurora_series import KpSeries
+
+
+def series_values(count, seed=3):
+    rng = random.Random(seed)
+    values = [round(rng.uniform(0, 4), 1) for _ in range(count)]
+    values[count // 3] = 9.0   # Storm peak
+    values[2 * count // 3] = -1.0  # Unrealistic trough, easy to spot
+    return values
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax", "max"])
+@pytest.mark.parametrize("count, points", [(1000, 50), (365, 80), (101, 7), (40, 39)])
+def test_indices_stay_within_budget_and_ordered(method, count, points):
+    indices = downsample_indices(series_values(count), points, method)
+    assert 0 < len(indices) <= points
+    assert indices == sorted(set(indices))
+    assert all(0 <= index < count for index in indices)
+
+
+@pytest.mark.parametrize("count, points", [(1000, 50), (365, 80), (101, 7)])
+def test_lttb_keeps_endpoints_and_peak(count, points):
+    values = series_values(count)
+    indices = lttb(values, points)
+    assert len(indices) == points
+    assert indices[0] == 0 and indices[-1] == count - 1
+    assert values.index(9.0) in indices
+
+
+def test_minmax_keeps_both_extremes():
+    values = series_values(1000)
+    indices = minmax_buckets(values, 40)
+    assert values.index(9.0) in indices and values.index(-1.0) in indices
+
+
+def test_max_buckets_keeps_each_bucket_peak():
+    values = series_values(1000)
+    indices = max_buckets(values, 25)
+    assert len(indices) == 25 and values.index(9.0) in indices
+    for bucket, index in enumerate(indices):
+        start, stop = bucket * 1000 // 25, (bucket + 1) * 1000 // 25
+        assert values[index] == max(values[start:stop])
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax", "max"])
+def test_short_series_are_unchanged(method):
+    values = [1.0, 5.0, 2.0]
+    assert downsample_indices(values, 10, method) == [0, 1, 2]
+
+
+def test_small_lttb_budgets():
+    assert lttb(series_values(50), 2) == [0, 49]
+    assert lttb(series_values(50), 1) == [0]
+    assert lttb(series_values(50), 0) == []
+
+
+def test_downsample_series_takes_rows():
+    data = KpSeries()
+    for day, kp in enumerate(series_values(200)):
+        data.append(day, kp)
+    reduced = downsample_series(data, 20)
+    assert len(reduced) == 20 and 9.0 in reduced.kp_values()
+    assert downsample_series(data, 500) is data
+    with pytest.raises(ValueError, match="Unknown downsampling method"):
+        downsample_indices([1.0] * 50, 10, "mean")
@@ -0,0 +1,84 @@
+"""Ensemble forecasts: seeded reproducibility, backend agreement and color odds"""
+
+import datetime
+
+import pytest
+
+from aurora_classify import COLOR_RULES
+from aurora_ensemble import KP_MAX, KP_MIN, ensemble_forecast, simulate_paths, summarize_paths
+from aurora_numpy import numpy_for
+from aurora_tracker import AuroraTracker
+
+BACKENDS = [False] + ([True] if numpy_for() is not None else [])
+needs_numpy = pytest.mark.skipif(numpy_for() is None, reason="numpy is not installed")
+START = datetime.date(2024, 5, 10)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_same_seed_same_ensemble(use_numpy):
+    def run(seed):
+        return ensemble_forecast(5, 500, seed, start_date=START, use_numpy=use_numpy).to_dict()
+
+    assert run(11) == run(11)
+    assert run(11) != run(12)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_paths_stay_on_the_kp_scale(use_numpy):
+    paths = simulate_paths(300, 10, seed=3, use_numpy=use_numpy)
+    assert len(paths) == 10 and all(len(day) == 300 for day in paths)
+    assert all(KP_MIN <= value <= KP_MAX for day in paths for value in day)
+
+
+@needs_numpy
+def test_summaries_agree_on_the_same_paths():
+    np = numpy_for(True)
+    paths = simulate_paths(1001, 6, seed=5, use_numpy=True)
+    vectorized = summarize_paths(paths)
+    python = summarize_paths(paths.tolist())
+    for (mean, levels, exceedance, colors), expected in zip(python, vectorized):
+        assert mean == pytest.approx(expected[0], abs=1e-9)
+        assert np.allclose(levels, expected[1], atol=1e-9)
+        assert exceedance == expected[2] and np.allclose(colors, expected[3], atol=1e-12)
+
+
+@needs_numpy
+def test_backends_agree_statistically():
+    python = ensemble_forecast(7, 20000, seed=1, start_date=START, use_numpy=False)
+    vectorized = ensemble_forecast(7, 20000, seed=1, start_date=START, use_numpy=True)
+    for a, b in zip(python.days, vectorized.days):
+        assert a.mean == pytest.approx(b.mean, abs=0.05)
+        assert a.quantiles == pytest.approx(b.quantiles, abs=0.1)
+        assert a.exceedance == pytest.approx(b.exceedance, abs=0.02)
+        assert a.colors == pytest.approx(b.colors, abs=0.02)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_color_odds_follow_color_rules(use_numpy):
+    kp_values = [0.5, 1.0, 3.0, 3.9, 4.0, 6.0, 9.0, 2.0]
+    paths = [kp_values]
+    if use_numpy:
+        paths = numpy_for(True).array(paths)
+    (_, _, _, colors), = summarize_paths(paths)
+    expected = [sum(kp >= min_kp for kp in kp_values) / len(kp_values) * chance
+                for _, min_kp, chance in COLOR_RULES]
+    assert colors == pytest.approx(expected)
+
+    # The same odds as predict_colors drawn many times
+    tracker = AuroraTracker(seed=2)
+    draws = 4000
+    seen = dict.fromkeys((rule[0] for rule in COLOR_RULES), 0)
+    for _ in range(draws):
+        for kp in kp_values:
+            for color in tracker.predict_colors(kp):
+                seen[color] += 1
+    observed = [seen[rule[0]] / (draws * len(kp_values)) for rule in COLOR_RULES]
+    assert observed == pytest.approx(expected, abs=0.01)
+
+
+def test_report_lines_up_with_color_rules():
+    report = ensemble_forecast(3, 200, seed=4, start_date=START, use_numpy=False)
+    assert report.color_names == [rule[0] for rule in COLOR_RULES]
+    assert [day.date for day in report.days] == [START + datetime.timedelta(days=d) for d in range(3)]
+    assert report.expected_colors == pytest.approx(
+        [sum(day.colors[i] for day in report.days) / 3 for i in range(len(COLOR_RULES))])
@@ -0,0 +1,49 @@
+"""SiteIndex add/extend/remove keep the sorted and grid indexes consistent"""
+
+import random
+
+from aurora_geomag import SiteIndex, magnetic_latitude
+
+
+def check_consistent(index):
+    assert sorted(index._mlat_names) == sorted(index.sites)
+    assert index._mlat_keys == sorted(index._mlat_keys)
+    for key, name in zip(index._mlat_keys, index._mlat_names):
+        assert index.sites[name]["magnetic_lat"] == key
+    gridded = sorted(name for names in index._grid.values() for name in names)
+    assert gridded == sorted(index.sites)
+
+
+def test_extend_replaces_existing_names_like_add():
+    index = SiteIndex()
+    index.add("a", 60.0, 10.0)
+    index.extend([("a", 45.0, -100.0), ("b", 50.0, 20.0)])
+    assert index.sites["a"]["lat"] == 45.0
+    assert index.sites["a"]["magnetic_lat"] == magnetic_latitude(45.0, -100.0)
+    check_consistent(index)
+
+
+def test_extend_duplicates_in_one_batch_keep_the_last():
+    index = SiteIndex()
+    index.extend([("a", 40.0, 0.0), ("b", 50.0, 0.0), ("a", 70.0, 5.0)])
+    assert len(index) == 2
+    assert index.sites["a"]["lat"] == 70.0
+    check_consistent(index)
+    index.remove("a")
+    check_consistent(index)
+
+
+def test_random_operations_stay_consistent():
+    rng = random.Random(7)
+    index = SiteIndex()
+    for _ in range(50):
+        batch = [(f"s{rng.randrange(40)}", rng.uniform(30, 80), rng.uniform(-180, 180))
+                 for _ in range(rng.randrange(1, 10))]
+        if rng.random() < 0.5:
+            index.extend(batch)
+        else:
+            for site in batch:
+                index.add(*site)
+        if index.sites and rng.random() < 0.3:
+            index.remove(rng.choice(sorted(index.sites)))
+        check_consistent(index)
@@ -0,0 +1,41 @@
+"""Bar chart labels follow the dates of the series"""
+
+import datetime
+import io
+
+from aurora_graph import AuroraGraph
+from aurora_series import KpSeries
+
+
+def series(start, count, step=1):
+    data = KpSeries()
+    for i in range(count):
+        data.append(start + datetime.timedelta(days=i * step), 3.0)
+    return data
+
+
+def chart_title(data, **kwargs):
+    out = io.StringIO()
+    AuroraGraph().create_bar_chart(data, out=out, **kwargs)
+    return out.getvalue().splitlines()[0]
+
+
+def test_past_days_end_today():
+    today = datetime.date.today()
+    assert "PAST 14 DAYS" in chart_title(series(today - datetime.timedelta(days=13), 14))
+
+
+def test_forecast_and_sparse_series_show_their_range():
+    start = datetime.date.today() + datetime.timedelta(days=1)
+    title = chart_title(series(start, 3))
+    assert f"{start.isoformat()} TO" in title and "(3 DAYS)" in title
+    weekly = series(datetime.date(2020, 1, 1), 5, step=7)
+    assert "2020-01-01 TO 2020-01-29 (29 DAYS)" in chart_title(weekly)
+
+
+def test_downsampled_bucket_width_in_days():
+    data = series(datetime.date(2020, 1, 1), 120, step=2)
+    out = io.StringIO()
+    report = AuroraGraph().create_bar_chart(data, out=out, max_rows=60)
+    assert report.span_days() == 239
+    assert "peak day of every ~4 days" in out.getvalue()
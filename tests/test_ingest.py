@@ -0,0 +1,86 @@
+"""Archive parsers and write/read round trips"""
+
+import datetime
+import os
+
+import pytest
+
+from aurora_ingest import KpArchive, epoch_hours, ingest, parse_csv, parse_fixed_width, write_archive
+
+GFZ = """\
+# YYY MM DD hh.h hh._m days days_m Kp ap D
+1932 01 01 00.0 01.50 0.0 0.0625 3.000 15 1
+1932 01 01 03.0 04.50 0.125 0.1875 2.667 12 1
+1932 01 01 06.0 07.50 0.25 0.3125 -1.000 -1 0
+short line
+
+1932 01 02 21.0 22.50 1.875 1.9375 5.333 56 1
+"""
+
+
+def test_parse_fixed_width():
+    day = epoch_hours(datetime.date(1932, 1, 1))
+    assert list(parse_fixed_width(GFZ.splitlines())) == [
+        (day, 3.0), (day + 3, 2.667), (day + 24 + 21, 5.333)]
+
+
+def test_parse_csv_columns():
+    text = """# comment
+Date,Hour,KP
+2024-05-10,21,8.667
+2024-05-11T00:00:00Z,0,9.0
+2024-05-11,3,
+2024-05-11,6,-1
+"""
+    day = epoch_hours(datetime.date(2024, 5, 10))
+    assert list(parse_csv(text.splitlines())) == [(day + 21, 8.667), (day + 24, 9.0)]
+    with pytest.raises(ValueError, match="time and a kp column"):
+        list(parse_csv(["when,value", "2024-01-01,3"]))
+
+
+def test_round_trip(tmp_path):
+    records = [(epoch_hours(datetime.date(2003, 10, 28)) + 3 * i, (i % 28) / 3) for i in range(1000)]
+    path = str(tmp_path / "kp.bin")
+    assert write_archive(iter(records), path, chunk_records=64) == len(records)
+    with KpArchive(path) as archive:
+        assert list(archive.hours) == [hour for hour, _ in records]
+        assert list(archive.kp) == pytest.approx([kp for _, kp in records], abs=1e-6)
+        assert archive.first_time() == datetime.datetime(2003, 10, 28)
+        series = archive.to_series(datetime.date(2003, 10, 29), datetime.date(2003, 10, 31))
+        assert len(series) == 2
+    assert os.listdir(tmp_path) == ["kp.bin"]
+
+
+def test_failed_write_keeps_the_old_archive(tmp_path):
+    path = str(tmp_path / "kp.bin")
+    write_archive([(10, 1.0), (13, 2.0)], path)
+    with pytest.raises(ValueError, match="sorted by time"):
+        write_archive([(20, 1.0), (30, 2.0), (25, 3.0)], path, chunk_records=1)
+    assert os.listdir(tmp_path) == ["kp.bin"]
+    with KpArchive(path) as archive:
+        assert list(archive.hours) == [10, 13]
+
+
+def test_ingest_merges_overlapping_sources(tmp_path):
+    first = tmp_path / "a.txt"
+    first.write_text(GFZ)
+    second = tmp_path / "b.csv"
+    second.write_text("datetime,kp\n1932-01-02T21:00:00,4.0\n1932-01-03T00:00:00,1.0\n")
+    path = str(tmp_path / "kp.bin")
+    assert ingest([str(first), str(second)], path) == 4
+    with KpArchive(path) as archive:
+        assert archive.kp[-2] == pytest.approx(5.333)  # First copy of the overlap wins
+
+
+def test_parse_csv_converts_offsets_to_utc():
+    text = """datetime,kp
+2024-05-10T21:00:00Z,1
+2024-05-10T21:00:00+00:00,2
+2024-05-10T23:00:00+02:00,3
+2024-05-10T18:00:00-03:00,4
+2024-05-11T02:30:00+05:30,5
+2024-05-10T21:00:00,6
+"""
+    hour = epoch_hours(datetime.datetime(2024, 5, 10, 21))
+    assert list(parse_csv(text.splitlines())) == [(hour, float(kp)) for kp in range(1, 7)]
+    assert list(parse_csv(["time,kp", "2024-05-11T00:00:00+03:00,7"])) == [(hour, 7.0)]
@@ -0,0 +1,57 @@
+"""numpy is optional and imported only when a numpy code path runs"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import aurora_cli
+import aurora_numpy
+from aurora_numpy import numpy_for
+from aurora_probability import viewing_probability_matrix
+
+HEAVY_MODULES = ["aurora_" + name for name in (
+    "server", "batch", "ingest", "raster", "oval", "planner", "ensemble", "watch", "tracker")]
+
+
+@pytest.fixture
+def restore_default():
+    saved = aurora_numpy.default()
+    yield
+    aurora_numpy.set_default(saved)
+
+
+def test_importing_modules_does_not_import_numpy():
+    code = f"import sys; import {', '.join(HEAVY_MODULES)}; print('numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(aurora_numpy.__file__),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_default_switch(restore_default):
+    aurora_numpy.set_default(False)
+    assert numpy_for() is None
+    matrix = viewing_probability_matrix([60.0, 50.0], [3.0, 7.0])
+    assert isinstance(matrix, list)
+    assert numpy_for(False) is None
+
+
+def test_light_commands_turn_numpy_off(restore_default, monkeypatch):
+    monkeypatch.delenv(aurora_cli.NUMPY_ENV, raising=False)
+    aurora_numpy.set_default(True)
+    aurora_cli.load("info")
+    assert not aurora_numpy.default()
+    assert sys.modules.get("numpy", False) is not None  # Never poisoned
+
+
+def test_required_numpy(restore_default):
+    try:
+        import numpy
+    except ImportError:
+        with pytest.raises(RuntimeError, match="numpy is required"):
+            numpy_for(True)
+    else:
+        assert numpy_for(True) is numpy
+        aurora_numpy.set_default(False)
+        assert numpy_for(True) is numpy  # An explicit request wins over the default
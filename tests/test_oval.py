@@ -0,0 +1,24 @@
+"""Oval grids agree between the numpy and pure-Python paths at any resolution"""
+
+import pytest
+
+from aurora_numpy import numpy_for
+from aurora_oval import MAX_LEVEL, OvalModel
+
+
+@pytest.mark.parametrize("resolution", [2.0, 0.5, 0.25])
+def test_python_grid_covers_the_oval(resolution):
+    levels = OvalModel(resolution, use_numpy=False).grid(0).levels
+    assert len(levels) == int(180 / resolution) * int(360 / resolution)
+    assert max(levels) > 0
+
+
+@pytest.mark.skipif(numpy_for() is None, reason="numpy is not installed")
+@pytest.mark.parametrize("resolution", [0.5, 0.25])
+def test_python_grid_matches_numpy(resolution):
+    for kp in (0, 3, 9):
+        python = OvalModel(resolution, use_numpy=False).grid(kp).levels
+        vectorized = OvalModel(resolution, use_numpy=True).grid(kp).levels
+        # Python quantizes magnetic latitude to resolution steps
+        assert max(abs(a - b) for a, b in zip(python, vectorized)) <= MAX_LEVEL * 0.04
+        assert abs(max(python) - max(vectorized)) <= 1
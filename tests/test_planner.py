@@ -0,0 +1,82 @@
+"""Planner ephemeris, night tables, window choice and the CLI's shared forecast"""
+
+import datetime
+
+import pytest
+
+from aurora_numpy import numpy_for
+from aurora_planner import J2000, ObservingPlanner, best_run, ephemeris, main
+from aurora_series import to_epoch_day
+from aurora_tracker import AuroraTracker
+
+PATHS = [False] + ([True] if numpy_for() is not None else [])
+
+
+def test_site_night_uses_the_listed_forecast(monkeypatch, capsys):
+    calls = []
+    generate = AuroraTracker.generate_kp_forecast
+
+    def counting(self, days=7):
+        calls.append(days)
+        return generate(self, days)
+
+    monkeypatch.setattr(AuroraTracker, "generate_kp_forecast", counting)
+    assert main(["--days", "5", "--top", "50", "--seed", "3", "--site", "Fairbanks, Alaska"]) == 0
+    assert calls == [5]
+
+    listing, _, detail = capsys.readouterr().out.partition("\n\n")
+    best = [line for line in listing.splitlines() if "Fairbanks" in line]
+    night = detail.splitlines()[0].rsplit(" ", 1)[-1]
+    assert not best or night in best[0]
+
+
+@pytest.mark.skipif(numpy_for() is None, reason="numpy is not installed")
+def test_numpy_and_python_night_tables_agree():
+    tracker = AuroraTracker()
+    keys = [(lat, lon, day) for lat in (45, 65, 70) for lon in (-10, 0, 2)
+            for day in (to_epoch_day(datetime.date(2026, 3, 20)), to_epoch_day(datetime.date(2026, 12, 21)))]
+    python = ObservingPlanner(tracker, use_numpy=False).nights(keys)
+    vectorized = ObservingPlanner(tracker, use_numpy=True).nights(keys)
+    for key in keys:
+        a, b = python[key], vectorized[key]
+        assert [float(x) for x in b.sun] == pytest.approx(a.sun, abs=1e-9)
+        assert [float(x) for x in b.moon] == pytest.approx(a.moon, abs=1e-9)
+        assert b.factors == pytest.approx(a.factors, abs=1e-9)
+        assert b.fraction == pytest.approx(a.fraction, abs=1e-12)
+        assert b.window[:2] == a.window[:2]
+
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_fairbanks_winter_solstice_sun(use_numpy):
+    # Fairbanks falls in the 65N / 150W band: the sun barely clears the
+    # horizon at local noon and is far below it at midnight
+    planner = ObservingPlanner(AuroraTracker(), use_numpy=use_numpy)
+    hours = planner.hourly("Fairbanks, Alaska", datetime.date(2026, 12, 21))
+    assert hours[0][0] == datetime.datetime(2026, 12, 21, 12)
+    assert hours[0][1] == pytest.approx(1.6, abs=0.1)
+    assert hours[12][1] == pytest.approx(-48.4, abs=0.1)
+    assert hours[0][3] == 0.0 and hours[12][3] > 0.4
+
+
+def test_moon_phase_at_known_new_and_full_moons():
+    full = datetime.datetime(2024, 4, 23, 23, 49)
+    new = datetime.datetime(2024, 4, 8, 18, 21)
+    for moment, low, high in ((full, 0.99, 1.0), (new, 0.0, 0.01)):
+        d = to_epoch_day(moment.date()) + (moment.hour * 60 + moment.minute) / 1440 - J2000
+        assert low <= ephemeris(d)[5] <= high
+
+
+@pytest.mark.parametrize("factors, expected", [
+    ([0.9, 0.9, 0.1, 0.5, 0.5, 0.5, 0.2, 1.0], (0, 2, 0.9)),
+    ([1.0, 0.0, 0.4, 0.4, 0.4, 0.4], (2, 4, 0.4)),          # Longer dim run has more total
+    ([0.2, 0.3, 0.3, 0.1, 0.8], (4, 1, 0.8)),
+    ([0.3, 0.3], (0, 2, 0.3)),                              # MIN_FACTOR itself is usable
+    ([0.1, 0.29, 0.0], None),
+    ([], None),
+])
+def test_best_run_picks_the_highest_total(factors, expected):
+    result = best_run(factors)
+    if expected is None:
+        assert result is None
+    else:
+        assert result[:2] == expected[:2] and result[2] == pytest.approx(expected[2])
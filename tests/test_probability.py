@@ -0,0 +1,52 @@
+"""viewing_probability_matrix equals viewing_probability cell by cell on both backends"""
+
+import math
+import random
+
+import pytest
+
+from aurora_numpy import numpy_for
+from aurora_probability import viewing_probability, viewing_probability_matrix, visibility_threshold
+
+BACKENDS = [False] + ([True] if numpy_for() is not None else [])
+KP_VALUES = [0, 0.1, 1, 2.5, 3.3, 4, 5.7, 6, 8.9, 9]
+
+
+def latitudes():
+    """Magnetic latitudes at, just around and well around every KP threshold"""
+    lats = {-90.0, 0.0, 45.0, 90.0}
+    for kp in KP_VALUES:
+        threshold = visibility_threshold(kp)
+        for offset in (-15, -10, -5, -0.5, 0, 0.5, 4.5, 5, 15):
+            lats.add(threshold + offset)
+        lats.add(math.nextafter(threshold, -math.inf))
+        lats.add(math.nextafter(threshold, math.inf))
+    rng = random.Random(1)
+    lats.update(rng.uniform(20, 80) for _ in range(200))
+    return sorted(lats)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_matrix_matches_scalar_formula(use_numpy):
+    lats = latitudes()
+    matrix = viewing_probability_matrix(lats, KP_VALUES, use_numpy=use_numpy)
+    assert len(matrix) == len(lats)
+    for lat, row in zip(lats, matrix):
+        assert len(row) == len(KP_VALUES)
+        for kp, value in zip(KP_VALUES, row):
+            assert float(value) == viewing_probability(lat, kp), (lat, kp)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_probability_jumps_at_the_threshold(use_numpy):
+    for kp in (0, 9):
+        threshold = visibility_threshold(kp)
+        below, at = viewing_probability_matrix(
+            [math.nextafter(threshold, -math.inf), threshold], [kp], use_numpy=use_numpy)
+        assert float(below[0]) == pytest.approx(20.0) and float(at[0]) == 50.0
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_empty_inputs(use_numpy):
+    assert len(viewing_probability_matrix([], KP_VALUES, use_numpy=use_numpy)) == 0
+    assert [len(row) for row in viewing_probability_matrix([60.0], [], use_numpy=use_numpy)] == [0]
@@ -0,0 +1,111 @@
+"""Raster cell lookup at the grid edges and versions across rewrites"""
+
+import math
+import os
+import random
+
+import pytest
+
+from aurora_numpy import numpy_for
+from aurora_raster import Raster, SkyConditions, write_raster
+
+PATHS = [False] + ([True] if numpy_for() is not None else [])
+
+
+def grid(tmp_path, offset=0):
+    path = str(tmp_path / "grid.raster")
+    write_raster(path, [[offset + row * 4 + col for col in range(4)] for row in range(2)])
+    return path
+
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_closing_edges_belong_to_the_last_cells(tmp_path, use_numpy):
+    with Raster(grid(tmp_path), use_numpy=use_numpy) as raster:
+        assert raster.cell(-90, 180) == (1, 3)
+        assert raster.cell(90, -180) == (0, 0)
+        assert raster.cell(-90.5, 0) is None and raster.cell(0, 180.5) is None
+        assert raster.sample_many([-90, 90, 0], [180, -180, 180]) == [7.0, 0.0, 7.0]
+
+
+def test_version_changes_when_the_file_is_rewritten(tmp_path):
+    path = grid(tmp_path)
+    with Raster(path) as raster:
+        before = raster.version
+    stat = os.stat(path)
+    grid(tmp_path, offset=10)  # Same path and size
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with Raster(path) as raster:
+        assert raster.version != before
+        assert raster.sample(0, 0) == 16.0
+
+
+def numbered(tmp_path, rows=40, cols=60, bands=1, typecode="f"):
+    path = str(tmp_path / f"numbered-{typecode}.raster")
+    write_raster(path, [[band * 10000 + row * 100 + col for col in range(cols)]
+                        for band in range(bands) for row in range(rows)],
+                 typecode=typecode, bands=bands)
+    return path
+
+
+def points(count=500, seed=6):
+    rng = random.Random(seed)
+    lats = [rng.uniform(-95, 95) for _ in range(count)]
+    lons = [rng.uniform(-185, 185) for _ in range(count)]
+    return lats, lons
+
+
+@pytest.mark.parametrize("typecode", ["f", "H"])
+def test_tile_direct_and_numpy_reads_agree(tmp_path, typecode):
+    path = numbered(tmp_path, bands=2, typecode=typecode)
+    lats, lons = points()
+    results = []
+    for use_numpy in PATHS:
+        for min_tile_points in (1, 10 ** 9):  # Every tile copied, or every cell read directly
+            with Raster(path, band=1, tile_size=16, min_tile_points=min_tile_points,
+                        use_numpy=use_numpy) as raster:
+                results.append(raster.sample_many(lats, lons))
+                if min_tile_points == 1:
+                    assert raster.tiles_loaded and not raster.cells_read
+                else:
+                    assert raster.cells_read and not raster.tiles_loaded
+                expected = []
+                for lat, lon in zip(lats, lons):
+                    cell = raster.cell(lat, lon)
+                    expected.append(math.nan if cell is None else 10000.0 + cell[0] * 100 + cell[1])
+    for values in results:
+        assert [repr(value) for value in values] == [repr(value) for value in expected]
+
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_nodata_reads_as_missing(tmp_path, use_numpy):
+    path = str(tmp_path / "holes.raster")
+    write_raster(path, [[1.0, -999.0], [-999.0, 4.0]])
+    for min_tile_points in (1, 10 ** 9):
+        with Raster(path, nodata=-999.0, min_tile_points=min_tile_points, use_numpy=use_numpy) as raster:
+            assert raster.sample(45, -90) == 1.0
+            assert raster.sample(45, 90) is None and raster.sample(-45, -90) is None
+            values = raster.sample_many([45, -45, 95], [90, 90, 0])
+            assert math.isnan(values[0]) and values[1] == 4.0 and math.isnan(values[2])
+
+
+@pytest.mark.parametrize("use_numpy", PATHS)
+def test_sky_factors_scale_cloud_and_light(tmp_path, use_numpy):
+    cloud = str(tmp_path / "cloud.raster")
+    light = str(tmp_path / "light.raster")
+    # Four columns of 90 degrees: clear, half, full and over-full cloud / nodata
+    write_raster(cloud, [[0.0, 50.0, 100.0, 150.0], [25.0, 25.0, 25.0, -1.0]])
+    write_raster(light, [[1, 5, 9, 3], [9, 9, 9, 9]], typecode="B")
+    lats, lons = [45, 45, 45, 45, -45, -45], [-135, -45, 45, 135, -135, 135]
+
+    with SkyConditions(Raster(cloud, nodata=-1.0, use_numpy=use_numpy), light,
+                       use_numpy=use_numpy) as conditions:
+        expected = [1.0, 0.5 * 0.6, 0.0, 0.0, 0.75 * 0.2, 0.2]
+        assert conditions.factors(lats, lons) == pytest.approx(expected)
+        assert conditions.factor(95, 0) == 1.0  # Outside both layers
+
+    with SkyConditions(cloud=cloud, use_numpy=use_numpy) as conditions:  # No light layer
+        assert conditions.factors(lats[:3], lons[:3]) == pytest.approx([1.0, 0.5, 0.0])
+    with SkyConditions(light=light, light_weight=0.5, use_numpy=use_numpy) as conditions:
+        assert conditions.factors(lats[:3], lons[:3]) == pytest.approx([1.0, 0.75, 0.5])
+    with SkyConditions(cloud=cloud, cloud_scale=200.0, use_numpy=use_numpy) as conditions:
+        assert conditions.factors(lats[:4], lons[:4]) == pytest.approx([1.0, 0.75, 0.5, 0.25])
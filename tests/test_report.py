@@ -0,0 +1,82 @@
+"""Every report model survives the JSON Lines and MessagePack serializers"""
+
+import io
+import random
+
+import pytest
+
+import aurora_info
+from aurora_art import AuroraArt
+from aurora_batch import BatchReporter
+from aurora_graph import AuroraGraph
+from aurora_report import (BinarySerializer, JsonLinesSerializer, REPORT_TYPES, StatisticsReport,
+                           _pack, _unpack, report_from_dict)
+from aurora_tracker import AuroraTracker
+
+SERIALIZERS = [JsonLinesSerializer, BinarySerializer]
+
+
+def sample_reports():
+    random.seed(5)
+    tracker = AuroraTracker(seed=5)
+    graph = AuroraGraph()
+    data = graph.generate_sample_data(30)
+    quiet = io.StringIO()
+    art = AuroraArt()
+    return {
+        "full_report": tracker.full_report(),
+        "info": aurora_info.generate_aurora_report(out=quiet),
+        "bar_chart": graph.bar_chart_report(data, max_rows=10),
+        "line_graph": graph.line_graph_report(data, max_width=20),
+        "statistics": graph.statistics_report(data),
+        "ensemble": tracker.ensemble_forecast(3, 200, seed=1),
+        "art": art.create_static_aurora(out=quiet),
+        "site": next(BatchReporter(tracker, workers=1).run([("Oulu", 65.0, 25.5)], days=4)),
+    }
+
+
+REPORTS = sample_reports()
+
+
+def test_every_kind_is_covered():
+    assert set(REPORTS) == set(REPORT_TYPES)
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+@pytest.mark.parametrize("kind", sorted(REPORTS))
+def test_round_trip(serializer, kind):
+    report = REPORTS[kind]
+    assert report.kind == kind
+    assert list(serializer().loads(serializer().dumps(report))) == [report]
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+def test_stream_round_trip(serializer):
+    reports = list(REPORTS.values()) * 3
+    out = io.BytesIO() if serializer.binary else io.StringIO()
+    assert serializer().dump_many(reports, out, batch=4) == len(reports)
+    assert list(serializer().loads(out.getvalue())) == reports
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+def test_empty_statistics_round_trip(serializer):
+    report = AuroraGraph().statistics_report([])
+    assert isinstance(report, StatisticsReport)
+    assert list(serializer().loads(serializer().dumps(report))) == [report]
+
+
+@pytest.mark.parametrize("value", [
+    None, True, False, 0, 127, 128, -1, -32, -33, 255, 256, 65536, 1 << 40, -(1 << 40),
+    0.1, -2.5e300, "", "ø" * 40, "x" * 300, "y" * 70000, b"\x00\xff" * 200,
+    list(range(20)), {str(i): i for i in range(20)}, [[], {}, [None]],
+])
+def test_messagepack_values(value):
+    buffer = bytearray()
+    _pack(value, buffer)
+    decoded, offset = _unpack(memoryview(bytes(buffer)), 0)
+    assert decoded == value and offset == len(buffer)
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown report kind"):
+        report_from_dict({"kind": "horoscope"})
@@ -0,0 +1,119 @@
+"""KpRollup queries against brute force, and its saved levels"""
+
+import datetime
+import math
+import os
+import random
+
+import pytest
+
+from aurora_ingest import KpArchive, epoch_hours, ingest, write_archive
+from aurora_rollup import KpRollup, rollup_path
+
+START = datetime.datetime(1999, 11, 20)
+
+
+def readings(rng, days=900):
+    hours = epoch_hours(START)
+    return [(hours + 3 * slot, rng.randrange(0, 28) / 3) for slot in range(days * 8) if rng.random() < 0.9]
+
+
+def brute_force(records, low, high, thresholds):
+    values = [(hour, kp) for hour, kp in records if low <= hour < high]
+    peaks = {}
+    for hour, kp in values:
+        peaks[hour // 24] = max(kp, peaks.get(hour // 24, -math.inf))
+    kps = [kp for _, kp in values]
+    return {
+        "count": len(kps),
+        "days": len(peaks),
+        "min": min(kps) if kps else None,
+        "max": max(kps) if kps else None,
+        "readings_at_least": {t: sum(kp >= t for kp in kps) for t in thresholds},
+        "days_at_least": {t: sum(peak >= t for peak in peaks.values()) for t in thresholds},
+    }
+
+
+def summary(rollup, start, end):
+    result = rollup.summary(start, end).to_dict(rollup.thresholds)
+    del result["mean"]
+    return result
+
+
+def test_summary_matches_brute_force():
+    rng = random.Random(21)
+    records = readings(rng)
+    rollup = KpRollup()
+    for hour, kp in rng.sample(records, len(records)):  # Out of order on purpose
+        rollup.add_hour(hour, kp)
+    for _ in range(300):
+        start = START + datetime.timedelta(hours=rng.randrange(-100, 900 * 24 + 100))
+        end = start + datetime.timedelta(hours=rng.choice([1, 3, 29, 24 * 40, 24 * 400, 24 * 900]))
+        low = epoch_hours(start) + (-epoch_hours(start)) % 3  # Rounded inwards to slots
+        high = epoch_hours(end) - epoch_hours(end) % 3
+        assert summary(rollup, start, end) == brute_force(records, low, high, rollup.thresholds)
+    everything = brute_force(records, -math.inf, math.inf, rollup.thresholds)
+    assert summary(rollup, None, None) == everything
+
+
+def test_saved_levels_round_trip(tmp_path):
+    path = str(tmp_path / "kp.bin")
+    write_archive(readings(random.Random(3)), path)
+    with KpArchive(path) as archive:
+        built = KpRollup.open_archive(archive)
+        assert os.path.exists(rollup_path(path))
+        loaded = KpRollup.load(rollup_path(path), archive)
+        for name in ("day", "month", "year"):
+            assert [(moment, bucket.to_dict()) for moment, bucket in loaded.buckets(name)] == \
+                [(moment, bucket.to_dict()) for moment, bucket in built.buckets(name)]
+        # Readings are read through the archive's views, not copied
+        assert loaded.hours is archive.hours and loaded.kp is archive.kp
+        start, end = datetime.date(2000, 2, 29), datetime.date(2001, 7, 4)
+        assert summary(loaded, start, end) == summary(built, start, end)
+        assert summary(loaded, None, None) == summary(built, None, None)
+
+        last = archive.last_time() + datetime.timedelta(hours=3)
+        loaded.add(last, 8.0)  # Copies the readings before changing them
+        assert len(loaded) == len(archive) + 1 and loaded.kp[-1] == 8.0
+        assert loaded.summary().count == len(archive) + 1
+
+
+def test_stale_levels_are_rebuilt(tmp_path):
+    path = str(tmp_path / "kp.bin")
+    write_archive([(9, 1.0), (12, 2.0)], path)
+    with KpArchive(path) as archive:
+        KpRollup.open_archive(archive)
+    write_archive([(9, 1.0), (12, 2.0), (15, 7.0)], path)
+    with KpArchive(path) as archive:
+        with pytest.raises(ValueError, match="out of date"):
+            KpRollup.load(rollup_path(path), archive)
+        assert KpRollup.open_archive(archive).summary().max == 7.0
+        with pytest.raises(ValueError, match="thresholds"):
+            KpRollup.load(rollup_path(path), archive, thresholds=(6,))
+
+
+def test_ingest_appends_incrementally(tmp_path):
+    rng = random.Random(8)
+    records = readings(rng, days=120)
+    split = len(records) // 2
+
+    def write_csv(name, rows):
+        lines = ["datetime,kp"]
+        for hour, kp in rows:
+            day, hour = divmod(hour, 24)
+            stamp = datetime.datetime.combine(datetime.date(1970, 1, 1) + datetime.timedelta(days=day),
+                                              datetime.time(hour))
+            lines.append(f"{stamp.isoformat()},{kp!r}")
+        (tmp_path / name).write_text("\n".join(lines) + "\n")
+        return str(tmp_path / name)
+
+    path = str(tmp_path / "kp.bin")
+    ingest([write_csv("old.csv", records[:split + 10])], path)
+    ingest([write_csv("new.csv", records[split:])], path, append=True)
+    with KpArchive(path) as archive:
+        assert len(archive) == len(records)
+        incremental = KpRollup.load(rollup_path(path), archive)
+        rebuilt = KpRollup.from_archive(archive)
+        for name in ("day", "month", "year"):
+            assert [bucket.to_dict() for _, bucket in incremental.buckets(name)] == \
+                [bucket.to_dict() for _, bucket in rebuilt.buckets(name)]
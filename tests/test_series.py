@@ -0,0 +1,55 @@
+"""KpSeries keeps the old list-of-dicts contract"""
+
+import datetime
+import json
+import pickle
+
+from aurora_series import KpSeries, as_series
+from aurora_tracker import AuroraTracker
+
+
+def test_records_are_plain_dicts():
+    forecast = AuroraTracker(seed=1).generate_kp_forecast(5)
+    record = forecast[0]
+    assert isinstance(record, dict)
+    assert set(record) == {"date", "kp_index", "activity_level", "visibility_zone"}
+    rows = json.loads(json.dumps(list(forecast)))
+    assert rows == forecast.to_list()
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_item_assignment_writes_back():
+    series = KpSeries.from_records([{"date": datetime.date(2024, 5, 10), "kp_index": 2.0}])
+    record = series[0]
+    record["kp_index"] = 8.7
+    assert series.kp_at(0) == 8.7
+    assert series[0]["activity_level"] == record["activity_level"] != "Quiet"
+    record["note"] = "storm"
+    assert record["note"] == "storm"
+
+    series[0] = {"date": "2024-05-11", "kp_index": 3.0}
+    assert series[0]["date"] == datetime.date(2024, 5, 11)
+    assert series.kp_at(0) == 3.0
+
+
+def test_append_accepts_record_dicts():
+    series = KpSeries()
+    series.append({"date": datetime.date(2024, 1, 1), "kp_index": 4.0})
+    series.append(datetime.date(2024, 1, 2), 5.0)
+    assert [record["kp_index"] for record in series] == [4.0, 5.0]
+
+
+def test_from_records_keeps_string_dates():
+    records = [{"date": "2024-03-01", "kp_index": 1.5}, {"date": "2024-03-02", "kp_index": 6.0}]
+    series = as_series(records)
+    assert [record["date"] for record in series] == ["2024-03-01", "2024-03-02"]
+    assert KpSeries.from_records(records, date_format="%d/%m")[0]["date"] == "01/03"
+
+
+def test_scale_ends_print_as_floats():
+    # Clamped values used to be the ints 0 and 9; every KP now prints with one decimal
+    series = KpSeries(date_format="%Y-%m-%d")
+    for day, kp in enumerate((0, 9, 4.25)):
+        series.append(day, kp)
+    assert [f"KP {record['kp_index']}" for record in series] == ["KP 0.0", "KP 9.0", "KP 4.2"]
+    assert json.loads(json.dumps(series.to_list()))[1]["kp_index"] == 9.0
@@ -0,0 +1,111 @@
+"""Dashboard server: ETag revalidation, parameter errors and static file containment"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from aurora_server import DashboardServer, DashboardState
+from aurora_tracker import AuroraTracker
+
+
+async def fetch(port, target, headers=()):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"GET {target} HTTP/1.1", "Host: localhost", "Connection: close", *headers]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status_line, *fields = head.decode("latin-1").split("\r\n")
+    header_map = {name.lower(): value.strip() for name, _, value in (f.partition(":") for f in fields)}
+    return int(status_line.split()[1]), header_map, body
+
+
+def serve(tmp_path, *requests):
+    """Start a server on a free port and return the responses to each (target, headers) request"""
+
+    async def client(port):
+        return [await fetch(port, *request) for request in requests]
+
+    return serve_client(tmp_path, client)
+
+
+def serve_client(tmp_path, client):
+    """Start a server on a free port and run client(port) against it"""
+    web = tmp_path / "web"
+    web.mkdir()
+    (web / "index.html").write_text("<h1>aurora</h1>")
+    (tmp_path / "secret.txt").write_text("private")
+    (tmp_path / "web-other").mkdir()
+    (tmp_path / "web-other" / "note.txt").write_text("private")
+
+    async def run():
+        server = DashboardServer(DashboardState(AuroraTracker(seed=5)), str(web))
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            return await client(port)
+
+    return asyncio.run(run())
+
+
+def test_etag_revalidation_returns_304(tmp_path):
+    async def client(port):
+        first = await fetch(port, "/api/forecast?days=3")
+        etag = first[1]["etag"]
+        return (first, await fetch(port, "/api/forecast?days=3", [f"If-None-Match: W/{etag}"]),
+                await fetch(port, "/api/forecast?days=3", ['If-None-Match: "stale"']))
+
+    first, again, other = serve_client(tmp_path, client)
+    status, headers, body = first
+    assert status == 200 and len(json.loads(body)) == 3
+    etag = headers["etag"]
+    assert again[0] == 304 and again[1]["etag"] == etag and again[2] == b""
+    assert other[0] == 200 and other[1]["etag"] == etag
+
+
+@pytest.mark.parametrize("target", [
+    "/api/forecast?days=0", "/api/forecast?days=31", "/api/forecast?days=two",
+    "/api/probabilities?kp=-1", "/api/probabilities?kp=9.5", "/api/probabilities?kp=high",
+])
+def test_bad_parameters_are_400(tmp_path, target):
+    (status, _, body), = serve(tmp_path, (target,))
+    assert status == 400 and "error" in json.loads(body)
+
+
+def test_probabilities_for_a_kp_are_computed_off_the_loop(tmp_path, monkeypatch):
+    threads = []
+    probabilities = DashboardState._probabilities
+
+    def recording(self, kp):
+        threads.append(threading.current_thread())
+        return probabilities(self, kp)
+
+    monkeypatch.setattr(DashboardState, "_probabilities", recording)
+    (status, _, body), = serve(tmp_path, ("/api/probabilities?kp=9",))
+    assert status == 200
+    assert threading.main_thread() not in threads
+    assert {row["location"] for row in json.loads(body)} == set(AuroraTracker().locations)
+
+
+@pytest.mark.parametrize("target", [
+    "/../secret.txt", "/%2e%2e/secret.txt", "/..%2fsecret.txt", "/../web-other/note.txt",
+    "/missing.html",
+])
+def test_static_paths_stay_inside_the_web_dir(tmp_path, target):
+    (status, _, body), = serve(tmp_path, (target,))
+    assert status == 404 and b"private" not in body
+
+
+def test_static_index(tmp_path):
+    (status, headers, body), = serve(tmp_path, ("/",))
+    assert status == 200 and body == b"<h1>aurora</h1>"
+    assert headers["content-type"].startswith("text/html")
+
+
+def test_overlong_lines_are_400(tmp_path):
+    (status, _, _), (header_status, _, _) = serve(
+        tmp_path, ("/" + "a" * 70000,), ("/", ["X-Long: " + "b" * 70000]))
+    assert status == 400 and header_status == 400
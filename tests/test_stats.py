@@ -0,0 +1,52 @@
+"""KpStatistics against brute-force answers"""
+
+import random
+
+import pytest
+
+from aurora_graph import AuroraGraph
+from aurora_stats import KpStatistics
+
+
+def summarize(values):
+    stats = KpStatistics()
+    for kp in values:
+        stats.add(kp)
+    return stats
+
+
+def test_percentiles_exact_for_tenths_and_thirds():
+    rng = random.Random(4)
+    values = [round(rng.uniform(0, 9), 1) for _ in range(200)]
+    values += [rng.randint(0, 27) / 3 for _ in range(200)]
+    stats = summarize(values)
+    ordered = sorted(values)
+    for q in (0, 10, 33, 50, 90, 100):
+        rank = max(1, -(-q * len(ordered) // 100))
+        assert stats.percentile(q) == pytest.approx(ordered[rank - 1], abs=1e-9)
+
+
+def test_empty_statistics():
+    stats = KpStatistics()
+    assert stats.count == 0
+    assert stats.min is None and stats.max is None
+    assert stats.count_at_least(5) == 0
+    assert stats.fraction_at_least(5) == 0.0
+    report = AuroraGraph().statistics_report([])
+    assert report.max is None and report.peak_level is None
+
+
+def test_untracked_threshold_is_a_clear_error():
+    stats = summarize([2.0, 6.0])
+    with pytest.raises(ValueError, match="not a tracked threshold"):
+        stats.count_at_least(7)
+    with pytest.raises(ValueError, match="not a tracked threshold"):
+        KpStatistics().fraction_at_least(7)
+
+
+def test_merge_matches_single_pass():
+    values = [0.3, 5.0, 7.7, 2.1, 4.0, 6.3]
+    merged = summarize(values[:2]) + KpStatistics() + summarize(values[2:])
+    whole = summarize(values)
+    assert (merged.min, merged.max, merged.count) == (whole.min, whole.max, whole.count)
+    assert merged.percentile(50) == whole.percentile(50)
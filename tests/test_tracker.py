@@ -0,0 +1,29 @@
+"""KP forecasts from a fitted model, and the random-walk fallback"""
+
+import datetime
+
+from aurora_model import KpModel
+from aurora_series import to_epoch_day
+from aurora_tracker import AuroraTracker
+
+
+def fitted(last_day):
+    model = KpModel()
+    for day in range(last_day - 59, last_day + 1):
+        model.update(day, 2 + day % 5)
+    return model
+
+
+def test_model_forecast_starts_today():
+    today = to_epoch_day(datetime.date.today())
+    model = fitted(today - 3)
+    forecast = AuroraTracker(seed=1, model=model).generate_kp_forecast(5)
+    assert forecast.to_list() == model.forecast(5, today).to_list()
+
+
+def test_stale_model_falls_back_to_random_walk():
+    today = datetime.date.today()
+    model = fitted(to_epoch_day(today) - 400)
+    forecast = AuroraTracker(seed=1, model=model).generate_kp_forecast(7)
+    assert len(forecast) == 7
+    assert forecast.to_list() == AuroraTracker(seed=1).generate_kp_forecast(7).to_list()
@@ -0,0 +1,94 @@
+"""AuroraWatch survives malformed feeds and logs whole tables"""
+
+import asyncio
+import datetime
+import io
+import json
+
+import pytest
+
+from aurora_tracker import AuroraTracker
+from aurora_alerts import AlertEngine
+from aurora_probability import viewing_probability
+from aurora_watch import AuroraWatch, FeedState, FileFeed
+
+
+def write_feed(path, rows):
+    path.write_text(json.dumps(rows))
+    return FileFeed(str(path))
+
+
+@pytest.mark.parametrize("rows", [
+    [{"date": "2024-05-10", "kp_index": None}],
+    [["2024-05-10", 5.0]],
+    {"date": "2024-05-10"},
+    [{"date": "2024-05-10"}],
+    [{"date": "soon", "kp": 3}],
+])
+def test_malformed_rows_set_an_error(tmp_path, rows):
+    watch = AuroraWatch(AuroraTracker(), [write_feed(tmp_path / "feed.json", rows)],
+                        out=io.StringIO(), in_place=False)
+    state = watch.states[0]
+    asyncio.run(watch.refresh(state))
+    assert state.error and not state.kp
+    watch.redraw()
+    assert "⚠️" in watch.out.getvalue()
+
+
+def test_plain_output_repeats_the_whole_table(tmp_path):
+    path = tmp_path / "feed.json"
+    feed = write_feed(path, [{"date": "2024-05-10", "kp_index": 3.0}, {"date": "2024-05-11", "kp_index": 4.0}])
+    out = io.StringIO()
+    watch = AuroraWatch(AuroraTracker(), [feed], out=out, in_place=False, clock=lambda: 0)
+    state = watch.states[0]
+    asyncio.run(watch.refresh(state))
+    watch.redraw()
+    watch.redraw()  # Nothing changed: nothing printed
+    feed._mtime = None
+    path.write_text(json.dumps([{"date": "2024-05-10", "kp_index": 3.0}, {"date": "2024-05-11", "kp_index": 7.0}]))
+    asyncio.run(watch.refresh(state))
+    watch.redraw()
+
+    frames = out.getvalue().split("AURORA WATCH")[1:]
+    assert len(frames) == 2
+    for frame in frames:
+        assert "Date" in frame and "Fairbanks" in frame
+
+
+def test_sites_seen_with_an_empty_forecast_are_scored_later():
+    state = FeedState(None)
+    sites = {"North": 65.0, "South": 50.0}
+    assert state.apply({}, sites) == 0
+    day = datetime.date(2024, 5, 10)
+    assert state.apply({day: 6.0}, sites) == 2
+    assert state.probabilities == {name: {day: viewing_probability(mlat, 6.0)} for name, mlat in sites.items()}
+
+
+def test_empty_feed_then_rows_keeps_watching(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text("date,kp_index\n")
+    feed = FileFeed(str(path))
+    watch = AuroraWatch(AuroraTracker(), [feed], out=io.StringIO(), in_place=False)
+    state = watch.states[0]
+    asyncio.run(watch.refresh(state))
+    feed._mtime = None
+    path.write_text("date,kp_index\n2024-05-10,5.0\n")
+    asyncio.run(watch.refresh(state))
+    assert state.error is None
+    assert set(state.probabilities) == set(watch.tracker.locations)
+
+
+def test_alert_state_forgets_past_nights(tmp_path):
+    today = datetime.date(2024, 5, 10)
+    rows = [{"date": (today + datetime.timedelta(days=offset)).isoformat(), "kp_index": 8.0}
+            for offset in range(-3, 3)]
+    engine = AlertEngine(sinks=[], locations=AuroraTracker().locations)
+    engine.subscribe("Fairbanks, Alaska", 10)
+    clock = datetime.datetime(2024, 5, 10, 12).timestamp
+    watch = AuroraWatch(AuroraTracker(), [write_feed(tmp_path / "feed.json", rows)],
+                        out=io.StringIO(), in_place=False, clock=clock, alerts=engine)
+    for _ in range(2):
+        watch.states[0].feed._mtime = None
+        asyncio.run(watch.refresh(watch.states[0]))
+    assert min(engine._peaks) == today
+    assert len(watch.recent_alerts) == 3  # Today and the next two nights, once each
@@ -85,24 +85,58 @@ class AuroraDashboard {
         // Add loading state
         document.body.classList.add('loading');
         
-        // Simulate API call delay
-        setTimeout(() => {
-            this.updateCurrentConditions();
-            this.updateForecast();
-            this.updateProbabilities();
-            this.updateColors();
-            this.updateFact();
-            this.updatePhotographyTips();
-            
-            document.body.classList.remove('loading');
-        }, 1000);
+        // Prefer the local API server (src/aurora_server.py) and fall back to
+        // client-side simulation when the page is served as static files
+        this.fetchDashboard()
+            .catch(() => this.generateDashboard())
+            .then(data => {
+                this.updateCurrentConditions(data.current, data.generated);
+                this.updateForecast(data.forecast);
+                this.updateProbabilities(data.probabilities);
+                this.updateColors(data.colors);
+                this.updateFact();
+                this.updatePhotographyTips(data.tips);
+                
+                document.body.classList.remove('loading');
+            });
     }
 
-    updateCurrentConditions() {
+    fetchDashboard() {
+        // 'no-cache' revalidates with If-None-Match, so an unchanged
+        // forecast comes back as a cheap 304 from the server
+        return fetch('/api/dashboard', { cache: 'no-cache' }).then(response => {
+            if (!response.ok) {
+                throw new Error(`Dashboard API responded with ${response.status}`);
+            }
+            return response.json();
+        });
+    }
+
+    generateDashboard() {
         const currentKp = this.generateKpIndex();
-        const activityLevel = this.getActivityLevel(currentKp);
-        const visibilityZone = this.getVisibilityZone(currentKp);
-        const lastUpdated = new Date().toLocaleString();
+        
+        return {
+            generated: new Date().toISOString(),
+            current: {
+                kp_index: currentKp,
+                activity_level: this.getActivityLevel(currentKp),
+                visibility_zone: this.getVisibilityZone(currentKp)
+            },
+            forecast: this.generateForecast(7),
+            probabilities: Object.keys(this.locations).map(location => ({
+                location,
+                probability: this.calculateViewingProbability(location, currentKp)
+            })),
+            colors: this.predictColors(currentKp).map(name => ({ name, ...this.auroraColors[name] })),
+            tips: this.generatePhotographyTips(currentKp)
+        };
+    }
+
+    updateCurrentConditions(current, generated) {
+        const currentKp = Number(current.kp_index);
+        const activityLevel = current.activity_level;
+        const visibilityZone = current.visibility_zone;
+        const lastUpdated = new Date(generated).toLocaleString();
 
         document.getElementById('currentKp').textContent = currentKp.toFixed(1);
         document.getElementById('activityLevel').textContent = activityLevel;
@@ -114,18 +148,16 @@ class AuroraDashboard {
         activityElement.className = `activity-level activity-${activityLevel.toLowerCase().replace(' ', '-')}`;
     }
 
-    updateForecast() {
+    updateForecast(forecast) {
         const forecastList = document.getElementById('forecastList');
         forecastList.innerHTML = '';
-
-        const forecast = this.generateForecast(7);
         
         forecast.forEach(day => {
             const forecastItem = document.createElement('div');
             forecastItem.className = 'forecast-item';
             
             forecastItem.innerHTML = `
-                <div class="forecast-date">${day.date}</div>
+                <div class="forecast-date">${this.formatForecastDate(day.date)}</div>
                 <div class="forecast-kp">KP ${day.kp_index}</div>
                 <div class="forecast-activity">${day.activity_level}</div>
             `;
@@ -134,15 +166,19 @@ class AuroraDashboard {
         });
     }
 
-    updateProbabilities() {
+    formatForecastDate(date) {
+        // The API sends ISO dates; the local simulation already sends labels
+        if (/^\d{4}-\d{2}-\d{2}$/.test(date)) {
+            return new Date(`${date}T00:00:00`).toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
+        }
+        return date;
+    }
+
+    updateProbabilities(probabilities) {
         const locationList = document.getElementById('locationList');
         locationList.innerHTML = '';
 
-        const currentKp = this.generateKpIndex();
-
-        Object.entries(this.locations).forEach(([location, data]) => {
-            const probability = this.calculateViewingProbability(location, currentKp);
-            
+        probabilities.forEach(({ location, probability }) => {
             const locationItem = document.createElement('div');
             locationItem.className = 'location-item';
             
@@ -155,14 +191,11 @@ class AuroraDashboard {
         });
     }
 
-    updateColors() {
+    updateColors(colors) {
         const colorList = document.getElementById('colorList');
         colorList.innerHTML = '';
 
-        const currentKp = this.generateKpIndex();
-        const predictedColors = this.predictColors(currentKp);
-
-        predictedColors.forEach(colorName => {
+        colors.forEach(({ name: colorName }) => {
             const colorInfo = this.auroraColors[colorName];
             
             const colorItem = document.createElement('div');
@@ -187,13 +220,21 @@ class AuroraDashboard {
         factContent.textContent = randomFact;
     }
 
-    updatePhotographyTips() {
-        const currentKp = this.generateKpIndex();
+    updatePhotographyTips(tips) {
         const tipsList = document.getElementById('tipsList');
         
         // Clear existing tips
         tipsList.innerHTML = '';
-        
+
+        tips.forEach(tip => {
+            const tipElement = document.createElement('div');
+            tipElement.className = 'tip';
+            tipElement.textContent = tip;
+            tipsList.appendChild(tipElement);
+        });
+    }
+
+    generatePhotographyTips(currentKp) {
         // Base tips
         const baseTips = [
             "🌍 Find a location away from city lights",
@@ -215,12 +256,7 @@ class AuroraDashboard {
             baseTips.push("👥 Aurora may be visible to naked eye");
         }
 
-        baseTips.forEach(tip => {
-            const tipElement = document.createElement('div');
-            tipElement.className = 'tip';
-            tipElement.textContent = tip;
-            tipsList.appendChild(tipElement);
-        });
+        return baseTips;
     }
 
     generateKpIndex() {